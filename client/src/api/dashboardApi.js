@@ -1,18 +1,17 @@
 import axiosInstance from "./axiosInstance";
+import { fetchPage } from "./pagination";
 
 // ---------------- FETCH ALL USERS (ADMIN DASHBOARD) ----------------
-export async function fetchAllUsers() {
+export async function fetchAllUsers(cursor = null) {
     // Uzmi token iz localStorage
     const token = localStorage.getItem("access");
 
     // Poziv backend rute sa Authorization header-om
-    const response = await axiosInstance.get("/auth/admin/all_users", {
+    return fetchPage("/auth/admin/all_users", cursor, {
         headers: {
             Authorization: `Bearer ${token}`,
         },
-    });
-
-    return response.data; // vraća JSON niz svih korisnika
+    }); // vraća { items, nextCursor } za jednu stranicu korisnika
 }
 
 // ---------------- UPDATE USER ROLE ----------------
@@ -0,0 +1,14 @@
+import axiosInstance from "./axiosInstance";
+
+// Liste su paginirane po kursoru: telo je niz, sledeca stranica je u X-Next-Cursor header-u.
+// Vraca jednu stranicu; sledecu komponenta trazi tek kad korisnik klikne "Load more".
+export async function fetchPage(url, cursor = null, config = {}) {
+  const response = await axiosInstance.get(url, {
+    ...config,
+    params: { ...(config.params || {}), ...(cursor ? { cursor } : {}) },
+  });
+  return {
+    items: response.data,
+    nextCursor: response.headers["x-next-cursor"] || null,
+  };
+}
@@ -1,9 +1,9 @@
 import axiosInstance from "./axiosInstance";
+import { fetchPage } from "./pagination";
 
 // ---------------- PENDING QUIZZES (ADMIN) ----------------
-export async function fetchPendingQuizzes() {
-  const response = await axiosInstance.get("/quizzes/pending");
-  return response.data;
+export async function fetchPendingQuizzes(cursor = null) {
+  return fetchPage("/quizzes/pending", cursor);
 }
 
 // ---------------- APPROVE QUIZ (ADMIN) ----------------
@@ -21,9 +21,8 @@ export async function rejectQuiz(quizId, reason) {
 }
 
 // ---------------- MY QUIZZES (MODERATOR) ----------------
-export async function fetchMyQuizzes() {
-  const response = await axiosInstance.get("/quizzes/mine");
-  return response.data;
+export async function fetchMyQuizzes(cursor = null) {
+  return fetchPage("/quizzes/mine", cursor);
 }
 
 // ---------------- CREATE QUIZ (MODERATOR) ----------------
@@ -39,15 +38,13 @@ export async function deleteQuiz(quizId) {
 }
 
 // ---------------- APPROVED QUIZZES (PLAYER) ----------------
-export async function fetchApprovedQuizzes() {
-  const response = await axiosInstance.get("/quizzes");
-  return response.data;
+export async function fetchApprovedQuizzes(cursor = null) {
+  return fetchPage("/quizzes", cursor);
 }
 
 // ---------------- ALL QUIZZES (ADMIN) ----------------
-export async function fetchAllQuizzes() {
-  const response = await axiosInstance.get("/quizzes/admin/all");
-  return response.data;
+export async function fetchAllQuizzes(cursor = null) {
+  return fetchPage("/quizzes/admin/all", cursor);
 }
 
 
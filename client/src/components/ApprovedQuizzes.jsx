@@ -2,31 +2,38 @@ import { useEffect, useState } from "react";
 import { deleteQuiz, fetchAllQuizzes } from "../api/quizApi";
 import ConfirmationDialog from "./ConfirmationDialog";
 import SendQuizReportButton from "./SendQuizReportButton";
+import LoadMoreButton from "./LoadMoreButton";
+import { usePagedList } from "../hooks/usePagedList";
 
 const statusBadge = () =>
   "px-4 py-2 rounded-full text-lg font-extrabold border-2 border-[#353a7c] shadow-[3px_3px_#353a7c] bg-[linear-gradient(45deg,#353a7c,#2872CB)] text-white";
 
+// admin lista svih kvizova, a ovde se prikazuju samo odobreni
+const fetchApprovedPage = async (cursor) => {
+  const page = await fetchAllQuizzes(cursor);
+  return { ...page, items: page.items.filter((q) => q.status === "APPROVED") };
+};
+
 export default function ApprovedQuizzes() {
-  const [quizzes, setQuizzes] = useState([]);
+  const {
+    items: quizzes,
+    setItems: setQuizzes,
+    hasMore,
+    loading,
+    loadingMore,
+    reload,
+    loadMore,
+  } = usePagedList(fetchApprovedPage);
   const [error, setError] = useState("");
-  const [loading, setLoading] = useState(true);
   const [showConfirm, setShowConfirm] = useState(false);
   const [quizToDelete, setQuizToDelete] = useState(null);
 
-  const load = async () => {
-    try {
-      const data = await fetchAllQuizzes();
-      setQuizzes(data.filter((q) => q.status === "APPROVED"));
-    } catch {
-      setError("Failed to load approved quizzes");
-    } finally {
-      setLoading(false);
-    }
-  };
-
   useEffect(() => {
-    load();
-  }, []);
+    reload().catch(() => setError("Failed to load approved quizzes"));
+  }, [reload]);
+
+  const handleLoadMore = () =>
+    loadMore().catch(() => setError("Failed to load approved quizzes"));
 
   const requestDelete = (quizId) => {
     setQuizToDelete(quizId);
@@ -107,6 +114,8 @@ export default function ApprovedQuizzes() {
             ))}
           </div>
         )}
+
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={handleLoadMore} />
       </div>
 
       <ConfirmationDialog
@@ -1,6 +1,8 @@
 import { useEffect, useState } from "react";
 import { fetchAllUsers, updateUserRole, deleteUser } from "../api/dashboardApi";
 import ConfirmationDialog from "./ConfirmationDialog";
+import LoadMoreButton from "./LoadMoreButton";
+import { usePagedList } from "../hooks/usePagedList";
 
 const formatDateSerbian = (dateString) => {
   if (!dateString) return "-";
@@ -12,23 +14,24 @@ const formatDateSerbian = (dateString) => {
 };
 
 export default function Dashboard() {
-  const [users, setUsers] = useState([]);
+  const {
+    items: users,
+    setItems: setUsers,
+    hasMore,
+    loadingMore,
+    reload,
+    loadMore,
+  } = usePagedList(fetchAllUsers);
   const [error, setError] = useState("");
   const [showConfirmDialog, setShowConfirmDialog] = useState(false);
   const [userToDelete, setUserToDelete] = useState(null);
 
   useEffect(() => {
-    const loadUsers = async () => {
-      try {
-        const data = await fetchAllUsers();
-        setUsers(data);
-      } catch (err) {
-        setError("Failed to load users");
-      }
-    };
+    reload().catch(() => setError("Failed to load users"));
+  }, [reload]);
 
-    loadUsers();
-  }, []);
+  const handleLoadMore = () =>
+    loadMore().catch(() => setError("Failed to load users"));
 
   const handleRoleChange = async (userId, newRole) => {
     try {
@@ -187,6 +190,8 @@ export default function Dashboard() {
             </tbody>
           </table>
         </div>
+
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={handleLoadMore} />
       </div>
 
       <ConfirmationDialog
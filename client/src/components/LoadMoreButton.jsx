@@ -0,0 +1,15 @@
+export default function LoadMoreButton({ hasMore, loading, onClick }) {
+  if (!hasMore) return null;
+
+  return (
+    <div className="mt-4 flex justify-center">
+      <button
+        onClick={onClick}
+        disabled={loading}
+        className="relative overflow-hidden px-5 h-[38px] border-2 border-[#353a7c] rounded-[5px] bg-[#fff] shadow-[4px_4px_#353a7c] font-semibold text-[#353a7c] cursor-pointer transition-all duration-300 hover:text-[#e8e8e8] hover:shadow-[6px_6px_#353a7c] hover:border-[#fff] z-[1] before:content-[''] before:absolute before:top-0 before:left-0 before:h-full before:w-0 before:bg-[#353a7c] before:z-[-1] before:transition-all before:duration-300 hover:before:w-full disabled:opacity-60 disabled:cursor-not-allowed"
+      >
+        {loading ? "Loading..." : "Load more"}
+      </button>
+    </div>
+  );
+}
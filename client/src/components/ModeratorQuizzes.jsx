@@ -2,6 +2,8 @@ import { useEffect, useMemo, useState } from "react";
 import { deleteQuiz, fetchMyQuizzes } from "../api/quizApi";
 import ConfirmationDialog from "./ConfirmationDialog";
 import { io } from "socket.io-client";
+import LoadMoreButton from "./LoadMoreButton";
+import { usePagedList } from "../hooks/usePagedList";
 
 const statusPill = (status) => {
   const base =
@@ -13,24 +15,26 @@ const statusPill = (status) => {
 };
 
 export default function ModeratorQuizzes({ refreshToken }) {
-  const [quizzes, setQuizzes] = useState([]);
+  const {
+    items: quizzes,
+    setItems: setQuizzes,
+    hasMore,
+    loading,
+    loadingMore,
+    reload,
+    loadMore,
+  } = usePagedList(fetchMyQuizzes);
   const [error, setError] = useState("");
-  const [loading, setLoading] = useState(true);
   const [showConfirm, setShowConfirm] = useState(false);
   const [quizToDelete, setQuizToDelete] = useState(null);
 
   const token = useMemo(() => localStorage.getItem("access"), []);
 
-  const load = async () => {
-    try {
-      const data = await fetchMyQuizzes();
-      setQuizzes(data);
-    } catch {
-      setError("Failed to load quizzes");
-    } finally {
-      setLoading(false);
-    }
-  };
+  // Refresh vraca listu na prvu stranicu
+  const load = () => reload().catch(() => setError("Failed to load quizzes"));
+
+  const handleLoadMore = () =>
+    loadMore().catch(() => setError("Failed to load quizzes"));
 
   const requestDelete = (quizId) => {
     setQuizToDelete(quizId);
@@ -143,6 +147,8 @@ export default function ModeratorQuizzes({ refreshToken }) {
         </div>
       )}
 
+      <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={handleLoadMore} />
+
       <ConfirmationDialog
         isOpen={showConfirm}
         title="Delete Quiz"
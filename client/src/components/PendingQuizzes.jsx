@@ -2,31 +2,33 @@ import { useEffect, useMemo, useState } from "react";
 import { approveQuiz, fetchPendingQuizzes, rejectQuiz } from "../api/quizApi";
 import { io } from "socket.io-client";
 import ConfirmationDialog from "./ConfirmationDialog";
+import LoadMoreButton from "./LoadMoreButton";
+import { usePagedList } from "../hooks/usePagedList";
 
 const statusBadge = () =>
   "px-4 py-2 rounded-full text-lg font-extrabold border-2 border-[#353a7c] shadow-[3px_3px_#353a7c] bg-[linear-gradient(45deg,#353a7c,#2872CB)] text-white";
 
 export default function PendingQuizzes() {
-  const [pending, setPending] = useState([]);
+  const {
+    items: pending,
+    setItems: setPending,
+    hasMore,
+    loading,
+    loadingMore,
+    reload,
+    loadMore,
+  } = usePagedList(fetchPendingQuizzes);
   const [error, setError] = useState("");
   const [reasonById, setReasonById] = useState({});
-  const [loading, setLoading] = useState(true);
 
   const token = useMemo(() => localStorage.getItem("access"), []);
 
   useEffect(() => {
-    const load = async () => {
-      try {
-        const data = await fetchPendingQuizzes();
-        setPending(data);
-      } catch {
-        setError("Failed to load pending quizzes");
-      } finally {
-        setLoading(false);
-      }
-    };
-    load();
-  }, []);
+    reload().catch(() => setError("Failed to load pending quizzes"));
+  }, [reload]);
+
+  const handleLoadMore = () =>
+    loadMore().catch(() => setError("Failed to load pending quizzes"));
 
   useEffect(() => {
     if (!token) return;
@@ -144,6 +146,8 @@ export default function PendingQuizzes() {
             ))}
           </div>
         )}
+
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={handleLoadMore} />
       </div>
 
     </div>
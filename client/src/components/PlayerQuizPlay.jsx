@@ -8,6 +8,8 @@ import {
   submitQuizAttempt,
 } from "../api/quizApi";
 import QuizQuestion from "../components/QuizQuestion";
+import LoadMoreButton from "../components/LoadMoreButton";
+import { usePagedList } from "../hooks/usePagedList";
 
 import { io } from "socket.io-client";
 
@@ -18,8 +20,14 @@ const timeBadge = (text) =>
   `px-3 py-1 rounded-full text-xs font-bold border-2 border-[#353a7c] shadow-[3px_3px_#353a7c] bg-white text-[#353a7c]`;
 
 export default function PlayerQuizPlay() {
-  const [quizzes, setQuizzes] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: quizzes,
+    hasMore,
+    loading,
+    loadingMore,
+    reload,
+    loadMore,
+  } = usePagedList(fetchApprovedQuizzes);
   const [error, setError] = useState("");
 
   const [activeQuiz, setActiveQuiz] = useState(null);
@@ -37,18 +45,11 @@ export default function PlayerQuizPlay() {
   const socketRef = useRef(null);
 
   useEffect(() => {
-    const load = async () => {
-      try {
-        const data = await fetchApprovedQuizzes();
-        setQuizzes(data);
-      } catch {
-        setError("Failed to load quizzes");
-      } finally {
-        setLoading(false);
-      }
-    };
-    load();
-  }, []);
+    reload().catch(() => setError("Failed to load quizzes"));
+  }, [reload]);
+
+  const handleLoadMore = () =>
+    loadMore().catch(() => setError("Failed to load quizzes"));
 
   useEffect(() => {
     return () => {
@@ -178,11 +179,21 @@ export default function PlayerQuizPlay() {
         buildPayload(),
         remainingSeconds
       );
-      if (res.status === 202) {
-        if (timerRef.current) {
-          clearInterval(timerRef.current);
-          timerRef.current = null;
-        }
+      if (timerRef.current) {
+        clearInterval(timerRef.current);
+        timerRef.current = null;
+      }
+      if (res.status === 200) {
+        setResult({
+          score: res.data.score,
+          durationSeconds: res.data.durationSeconds,
+          finishedAt: res.data.finishedAt,
+        });
+        setStatus("done");
+        setIsSubmitting(false);
+        const lb = await fetchLeaderboard(activeQuiz.id);
+        setLeaderboard(lb);
+      } else if (res.status === 202) {
         setStatus("processing");
         startPolling(activeQuiz.id);
       }
@@ -255,6 +266,8 @@ export default function PlayerQuizPlay() {
             ))}
           </div>
         )}
+
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={handleLoadMore} />
       </div>
 
       <div className="bg-[linear-gradient(45deg,#efad21,#ffd60f)] border-2 border-[#353a7c] rounded-xl shadow-[5px_5px_#353a7c] p-6">
@@ -0,0 +1,46 @@
+import { useCallback, useState } from "react";
+
+// Lista koja se puni stranicu po stranicu. fetchPage(cursor) vraca { items, nextCursor };
+// reload ucitava prvu stranicu, loadMore dodaje sledecu. Greske se bacaju komponenti.
+export const usePagedList = (fetchPage) => {
+  const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const reload = useCallback(async () => {
+    try {
+      const page = await fetchPage(null);
+      setItems(page.items);
+      setNextCursor(page.nextCursor);
+    } finally {
+      setLoading(false);
+    }
+  }, [fetchPage]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      // stavka dodata preko socket-a moze ponovo stici na kasnijoj stranici
+      setItems((prev) => {
+        const seen = new Set(prev.map((item) => item.id));
+        return [...prev, ...page.items.filter((item) => !seen.has(item.id))];
+      });
+      setNextCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [fetchPage, nextCursor]);
+
+  return {
+    items,
+    setItems,
+    hasMore: nextCursor !== null,
+    loading,
+    loadingMore,
+    reload,
+    loadMore,
+  };
+};
@@ -7,16 +7,26 @@ CREATE TABLE IF NOT EXISTS QUIZZES_DATA.quizzes (
     status VARCHAR(20) NOT NULL,
     rejection_reason TEXT,
     author_id INT NOT NULL,
-    created_at DATETIME NOT NULL
+    created_at DATETIME NOT NULL,
+    version INT NOT NULL DEFAULT 1,
+    INDEX ix_quizzes_status_id (status, id),
+    INDEX ix_quizzes_author_id (author_id, id)
 );
 
 CREATE TABLE IF NOT EXISTS QUIZZES_DATA.quiz_attempts (
     id INT AUTO_INCREMENT PRIMARY KEY,
     quiz_id INT NOT NULL,
     player_id INT NOT NULL,
+    quiz_version INT,
     started_at DATETIME NOT NULL,
     finished_at DATETIME,
-    score INT
+    score INT,
+    state VARCHAR(16) NOT NULL DEFAULT 'STARTED',
+    scored_at DATETIME,
+    UNIQUE KEY uq_attempt_quiz_player (quiz_id, player_id),
+    INDEX ix_attempts_finished_started (finished_at, started_at),
+    INDEX ix_attempts_quiz_score (quiz_id, score DESC, finished_at, started_at, player_id),
+    INDEX ix_attempts_quiz_scored_at (quiz_id, scored_at)
 );
 
 CREATE TABLE IF NOT EXISTS QUIZZES_DATA.token_blocklist (
@@ -29,12 +39,44 @@ CREATE TABLE IF NOT EXISTS QUIZZES_DATA.questions (
     id INT AUTO_INCREMENT PRIMARY KEY,
     quiz_id INT NOT NULL,
     text TEXT NOT NULL,
-    points INT NOT NULL
+    points INT NOT NULL,
+    INDEX ix_questions_quiz_id (quiz_id)
 );
 
 CREATE TABLE IF NOT EXISTS QUIZZES_DATA.answer_options (
     id INT AUTO_INCREMENT PRIMARY KEY,
     question_id INT NOT NULL,
     text TEXT NOT NULL,
-    is_correct TINYINT(1) NOT NULL
+    is_correct TINYINT(1) NOT NULL,
+    INDEX ix_answer_options_question_id (question_id)
+);
+
+CREATE TABLE IF NOT EXISTS QUIZZES_DATA.jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    run_after DATETIME NOT NULL,
+    locked_by VARCHAR(100),
+    locked_until DATETIME,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    INDEX ix_jobs_status_run_after (status, run_after)
+);
+
+CREATE TABLE IF NOT EXISTS QUIZZES_DATA.attempt_answers (
+    attempt_id INT PRIMARY KEY,
+    quiz_id INT NOT NULL,
+    answers BLOB NOT NULL,
+    INDEX ix_attempt_answers_quiz_id (quiz_id)
+);
+
+CREATE TABLE IF NOT EXISTS QUIZZES_DATA.quiz_snapshots (
+    quiz_id INT NOT NULL,
+    version INT NOT NULL,
+    answer_key MEDIUMTEXT NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (quiz_id, version)
 );
@@ -0,0 +1,168 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from cachetools import LRUCache
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Question, AnswerOption, QuizSnapshot
+from app.cache_store import answer_key_tag, current_generation, invalidate_tags
+
+# (quiz_id, version) -> (generacija answer_key_tag-a, kompajliran kljuc). Verzije se
+# menjaju samo ponovnim bodovanjem (save_snapshot replace); tada se tag poveca pa
+# i ostali procesi odbace svoj primerak pri sledecem citanju.
+_keys = LRUCache(maxsize=256)
+_lock = threading.Lock()
+
+
+@dataclass
+class QuestionKey:
+    points: int
+    bits: dict[int, int] = field(default_factory=dict)  # answer_id -> bit
+    valid_mask: int = 0
+    correct_mask: int = 0
+
+    def mask_for(self, answer_ids):
+        """Bitmaska izabranih odgovora, ili None ako neki ID ne pripada pitanju."""
+        mask = 0
+        for answer_id in answer_ids:
+            bit = self.bits.get(answer_id)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+
+@dataclass
+class AnswerKey:
+    quiz_id: int
+    questions: dict[int, QuestionKey] = field(default_factory=dict)
+
+    def has_question(self, question_id):
+        return question_id in self.questions
+
+    def mask_for(self, question_id, answer_ids):
+        question = self.questions.get(question_id)
+        if question is None:
+            return None
+        return question.mask_for(answer_ids)
+
+    def masks_for(self, submitted_answers):
+        """{questionId: answerIds} iz predaje -> {questionId: mask}; nevazece stavke se preskacu."""
+        masks = {}
+        for item in submitted_answers or []:
+            qid = item.get("questionId")
+            answer_ids = [x for x in item.get("answerIds") or [] if isinstance(x, int)]
+            if not isinstance(qid, int) or not answer_ids:
+                continue
+
+            mask = self.mask_for(qid, answer_ids)
+            if mask:
+                masks[qid] = mask
+        return masks
+
+    def score(self, masks):
+        total = 0
+        for qid, mask in masks.items():
+            question = self.questions.get(qid)
+            if question is not None and mask == question.correct_mask:
+                total += question.points
+        return total
+
+
+def _key_from_rows(quiz_id, rows):
+    """rows: (question_id, points, answer_id, is_correct) sortirano po pitanju pa odgovoru."""
+    key = AnswerKey(quiz_id=quiz_id)
+    for question_id, points, answer_id, is_correct in rows:
+        question = key.questions.get(question_id)
+        if question is None:
+            question = QuestionKey(points=points or 0)
+            key.questions[question_id] = question
+
+        if answer_id is None:
+            continue
+
+        bit = 1 << len(question.bits)
+        question.bits[answer_id] = bit
+        question.valid_mask |= bit
+        if is_correct:
+            question.correct_mask |= bit
+    return key
+
+
+def _live_rows(quiz_id):
+    return [
+        (row.question_id, row.points, row.answer_id, bool(row.is_correct) if row.answer_id else None)
+        for row in db.session.query(
+            Question.id.label("question_id"),
+            Question.points,
+            AnswerOption.id.label("answer_id"),
+            AnswerOption.is_correct,
+        )
+        .outerjoin(AnswerOption, AnswerOption.question_id == Question.id)
+        .filter(Question.quiz_id == quiz_id)
+        .order_by(Question.id.asc(), AnswerOption.id.asc())
+    ]
+
+
+def build_answer_key(quiz_id):
+    """Kljuc iz trenutnih (zivih) redova pitanja i odgovora."""
+    return _key_from_rows(quiz_id, _live_rows(quiz_id))
+
+
+def save_snapshot(quiz_id, version, replace=False):
+    """Zamrzne trenutni kljuc kao verziju kviza; postojeci snapshot se ne menja osim uz replace."""
+    rows = _live_rows(quiz_id)
+    snapshot = QuizSnapshot.query.get((quiz_id, version))
+    if snapshot is None:
+        db.session.add(QuizSnapshot(
+            quiz_id=quiz_id,
+            version=version,
+            answer_key=json.dumps(rows),
+            created_at=datetime.utcnow(),
+        ))
+    elif replace:
+        snapshot.answer_key = json.dumps(rows)
+
+    with _lock:
+        _keys.pop((quiz_id, version), None)
+    return _key_from_rows(quiz_id, rows)
+
+
+def _load_snapshot(quiz_id, version):
+    snapshot = QuizSnapshot.query.get((quiz_id, version))
+    if snapshot is not None:
+        return _key_from_rows(quiz_id, json.loads(snapshot.answer_key))
+
+    # kvizovi odobreni pre uvodjenja snapshot-a: zamrzni trenutno stanje
+    key = save_snapshot(quiz_id, version)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+    return key
+
+
+def get_answer_key(quiz_id, version):
+    """Kompajliran kljuc za verziju kviza; nikad ne cita zive redove ako snapshot postoji."""
+    generation = current_generation(answer_key_tag(quiz_id))
+    with _lock:
+        cached = _keys.get((quiz_id, version))
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    # generacija procitana pre ucitavanja: kljuc ucitan usred invalidacije ne ostaje vazeci
+    key = _load_snapshot(quiz_id, version)
+    with _lock:
+        _keys[(quiz_id, version)] = (generation, key)
+    return key
+
+
+def invalidate_answer_key(quiz_id):
+    """Odbaci kljuceve kviza u svim procesima (deljena generacija taga), ne samo u ovom."""
+    invalidate_tags(answer_key_tag(quiz_id))
+    with _lock:
+        for cache_key in [k for k in _keys.keys() if k[0] == quiz_id]:
+            _keys.pop(cache_key, None)
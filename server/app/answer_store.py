@@ -0,0 +1,53 @@
+import struct
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import AttemptAnswers
+
+# jedan zapis po odgovorenom pitanju: question_id (uint32) + maska izabranih odgovora (uint64)
+RECORD = struct.Struct("<IQ")
+
+
+def pack_masks(masks):
+    return b"".join(RECORD.pack(qid, mask) for qid, mask in sorted(masks.items()))
+
+
+def unpack_masks(data):
+    return {qid: mask for qid, mask in RECORD.iter_unpack(data or b"")}
+
+
+def store_answers(attempt_id, quiz_id, masks):
+    """Doda red u tekucu transakciju, upisuje se zajedno sa promenom stanja pokusaja."""
+    db.session.add(AttemptAnswers(
+        attempt_id=attempt_id,
+        quiz_id=quiz_id,
+        answers=pack_masks(masks),
+    ))
+
+
+def load_answers(attempt_id):
+    row = AttemptAnswers.query.get(attempt_id)
+    return unpack_masks(row.answers) if row else None
+
+
+def load_quiz_answer_rows(quiz_id):
+    """Sirovi (attempt_id, answers) parovi svih pokusaja kviza, jednim upitom.
+
+    Core select bez ORM punjenja redova: za ceo kviz (npr. 100k pokusaja) ORM
+    sloj je kostao vise od samog citanja.
+    """
+    table = AttemptAnswers.__table__
+    return db.session.execute(
+        select(table.c.attempt_id, table.c.answers)
+        .where(table.c.quiz_id == quiz_id)
+        .order_by(table.c.attempt_id.asc()),
+        bind_arguments={"mapper": AttemptAnswers},
+    ).all()
+
+
+def load_quiz_answers(quiz_id):
+    return {
+        row.attempt_id: unpack_masks(row.answers)
+        for row in load_quiz_answer_rows(quiz_id)
+    }
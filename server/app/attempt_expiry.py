@@ -0,0 +1,94 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import func, text
+
+from app.extensions import db, socketio
+from app.models import Quiz, QuizAttempt
+from app.leaderboard import leaderboards
+
+logger = logging.getLogger(__name__)
+
+
+def expire_attempts(attempt_ids, now):
+    """Set-based zavrsetak isteklih pokusaja sa 0 bodova (STARTED -> SCORED)."""
+    if not attempt_ids:
+        return 0
+    return (
+        QuizAttempt.query
+        .filter(QuizAttempt.id.in_(attempt_ids), QuizAttempt.state == "STARTED")
+        .update(
+            {"state": "SCORED", "finished_at": now, "score": 0, "scored_at": now},
+            synchronize_session=False,
+        )
+    )
+
+
+def notify_expired(rows, now):
+    for row in rows:
+        socketio.emit(
+            "quiz_result_ready",
+            {
+                "quizId": row.quiz_id,
+                "attemptId": row.id,
+                "score": 0,
+                "durationSeconds": int((now - row.started_at).total_seconds()),
+                "finishedAt": now.isoformat(),
+            },
+            to=f"user:{row.player_id}",
+        )
+
+        leaderboards.record(row.quiz_id, row.id, row.player_id, 0, row.started_at, now)
+
+
+def sweep_expired_attempts(batch_size):
+    """Zavrsi jednu seriju pokusaja kojima je isteklo vreme. Vraca broj zavrsenih."""
+    now = datetime.utcnow()
+    deadline = func.timestampadd(text("SECOND"), Quiz.duration_seconds, QuizAttempt.started_at)
+
+    # indeks (finished_at, started_at) suzava pretragu na nezavrsene, najstarije prvo
+    rows = (
+        db.session.query(
+            QuizAttempt.id,
+            QuizAttempt.quiz_id,
+            QuizAttempt.player_id,
+            QuizAttempt.started_at,
+        )
+        .join(Quiz, Quiz.id == QuizAttempt.quiz_id)
+        .filter(QuizAttempt.finished_at.is_(None))
+        .filter(QuizAttempt.started_at < now)
+        .filter(deadline < now)
+        .order_by(QuizAttempt.started_at.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=QuizAttempt)
+        .all()
+    )
+    if not rows:
+        db.session.commit()
+        return 0
+
+    expire_attempts([row.id for row in rows], now)
+    db.session.commit()
+    notify_expired(rows, now)
+    return len(rows)
+
+
+def _sweep_loop(app):
+    interval = app.config["EXPIRY_SWEEP_INTERVAL"]
+    batch_size = app.config["EXPIRY_SWEEP_BATCH"]
+
+    while True:
+        socketio.sleep(interval)
+        with app.app_context():
+            try:
+                # prazni seriju po seriju dok ima zaostalih
+                while sweep_expired_attempts(batch_size) == batch_size:
+                    socketio.sleep(0)
+            except Exception:
+                logger.exception("attempt expiry sweep failed")
+                db.session.rollback()
+
+
+def start_expiry_sweeper(app):
+    if app.config["EXPIRY_SWEEP_ENABLED"]:
+        socketio.start_background_task(_sweep_loop, app)
@@ -8,6 +8,8 @@ from app.extensions import db
 from app.models import User, TokenBlocklist, Quiz, QuizAttempt
 from app.dto import UserDTO
 from app.mail_service import send_role_changed_email_async
+from app.pagination import CursorError, page_params, paginate, page_response
+from app.replicas import read_only
 
 def require_role(*allowed_roles):
     claims = get_jwt()
@@ -124,6 +126,7 @@ def logout():
 # ---------------- KORISNIK ----------------
 @auth_bp.route("/me", methods=["GET"])
 @jwt_required()
+@read_only
 def me():
     user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
@@ -146,8 +149,13 @@ def list_users():
     if claims.get("role") != "ADMIN":
         return jsonify({"message": "Forbidden"}), 403
 
-    users = User.query.order_by(User.id.asc()).all()
-    return jsonify([UserDTO.from_model(u).to_dict() for u in users]), 200
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    users, next_cursor = paginate(User.query, User.id, page)
+    return page_response([UserDTO.from_model(u).to_dict() for u in users], next_cursor), 200
 
 # ---------------- ADMIN POSTAVI USER ROLE ----------------
 @auth_bp.route("/users/<int:user_id>/role", methods=["PATCH"])
@@ -197,8 +205,13 @@ def admin_get_all_users():
     if claims.get("role") != "ADMIN":
         return jsonify({"message": "Forbidden"}), 403
 
-    # Dohvati sve korisnike iz baze
-    users = User.query.order_by(User.id.asc()).all()
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    # Dohvati jednu stranicu korisnika (keyset po id)
+    users, next_cursor = paginate(User.query, User.id, page)
 
     # Pretvori u JSON niz
     users_list = [
@@ -221,5 +234,5 @@ def admin_get_all_users():
         for u in users
     ]
 
-    return jsonify(users_list), 200
+    return page_response(users_list, next_cursor), 200
 
@@ -0,0 +1,115 @@
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import QuizAttempt
+from app.answer_key import build_answer_key
+from app.answer_store import RECORD, load_quiz_answer_rows
+
+RECORD_DTYPE = np.dtype([("question_id", "<u4"), ("mask", "<u8")])
+
+# najvise ID-eva u jednom IN (...); ispod SQLite limita parametara (32766)
+WRITE_CHUNK = 5000
+
+
+def load_mask_matrix(quiz_id, question_ids):
+    return mask_matrix(load_quiz_answer_rows(quiz_id), question_ids)
+
+
+def mask_matrix(rows, question_ids):
+    """Maske pokusaji x pitanja iz (attempt_id, answers) redova, bez petlje po zapisu."""
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(question_ids)), dtype=np.int64)
+
+    # transponovanje i duzine u C-u (zip/map), bez pristupa atributima reda u Python petlji
+    attempt_ids, blobs = zip(*rows)
+    attempt_ids = np.array(attempt_ids, dtype=np.int64)
+    masks = np.zeros((len(rows), len(question_ids)), dtype=np.int64)
+    if not question_ids:
+        return attempt_ids, masks
+
+    records = np.frombuffer(b"".join(blobs), dtype=RECORD_DTYPE)
+    lengths = np.fromiter(map(len, blobs), dtype=np.int64, count=len(blobs))
+    row_index = np.repeat(np.arange(len(rows)), lengths // RECORD.size)
+
+    # question_id -> kolona; pitanja kojih vise nema u kljucu se preskacu
+    columns = np.asarray(question_ids, dtype=np.int64)
+    order = np.argsort(columns)
+    position = np.searchsorted(columns, records["question_id"], sorter=order)
+    column = order[np.minimum(position, len(columns) - 1)]
+    known = columns[column] == records["question_id"]
+
+    masks[row_index[known], column[known]] = records["mask"][known].astype(np.int64)
+    return attempt_ids, masks
+
+
+def score_masks(key, question_ids, masks):
+    """Bodovi po pokusaju iz matrice maski pokusaji x pitanja.
+
+    Pitanje nosi poene ako je odgovoreno i izbor (u granicama ponudjenih
+    odgovora) je tacno jednak kljucu; porede se cele maske, bez razlaganja na
+    bitove. Maske su int64, tj. najvise 63 odgovora po pitanju.
+    """
+    if masks.shape[0] == 0 or not question_ids:
+        return np.zeros(masks.shape[0], dtype=np.int64)
+
+    questions = [key.questions[qid] for qid in question_ids]
+    valid = np.array([question.valid_mask for question in questions], dtype=np.int64)
+    correct = np.array([question.correct_mask for question in questions], dtype=np.int64)
+    points = np.array([question.points for question in questions], dtype=np.int64)
+
+    chosen = masks & valid
+    return ((chosen == correct) & (chosen != 0)).astype(np.int64) @ points
+
+
+def write_scores(scores):
+    """Upise {attempt_id: score} sa po jednim UPDATE ... WHERE id IN (...) po vrednosti skora.
+
+    executemany UPDATE nije batch: mysql-connector spaja samo INSERT-e, pa bi
+    100k pokusaja bilo 100k povrataka do baze. Razlicitih skorova ima koliko i
+    mogucih zbirova poena (desetine), pa je naredbi toliko, puta broj parcadi
+    od WRITE_CHUNK ID-eva.
+
+    Menja samo vec bodovane (SCORED) pokusaje. SUBMITTED pokusaje boduje njihov
+    score_attempt posao, koji i objavljuje rezultat; da ih ovde oznacimo kao
+    SCORED, posao bi izasao ranije i igrac nikad ne bi dobio rezultat. Posao
+    koristi isti (novi) snapshot, jer ga rescore zameni pre poziva.
+    """
+    if not scores:
+        return 0
+
+    by_score = defaultdict(list)
+    for attempt_id, score in scores.items():
+        by_score[score].append(attempt_id)
+
+    table = QuizAttempt.__table__
+    scored_at = datetime.utcnow()
+    for score, attempt_ids in by_score.items():
+        for first in range(0, len(attempt_ids), WRITE_CHUNK):
+            db.session.execute(
+                update(table)
+                .where(table.c.id.in_(attempt_ids[first:first + WRITE_CHUNK]), table.c.state == "SCORED")
+                .values(score=score, scored_at=scored_at)
+            )
+    return len(scores)
+
+
+def rescore_quiz(quiz_id, key=None):
+    """Ponovo boduje sve pokusaje kviza sa sacuvanim odgovorima u jednom prolazu.
+
+    Istekli pokusaji nemaju sacuvane odgovore i ostaju na 0.
+    """
+    if key is None:
+        # kljuc se gradi iz trenutnog stanja baze, ne iz kesa (npr. posle ispravke is_correct)
+        key = build_answer_key(quiz_id)
+    question_ids = [qid for qid, question in key.questions.items() if question.bits]
+
+    attempt_ids, masks = load_mask_matrix(quiz_id, question_ids)
+    scores = score_masks(key, question_ids, masks)
+
+    updated = write_scores(dict(zip(attempt_ids.tolist(), scores.tolist())))
+    db.session.commit()
+    return updated
@@ -0,0 +1,90 @@
+import logging
+import re
+import threading
+from collections import defaultdict
+
+from app.latency import LatencyWindow
+
+logger = logging.getLogger("app.cache")
+
+_NUMBER = re.compile(r"^\d+$")
+
+COUNTERS = ("hits", "staleHits", "misses", "fills", "fillErrors", "evictions", "expirations", "invalidations")
+
+
+def key_family(key):
+    """quiz:42:details:PLAYER -> quiz:*:details:PLAYER, da se brojaci ne granaju po ID-u."""
+    return ":".join("*" if _NUMBER.match(part) else part for part in str(key).split(":"))
+
+
+class CacheMetrics:
+    """Brojaci po familiji kljuceva; jeftini za hot path, bez ispisa na stdout."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._fill_times = defaultdict(LatencyWindow)
+        # familija taga -> familije kljuceva upisanih pod njim (quiz:* -> quiz:*:details:PLAYER, ...)
+        self._tag_families = defaultdict(set)
+
+    def incr(self, key, counter, amount=1):
+        family = key_family(key)
+        with self._lock:
+            self._counters[family][counter] += amount
+
+    def track_tags(self, key, tags):
+        family = key_family(key)
+        with self._lock:
+            for tag in tags:
+                self._tag_families[key_family(tag)].add(family)
+
+    def record_invalidation(self, tag):
+        """Invalidacija taga se broji na familijama kljuceva, uz njihove hits/misses.
+
+        Poznate su samo familije koje je ovaj proces upisao pod tim tagom.
+        """
+        with self._lock:
+            for family in self._tag_families.get(key_family(tag), ()):
+                self._counters[family]["invalidations"] += 1
+
+    def record_fill(self, key, seconds):
+        family = key_family(key)
+        with self._lock:
+            self._counters[family]["fills"] += 1
+            window = self._fill_times[family]
+        window.add(seconds)
+        logger.debug("cache fill family=%s key=%s seconds=%.4f", family, key, seconds)
+
+    def snapshot(self, sizes=None):
+        """sizes: {familija: (broj_unosa, bajtova)} iz backend-a."""
+        sizes = sizes or {}
+        with self._lock:
+            counters = {family: dict(values) for family, values in self._counters.items()}
+            fill_times = dict(self._fill_times)
+
+        families = {}
+        for family in set(counters) | set(sizes):
+            values = counters.get(family) or dict.fromkeys(COUNTERS, 0)
+            lookups = values["hits"] + values["staleHits"] + values["misses"]
+            entries, size_bytes = sizes.get(family, (0, 0))
+            window = fill_times.get(family)
+
+            values["hitRatio"] = round((values["hits"] + values["staleHits"]) / lookups, 4) if lookups else None
+            values["fillSeconds"] = window.summary() if window else None
+            values["entries"] = entries
+            values["bytes"] = size_bytes
+            families[family] = values
+        return families
+
+    def log_snapshot(self, sizes=None):
+        for family, values in sorted(self.snapshot(sizes).items()):
+            logger.info(
+                "cache stats family=%s hits=%d stale_hits=%d misses=%d fills=%d evictions=%d "
+                "expirations=%d invalidations=%d entries=%d bytes=%d",
+                family, values["hits"], values["staleHits"], values["misses"], values["fills"],
+                values["evictions"], values["expirations"], values["invalidations"],
+                values["entries"], values["bytes"],
+            )
+
+
+cache_metrics = CacheMetrics()
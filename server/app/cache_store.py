@@ -1,13 +1,457 @@
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
 from cachetools import TTLCache
+from flask import current_app
+
+from app.extensions import socketio
+from app.cache_metrics import cache_metrics, key_family
+from app.replicas import use_primary
+
+logger = logging.getLogger(__name__)
+
+PENDING_TAG = "quizzes:pending"
+APPROVED_TAG = "quizzes:approved"
+
+# koliko upisa izmedju dva ciscenja isteklih/visak redova u sqlite backend-u
+SQLITE_PRUNE_EVERY = 100
+
+
+def quiz_tag(quiz_id):
+    return f"quiz:{quiz_id}"
+
+
+def leaderboard_tag(quiz_id):
+    return f"quiz:{quiz_id}:leaderboard"
+
+
+def answer_key_tag(quiz_id):
+    return f"quiz:{quiz_id}:answer_key"
 
-# 1 minut TTL
-cache = TTLCache(maxsize=512, ttl=60)
 
 def cache_key(*parts):
     return ":".join(str(p) for p in parts)
 
-def invalidate_prefix(prefix: str):
-    """Obrisi sve kljuceve koji pocinju prefiksom."""
-    keys = [k for k in list(cache.keys()) if str(k).startswith(prefix)]
-    for k in keys:
-        cache.pop(k, None)
+
+def _entry_bytes(entry):
+    # gotova tela odgovora se mere direktno, ostalo po velicini pickle zapisa
+    body = getattr(entry[0], "body", None)
+    if isinstance(body, bytes):
+        return len(body)
+    return len(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# ---------------- BACKENDI ----------------
+class _MeteredTTLCache(TTLCache):
+    """TTLCache koji broji izbacivanja zbog velicine i isteka."""
+
+    def popitem(self):
+        key, value = super().popitem()
+        cache_metrics.incr(key, "evictions")
+        return key, value
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            cache_metrics.incr(key, "expirations")
+        return expired
+
+
+class LocalCacheBackend:
+    """Kes u memoriji procesa; invalidacija ne stize do drugih procesa."""
+
+    name = "local"
+
+    def __init__(self, maxsize=512, ttl=60):
+        self.maxsize = maxsize
+        self._data = _MeteredTTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key, entry):
+        with self._lock:
+            self._data[key] = entry
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def generations(self, tags):
+        with self._lock:
+            return {tag: self._generations.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def sizes(self):
+        with self._lock:
+            self._data.expire()
+            entries = list(self._data.items())
+
+        sizes = {}
+        for key, entry in entries:
+            count, size_bytes = sizes.get(key_family(key), (0, 0))
+            sizes[key_family(key)] = (count + 1, size_bytes + _entry_bytes(entry))
+        return sizes
+
+
+class SqliteCacheBackend:
+    """Kes u deljenoj SQLite (WAL) datoteci: svi web procesi i radnici na istoj
+    masini vide iste unose i iste generacije tagova, pa se invalidacija u
+    jednom procesu odmah vidi u svim ostalim.
+
+    sqlite3 pozivi blokiraju nit koja ih zove (upis ceka zakljucavanje datoteke
+    do 5 s kad vise procesa pise). Pod eventlet-om bi to zaustavilo ceo hub, pa
+    se tada izvrsavaju u eventlet.tpool niti; green nit koja drzi _lock ceka,
+    a ostale rade. Cena je jedan prelaz u tpool (desetine mikrosekundi) po pozivu.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, maxsize=512, ttl=60):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._tpool = _green_tpool()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            path,
+            timeout=5,
+            isolation_level=None,  # autocommit, svaka naredba je svoja transakcija
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_tags ("
+            " tag TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+
+    def _call(self, function, *args):
+        # poziva se pod _lock-om; u tpool niti se ne dira nista sto zavisi od green niti
+        if self._tpool is None:
+            return function(*args)
+        return self._tpool.execute(function, *args)
+
+    def _fetchall(self, sql, params=()):
+        return self._conn.execute(sql, params).fetchall()
+
+    def get(self, key):
+        with self._lock:
+            rows = self._call(
+                self._fetchall, "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            )
+        if not rows or rows[0][1] <= time.time():
+            return None
+        return pickle.loads(rows[0][0])
+
+    def set(self, key, entry):
+        value = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._call(
+                self._conn.execute,
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl),
+            )
+            self._writes += 1
+            pruned = self._call(self._prune) if self._writes % SQLITE_PRUNE_EVERY == 0 else None
+
+        if pruned:
+            expired, evicted = pruned
+            for (key,) in expired:
+                cache_metrics.incr(key, "expirations")
+            for (key,) in evicted:
+                cache_metrics.incr(key, "evictions")
+
+    def delete(self, key):
+        with self._lock:
+            self._call(self._conn.execute, "DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _prune(self):
+        now = time.time()
+        expired = self._conn.execute(
+            "SELECT key FROM cache_entries WHERE expires_at <= ?", (now,)
+        ).fetchall()
+        # iznad maxsize izbaci one koji najpre isticu (najstariji upisi)
+        evicted = self._conn.execute(
+            "SELECT key FROM cache_entries WHERE expires_at > ?"
+            " ORDER BY expires_at DESC LIMIT -1 OFFSET ?",
+            (now, self.maxsize),
+        ).fetchall()
+
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", expired + evicted)
+        return expired, evicted
+
+    def generations(self, tags):
+        tags = list(tags)
+        if not tags:
+            return {}
+        placeholders = ",".join("?" * len(tags))
+        with self._lock:
+            rows = self._call(
+                self._fetchall,
+                f"SELECT tag, generation FROM cache_tags WHERE tag IN ({placeholders})",
+                tags,
+            )
+        found = dict(rows)
+        return {tag: found.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        with self._lock:
+            self._call(
+                self._conn.executemany,
+                "INSERT INTO cache_tags (tag, generation) VALUES (?, 1)"
+                " ON CONFLICT(tag) DO UPDATE SET generation = generation + 1",
+                [(tag,) for tag in tags],
+            )
+
+    def sizes(self):
+        with self._lock:
+            rows = self._call(
+                self._fetchall,
+                "SELECT key, length(value) FROM cache_entries WHERE expires_at > ?",
+                (time.time(),),
+            )
+
+        sizes = {}
+        for key, size_bytes in rows:
+            count, total = sizes.get(key_family(key), (0, 0))
+            sizes[key_family(key)] = (count + 1, total + size_bytes)
+        return sizes
+
+
+def _green_tpool():
+    """eventlet.tpool ako je proces monkey-patch-ovan (app.main), inace None."""
+    eventlet = sys.modules.get("eventlet")
+    if eventlet is None or not eventlet.patcher.is_monkey_patched("thread"):
+        return None
+    from eventlet import tpool
+
+    return tpool
+
+
+# podrazumevano lokalni; init_cache bira backend iz konfiguracije
+_backend = LocalCacheBackend()
+_ttl = 60
+_stale_ttl = 0
+
+# kljuc -> ucitavanje u toku; samo jedna green nit po kljucu racuna vrednost
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def init_cache(app):
+    global _backend, _ttl, _stale_ttl
+    _ttl = app.config["CACHE_TTL"]
+    _stale_ttl = app.config["CACHE_STALE_TTL"]
+    maxsize = app.config["CACHE_MAXSIZE"]
+    # unos ostaje u backend-u jos _stale_ttl posle isteka da bi mogao da se posluzi dok se osvezava
+    ttl = _ttl + _stale_ttl
+
+    if app.config["CACHE_BACKEND"] == "sqlite":
+        _backend = SqliteCacheBackend(app.config["CACHE_SQLITE_PATH"], maxsize=maxsize, ttl=ttl)
+    else:
+        _backend = LocalCacheBackend(maxsize=maxsize, ttl=ttl)
+
+
+# ---------------- API ----------------
+def _lookup(key):
+    """(value, fresh) za vazeci unos, inace None. Invalidirani unosi se nikad ne vracaju."""
+    entry = _backend.get(key)
+    if entry is None:
+        return None
+
+    value, tags, fresh_until = entry
+    current = _backend.generations(tag for tag, _ in tags)
+    for tag, generation in tags:
+        if current[tag] != generation:
+            _backend.delete(key)
+            return None
+    return value, time.time() < fresh_until
+
+
+def _store(key, value, generations):
+    cache_metrics.track_tags(key, generations)
+    _backend.set(key, (value, tuple(generations.items()), time.time() + _ttl))
+
+
+def cache_get(key):
+    """Vrednost iz kesa ili None ako je nema, istekla je ili joj je neki tag invalidiran."""
+    found = _lookup(key)
+    if found is None or not found[1]:
+        cache_metrics.incr(key, "misses")
+        return None
+    cache_metrics.incr(key, "hits")
+    return found[0]
+
+
+def cache_set(key, value, tags=()):
+    """Upise vrednost zajedno sa trenutnim generacijama njenih tagova."""
+    _store(key, value, _backend.generations(tags))
+
+
+def _claim(key):
+    """(flight, leader): postojece ucitavanje kljuca ili novo koje pozivalac mora da zavrsi."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = _Flight()
+        _flights[key] = flight
+        return flight, True
+
+
+def _load(key, loader, tags):
+    """Pokrene loader kao vodja ili saceka vodju koji vec ucitava isti kljuc."""
+    flight, leader = _claim(key)
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+    return _fill(key, loader, tags, flight)
+
+
+def _fill(key, loader, tags, flight):
+    started_at = time.monotonic()
+    try:
+        # generacije pre citanja iz baze: invalidacija tokom ucitavanja cini upis zastarelim
+        generations = _backend.generations(tags)
+        # puni se sa primarne: replika posle invalidacije mozda jos nema izmenu,
+        # a zastareo unos bi ostao u kesu do isteka TTL-a
+        with use_primary():
+            flight.value = loader()
+        if flight.value is not None:
+            _store(key, flight.value, generations)
+        cache_metrics.record_fill(key, time.monotonic() - started_at)
+        return flight.value
+    except Exception as exc:
+        flight.error = exc
+        cache_metrics.incr(key, "fillErrors")
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _refresh(app, key, loader, tags, flight):
+    with app.app_context():
+        try:
+            _fill(key, loader, tags, flight)
+        except Exception:
+            logger.exception("cache refresh failed for %s", key)
+
+
+def cache_get_or_load(key, loader, tags=()):
+    """Vrednost iz kesa; na promasaj samo jedan pozivalac pokrece loader, ostali cekaju njegov rezultat.
+
+    Uz CACHE_STALE_TTL istekao (ali ne invalidiran) unos se i dalje vraca dok
+    se u pozadini osvezava. Loader ne sme da koristi request context (JWT, request).
+    """
+    found = _lookup(key)
+    if found is not None:
+        value, fresh = found
+        if fresh:
+            cache_metrics.incr(key, "hits")
+            return value
+
+        cache_metrics.incr(key, "staleHits")
+        # osvezavanje se prijavljuje odmah, ne tek kad pozadinski zadatak krene:
+        # inace bi svaki stale hit do tada pokrenuo svoje
+        flight, leader = _claim(key)
+        if leader:
+            try:
+                socketio.start_background_task(
+                    _refresh, current_app._get_current_object(), key, loader, tags, flight
+                )
+            except Exception:
+                # prijavljeno osvezavanje koje nikad ne krene bi zauvek blokiralo promasaje
+                with _flights_lock:
+                    _flights.pop(key, None)
+                flight.done.set()
+                raise
+        return value
+
+    cache_metrics.incr(key, "misses")
+    return _load(key, loader, tags)
+
+
+def current_generation(tag):
+    return _backend.generations((tag,))[tag]
+
+
+def invalidate_tags(*tags):
+    """O(1) po tagu: poveca generaciju, zastareli unosi se odbacuju pri citanju ili ih izbaci TTL/LRU."""
+    _backend.bump(tags)
+    for tag in tags:
+        cache_metrics.record_invalidation(tag)
+
+
+# ---------------- VREMENSKE OZNAKE ----------------
+def mark_time(key):
+    """Upise trenutno vreme pod kljucem; vide ga svi procesi koji dele backend."""
+    # oblik unosa kao kod cache_set (nikad svez), da ga sizes()/metrike citaju kao svaki drugi
+    _backend.set(key, (time.time(), (), 0.0))
+
+
+def marked_at(key):
+    """Vreme poslednjeg mark_time(key) ili None ako ga nema (ili ga je backend vec izbacio)."""
+    entry = _backend.get(key)
+    return None if entry is None else entry[0]
+
+
+# ---------------- METRIKE ----------------
+def cache_stats():
+    return {
+        "backend": _backend.name,
+        "maxsize": _backend.maxsize,
+        "ttlSeconds": _ttl,
+        "staleTtlSeconds": _stale_ttl,
+        "families": cache_metrics.snapshot(_backend.sizes()),
+    }
+
+
+def _stats_log_loop(interval):
+    while True:
+        socketio.sleep(interval)
+        try:
+            cache_metrics.log_snapshot(_backend.sizes())
+        except Exception:
+            logger.exception("cache stats logging failed")
+
+
+def start_cache_stats_logger(app):
+    interval = app.config["CACHE_STATS_LOG_INTERVAL"]
+    if interval > 0:
+        socketio.start_background_task(_stats_log_loop, interval)
@@ -1,7 +1,10 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from pathlib import Path
 
+from app.db_engine import bind_config, engine_options
+
 # putanja do /server/.env
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -25,14 +28,89 @@ class Config:
         f"@{DB_HOST}:{DB_PORT}/{USER_DB_NAME}"
     )
     
+    # Pool konekcija: USER_DB_* / QUIZ_DB_* po bind-u, inace zajednicki DB_*
+    # (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING)
+    # DB_DRIVER_MODE (pure/tpool/native) i DB_TPOOL_SIZE cita app.db_engine
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options("USER_DB", SQLALCHEMY_DATABASE_URI)
+
     # Binds - mapiranje modela na baze
     SQLALCHEMY_BINDS = {
-        'user_data': f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{USER_DB_NAME}",
-        'quiz_data': f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{QUIZ_DB_NAME}"
+        'user_data': bind_config(
+            f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{USER_DB_NAME}",
+            "USER_DB",
+        ),
+        'quiz_data': bind_config(
+            f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{QUIZ_DB_NAME}",
+            "QUIZ_DB",
+        ),
     }
     
+    # Replike za citanje (@read_only GET handleri); bez URL-a bind cita sa primarne
+    USER_DB_REPLICA_URL = os.getenv("USER_DB_REPLICA_URL")
+    QUIZ_DB_REPLICA_URL = os.getenv("QUIZ_DB_REPLICA_URL")
+    REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "2"))  # sekunde; veci lag salje citanja na primarnu
+    # posle upisa korisnik cita sa primarne; pamti se u kes backend-u (deljen samo sa
+    # CACHE_BACKEND=sqlite), pa CACHE_TTL + CACHE_STALE_TTL ne sme biti kraci
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+    REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))  # sekunde
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = True  # Debug SQL queries
+    SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"  # Debug SQL queries
+
+    # Pool radnika za bodovanje kvizova
+    SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "4"))
+    SCORING_QUEUE_SIZE = int(os.getenv("SCORING_QUEUE_SIZE", "1000"))
+    SCORING_RETRY_AFTER = int(os.getenv("SCORING_RETRY_AFTER", "5"))  # sekunde
+    # inline: bodovanje u samom zahtevu, async: preko pool-a/reda poslova,
+    # auto: inline za kvizove do SCORING_INLINE_MAX_QUESTIONS pitanja
+    SCORING_MODE = os.getenv("SCORING_MODE", "auto").lower()
+    SCORING_INLINE_MAX_QUESTIONS = int(os.getenv("SCORING_INLINE_MAX_QUESTIONS", "50"))
+    SCORING_SIMULATED_DELAY = float(os.getenv("SCORING_SIMULATED_DELAY", "0"))  # sekunde, samo async
+
+    # Trajni red poslova (tabela jobs)
+    JOB_POLLER_ENABLED = os.getenv("JOB_POLLER_ENABLED", "true").lower() == "true"
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))  # sekunde
+    JOB_POLL_BATCH = int(os.getenv("JOB_POLL_BATCH", "50"))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+    JOB_DISPATCH_GRACE = int(os.getenv("JOB_DISPATCH_GRACE", "10"))  # sekunde pre nego sto poller preuzme
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_BACKOFF_SECONDS = int(os.getenv("JOB_BACKOFF_SECONDS", "5"))
+    JOB_BACKOFF_MAX_SECONDS = int(os.getenv("JOB_BACKOFF_MAX_SECONDS", "600"))
+
+    # Zajednicki red za Socket.IO (npr. redis://localhost:6379/0, trazi paket redis): bez njega
+    # dogadjaji emitovani iz app.worker procesa (rezultati, istekli pokusaji) ne stizu do klijenata
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE") or None
+
+    # Pozadinsko zavrsavanje isteklih pokusaja; u app.worker je iskljuceno osim uz SOCKETIO_MESSAGE_QUEUE
+    EXPIRY_SWEEP_ENABLED = os.getenv("EXPIRY_SWEEP_ENABLED", "true").lower() == "true"
+    EXPIRY_SWEEP_INTERVAL = float(os.getenv("EXPIRY_SWEEP_INTERVAL", "5"))  # sekunde
+    EXPIRY_SWEEP_BATCH = int(os.getenv("EXPIRY_SWEEP_BATCH", "500"))
+
+    # Kes odgovora: local (po procesu) ili sqlite (deljen izmedju procesa na istoj masini).
+    # Uz app.worker ili vise web procesa mora sqlite; app.worker bez njega ne krece.
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()
+    CACHE_SQLITE_PATH = os.getenv(
+        "CACHE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "drs_quiz_cache.sqlite3")
+    )
+    CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", "512"))
+    CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))  # sekunde
+    # koliko dugo posle TTL-a se stari unos sluzi dok se osvezava u pozadini (0 = iskljuceno)
+    CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "0"))
+    CACHE_STATS_LOG_INTERVAL = float(os.getenv("CACHE_STATS_LOG_INTERVAL", "60"))  # sekunde, 0 = bez logovanja
+
+    # Rang liste u memoriji procesa: najvise toliko kvizova i ukupno redova (LRU, ~300 B po redu).
+    # Lista veca od LEADERBOARD_MAX_ROWS se ne ucitava; mesto i stranice daju upiti nad ix_attempts_quiz_score.
+    LEADERBOARD_MAX_BOARDS = int(os.getenv("LEADERBOARD_MAX_BOARDS", "100"))
+    LEADERBOARD_MAX_ROWS = int(os.getenv("LEADERBOARD_MAX_ROWS", "500000"))
+    # sekunde pre poslednjeg ucitanog scored_at koje se ponovo citaju pri dopuni liste
+    LEADERBOARD_CATCHUP_MARGIN = int(os.getenv("LEADERBOARD_CATCHUP_MARGIN", "10"))
+    # sekunde posle kojih se lista dopuni iz baze i bez promene generacije taga; sa
+    # CACHE_BACKEND=local je to jedini nacin da stignu rezultati iz drugih procesa
+    LEADERBOARD_MAX_AGE = int(os.getenv("LEADERBOARD_MAX_AGE", "30"))
+
+    # Keyset paginacija listi (?limit=&cursor=, sledeca stranica u X-Next-Cursor)
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "500"))
 
 # Debug print
 print(f"USER_DATA database: {Config.USER_DB_NAME}")
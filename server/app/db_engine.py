@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from app.latency import LatencyWindow
+
+# Podesavanja engine-a po bind-u iz env-a. Za bind sa prefiksom npr. QUIZ_DB
+# vazi QUIZ_DB_POOL_SIZE, a ako nije zadat, zajednicki DB_POOL_SIZE.
+
+# Nacin rada drajvera pod eventlet-om (DB_DRIVER_MODE):
+#   pure   - mysql-connector u cistom Python-u; socket je monkey-patch-ovan,
+#            pa upit koji ceka na bazu pusta ostale green thread-ove da rade
+#   tpool  - C ekstenzija, ali svaki poziv drajvera ide u eventlet.tpool
+#            (ogranicen broj pravih niti, DB_TPOOL_SIZE)
+#   native - C ekstenzija direktno; blokira ceo hub dok upit traje
+DRIVER_MODES = ("pure", "tpool", "native")
+DRIVER_MODE = os.getenv("DB_DRIVER_MODE", "pure").lower()
+if DRIVER_MODE not in DRIVER_MODES:
+    raise ValueError(f"DB_DRIVER_MODE must be one of {', '.join(DRIVER_MODES)}")
+TPOOL_SIZE = int(os.getenv("DB_TPOOL_SIZE", "20"))
+
+
+def _env(prefix, name, default):
+    return os.getenv(f"{prefix}_{name}", os.getenv(f"DB_{name}", default))
+
+
+def engine_options(prefix, url):
+    options = {
+        "pool_size": int(_env(prefix, "POOL_SIZE", "10")),
+        "max_overflow": int(_env(prefix, "MAX_OVERFLOW", "20")),
+        "pool_timeout": float(_env(prefix, "POOL_TIMEOUT", "30")),  # sekunde cekanja na konekciju
+        # ispod MySQL wait_timeout-a, da pool ne vrati konekciju koju je server vec zatvorio
+        "pool_recycle": int(_env(prefix, "POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env(prefix, "POOL_PRE_PING", "true").lower() == "true",
+        "poolclass": InstrumentedQueuePool,
+    }
+    # use_pure je argument mysql-connector-a; sqlite3.connect bi pao sa TypeError
+    if make_url(url).get_backend_name() == "mysql":
+        options["connect_args"] = {"use_pure": DRIVER_MODE == "pure"}
+    return options
+
+
+def bind_config(url, prefix):
+    """Vrednost za SQLALCHEMY_BINDS: URL plus opcije pool-a samo za taj bind."""
+    return {"url": url, **engine_options(prefix, url)}
+
+
+# ---------------- DRAJVER ----------------
+def _tpool_connect(dialect, record, cargs, cparams):
+    from eventlet import tpool
+
+    connection = tpool.execute(dialect.loaded_dbapi.connect, *cargs, **cparams)
+    # i kursori idu kroz tpool: execute/fetch se izvrsavaju u pravoj niti
+    return tpool.Proxy(connection, autowrap_names=("cursor",))
+
+
+def prepare_engine(engine):
+    if DRIVER_MODE == "tpool":
+        event.listen(engine, "do_connect", _tpool_connect)
+
+
+def init_driver_mode(app, db):
+    if DRIVER_MODE == "tpool":
+        from eventlet import tpool
+
+        tpool.set_num_threads(TPOOL_SIZE)
+    with app.app_context():
+        for engine in db.engines.values():
+            prepare_engine(engine)
+
+
+# ---------------- METRIKE POOL-A ----------------
+class PoolMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_times = LatencyWindow()
+        self.hold_times = LatencyWindow()
+
+    def count(self, attribute):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def stats(self):
+        wait_times = self.wait_times.summary()
+        hold_times = self.hold_times.summary()
+        pool = self.pool
+        return {
+            "size": pool.size() if pool else None,
+            "checkedOut": pool.checkedout() if pool else None,
+            "overflow": pool.overflow() if pool else None,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "waitSecondsP50": wait_times["p50"],
+            "waitSecondsP95": wait_times["p95"],
+            "waitSecondsMax": wait_times["max"],
+            "holdSecondsP50": hold_times["p50"],
+            "holdSecondsP95": hold_times["p95"],
+            "holdSecondsMax": hold_times["max"],
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool koji meri koliko se ceka na slobodnu konekciju i broji timeout-e."""
+
+    metrics = None
+
+    def _do_get(self):
+        started_at = time.monotonic()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.count("timeouts")
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.wait_times.add(time.monotonic() - started_at)
+
+    def recreate(self):
+        # engine.dispose() pravi novi pool; metrike prelaze na njega
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics:
+            self.metrics.pool = pool
+        return pool
+
+
+pool_metrics = {}
+
+
+def watch_engine(name, engine):
+    metrics = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        metrics.count("checkouts")
+        record.info["checked_out_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, record):
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.hold_times.add(time.monotonic() - checked_out_at)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, record, exception):
+        metrics.count("invalidations")
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def init_pool_metrics(app, db):
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            watch_engine(bind or "default", engine)
+
+
+def pool_stats():
+    return {name: metrics.stats() for name, metrics in pool_metrics.items()}
@@ -182,10 +182,12 @@ class QuizAttemptDTO:
     score: int | None
     duration_seconds: int | None
     finished_at: str | None
+    rank: int | None = None
 
     def to_dict(self):
         return _omit_none(
             {
+                "rank": self.rank,
                 "playerId": self.player_id,
                 "name": self.name,
                 "score": self.score,
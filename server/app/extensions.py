@@ -2,6 +2,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_socketio import SocketIO
 
-db = SQLAlchemy()
+from app.replicas import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 socketio = SocketIO(async_mode="eventlet")
@@ -0,0 +1,46 @@
+import hashlib
+from dataclasses import dataclass, field
+
+from flask import Response, current_app, request
+
+from app.cache_store import cache_get_or_load
+
+
+@dataclass
+class CachedResponse:
+    """Vec serijalizovano JSON telo i njegov ETag, racunati jednom pri punjenju kesa."""
+    body: bytes
+    etag: str
+    meta: dict = field(default_factory=dict)
+
+
+def encode_response(data, meta=None):
+    # ista serijalizacija kao jsonify, da se telo ne razlikuje od necachiranog odgovora
+    body = f"{current_app.json.dumps(data)}\n".encode("utf-8")
+    return CachedResponse(
+        body=body,
+        etag=hashlib.sha256(body).hexdigest(),
+        meta=meta or {},
+    )
+
+
+def cached_json(key, build, tags=()):
+    """CachedResponse iz kesa; build vraca podatke za jsonify ili None (ne kesira se)."""
+    def load():
+        data = build()
+        return encode_response(data) if data is not None else None
+
+    return cache_get_or_load(key, load, tags)
+
+
+def json_response(entry, status=200):
+    """200 sa gotovim telom, ili 304 bez tela ako klijent vec ima isti ETag."""
+    if request.if_none_match.contains_weak(entry.etag):
+        response = Response(status=304)
+    else:
+        response = Response(entry.body, status=status, mimetype="application/json")
+
+    response.set_etag(entry.etag)
+    # klijent sme da cuva odgovor, ali mora da ga proveri pre upotrebe
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_
+
+from app.extensions import db, socketio
+from app.models import Job
+from app.worker_pool import scoring_pool
+
+logger = logging.getLogger(__name__)
+
+# kind -> funkcija koja prima payload kao kwargs
+JOB_HANDLERS = {}
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claim_token():
+    # token po preuzimanju, ne po procesu: isti proces moze ponovo da preuzme posao
+    # ciji je lease istekao dok ga prvi pokusaj jos izvrsava
+    return f"{WORKER_ID[:60]}:{uuid.uuid4().hex[:16]}"
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    token: str
+
+
+def job_handler(kind):
+    def register(function):
+        JOB_HANDLERS[kind] = function
+        return function
+    return register
+
+
+def enqueue_job(kind, payload, delay_seconds=0):
+    """Doda posao u tekucu transakciju; upisuje se zajedno sa izmenama pozivaoca."""
+    now = datetime.utcnow()
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        status="PENDING",
+        attempts=0,
+        run_after=now + timedelta(seconds=delay_seconds),
+        created_at=now,
+        updated_at=now,
+    )
+    db.session.add(job)
+    db.session.flush()
+    return job.id
+
+
+def dispatch_job(job_id):
+    """Pokusa odmah da izvrsi posao u lokalnom pool-u; ako je pun, posao ceka poller."""
+    return scoring_pool.submit(process_job, job_id)
+
+
+def _claimable(now):
+    return or_(
+        and_(Job.status == "PENDING", Job.run_after <= now),
+        and_(Job.status == "RUNNING", Job.locked_until < now),
+    )
+
+
+def claim_jobs(limit=1, job_id=None):
+    """Preuzme poslove uz lease; SKIP LOCKED sprecava da dva radnika uzmu isti posao."""
+    now = datetime.utcnow()
+    lease = timedelta(seconds=current_app.config["JOB_LEASE_SECONDS"])
+
+    query = Job.query
+    if job_id is not None:
+        # direktan dispatch ignorise run_after, ali ne i tudji vazeci lease
+        query = query.filter(
+            Job.id == job_id,
+            or_(
+                Job.status == "PENDING",
+                and_(Job.status == "RUNNING", Job.locked_until < now),
+            ),
+        )
+    else:
+        query = query.filter(_claimable(now)).order_by(Job.run_after.asc(), Job.id.asc())
+
+    jobs = query.limit(limit).with_for_update(skip_locked=True).all()
+
+    claimed = []
+    for job in jobs:
+        token = _claim_token()
+        job.status = "RUNNING"
+        job.attempts += 1
+        job.locked_by = token
+        job.locked_until = now + lease
+        job.updated_at = now
+        claimed.append(ClaimedJob(job.id, job.kind, json.loads(job.payload), job.attempts, token))
+    db.session.commit()
+    return claimed
+
+
+def due_job_ids(limit):
+    now = datetime.utcnow()
+    rows = (
+        db.session.query(Job.id)
+        .filter(_claimable(now))
+        .order_by(Job.run_after.asc(), Job.id.asc())
+        .limit(limit)
+        .all()
+    )
+    return [row.id for row in rows]
+
+
+def _finish_job(job, status, error=None, run_after=None):
+    values = {
+        "status": status,
+        "locked_by": None,
+        "locked_until": None,
+        "last_error": error,
+        "updated_at": datetime.utcnow(),
+    }
+    if run_after is not None:
+        values["run_after"] = run_after
+
+    # lease je mogao da istekne i da posao preuzme neko drugi (ili ovaj isti proces)
+    Job.query.filter(Job.id == job.id, Job.locked_by == job.token).update(
+        values, synchronize_session=False
+    )
+    db.session.commit()
+
+
+def _renew_lease(app, job, stop):
+    lease = app.config["JOB_LEASE_SECONDS"]
+    with app.app_context():
+        while not stop.wait(lease / 3):
+            try:
+                renewed = Job.query.filter(Job.id == job.id, Job.locked_by == job.token).update(
+                    {"locked_until": datetime.utcnow() + timedelta(seconds=lease)},
+                    synchronize_session=False,
+                )
+                db.session.commit()
+            except Exception:
+                logger.exception("could not renew lease of job %s", job.id)
+                db.session.rollback()
+                continue
+            if not renewed:
+                return  # preuzimanje je vec zavrseno ili ga je preuzeo neko drugi
+
+
+@contextmanager
+def keep_lease(job):
+    """Produzava lease dok blok traje, da dug posao (npr. izvestaj) ne preuzme drugi radnik.
+
+    Produzava se na svakih JOB_LEASE_SECONDS / 3, u svojoj niti i sesiji; pod
+    eventlet-om posao mora bar toliko cesto da ceka na I/O da bi ona dosla na red.
+    """
+    stop = threading.Event()
+    renewer = threading.Thread(
+        target=_renew_lease,
+        args=(current_app._get_current_object(), job, stop),
+        name=f"job-{job.id}-lease",
+        daemon=True,
+    )
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+
+
+def run_job(job):
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        _finish_job(job, "FAILED", error=f"Unknown job kind: {job.kind}")
+        return
+
+    try:
+        with keep_lease(job):
+            handler(**job.payload)
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception("job %s (%s) failed on attempt %s", job.id, job.kind, job.attempts)
+
+        config = current_app.config
+        if job.attempts >= config["JOB_MAX_ATTEMPTS"]:
+            _finish_job(job, "FAILED", error=repr(exc))
+            return
+
+        backoff = min(
+            config["JOB_BACKOFF_SECONDS"] * 2 ** (job.attempts - 1),
+            config["JOB_BACKOFF_MAX_SECONDS"],
+        )
+        _finish_job(
+            job,
+            "PENDING",
+            error=repr(exc),
+            run_after=datetime.utcnow() + timedelta(seconds=backoff),
+        )
+        return
+
+    _finish_job(job, "DONE")
+
+
+def process_job(job_id=None):
+    for job in claim_jobs(limit=1, job_id=job_id):
+        run_job(job)
+
+
+def _poll_jobs(app):
+    interval = app.config["JOB_POLL_INTERVAL"]
+    batch = app.config["JOB_POLL_BATCH"]
+
+    while True:
+        socketio.sleep(interval)
+
+        free = scoring_pool.free_slots()
+        if free <= 0:
+            continue
+
+        with app.app_context():
+            try:
+                job_ids = due_job_ids(min(batch, free))
+            except Exception:
+                logger.exception("job poller failed to read due jobs")
+                continue
+
+        for job_id in job_ids:
+            if not scoring_pool.submit(process_job, job_id):
+                break
+
+
+def start_job_poller(app):
+    if app.config["JOB_POLLER_ENABLED"]:
+        socketio.start_background_task(_poll_jobs, app)
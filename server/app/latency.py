@@ -0,0 +1,41 @@
+import threading
+from collections import deque
+
+# Merenja trajanja za /metrics. Bez zavisnosti od ostatka aplikacije, pa ga
+# mogu uvesti i config.py -> db_engine.py pre nego sto postoje ekstenzije.
+
+# koliko poslednjih merenja cuvamo za racunanje latencije
+LATENCY_WINDOW = 1000
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyWindow:
+    """Poslednjih N merenja u sekundama, za p50/p95 bez rasta memorije."""
+
+    def __init__(self, size=LATENCY_WINDOW):
+        self.count = 0
+        self._values = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self._values.append(seconds)
+
+    def summary(self):
+        with self._lock:
+            values = list(self._values)
+            count = self.count
+        return {
+            "count": count,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": max(values) if values else None,
+        }
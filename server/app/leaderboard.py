@@ -0,0 +1,361 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from cachetools import LRUCache
+from sortedcontainers import SortedList
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import QuizAttempt
+from app.cache_store import current_generation, invalidate_tags, leaderboard_tag
+
+# koliko kvizova i ukupno redova drzimo u memoriji; ostali se ponovo ucitaju iz baze kad zatrebaju
+MAX_BOARDS = 100
+MAX_ROWS = 500_000
+# koliko pre poslednjeg vidjenog scored_at se ponovo cita: pokriva razliku satova izmedju
+# procesa i upis ciji je commit stigao posle upisa sa kasnijim scored_at
+CATCHUP_MARGIN = 10  # sekunde
+# posle koliko sekundi se lista dopuni iz baze i bez promene generacije: sa lokalnim kes
+# backend-om generacije drugih procesa se ne vide, pa bi njihovi rezultati inace izostali
+MAX_AGE = 30  # sekunde
+
+def _rank_key(attempt_id, score, finished_at):
+    # vise bodova pa ranije zavrsen; attempt_id razresava potpuno iste rezultate
+    return (-score, finished_at or datetime.max, attempt_id)
+
+
+class QuizLeaderboard:
+    """Svi bodovani pokusaji jednog kviza, sortirani po (-score, finished_at, attempt_id)."""
+
+    def __init__(self, quiz_id, generation):
+        self.quiz_id = quiz_id
+        self.generation = generation
+        self._ranking = SortedList()
+        self._attempts = {}  # attempt_id -> (kljuc, player_id, started_at)
+        self._players = {}  # player_id -> attempt_id (jedan pokusaj po igracu)
+        self.high_water = None  # najkasniji scored_at ucitan iz baze
+        self.checked_at = time.monotonic()  # poslednje citanje iz baze
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ranking)
+
+    def add(self, attempt_id, player_id, score, started_at, finished_at):
+        """Upise ili zameni rezultat pokusaja, O(log n)."""
+        key = _rank_key(attempt_id, score, finished_at)
+        with self._lock:
+            previous = self._attempts.get(attempt_id)
+            if previous is not None:
+                self._ranking.remove(previous[0])
+            self._ranking.add(key)
+            self._attempts[attempt_id] = (key, player_id, started_at)
+            self._players[player_id] = attempt_id
+
+    def load(self, rows):
+        """Pocetno punjenje iz (attempt_id, player_id, score, started_at, finished_at); jedno sortiranje."""
+        attempts = {
+            attempt_id: (_rank_key(attempt_id, score, finished_at), player_id, started_at)
+            for attempt_id, player_id, score, started_at, finished_at in rows
+        }
+        with self._lock:
+            self._attempts = attempts
+            self._players = {entry[1]: attempt_id for attempt_id, entry in attempts.items()}
+            self._ranking = SortedList(entry[0] for entry in attempts.values())
+
+    def top(self, limit):
+        """[(attempt_id, player_id, score, started_at, finished_at)] za prvih `limit` mesta."""
+        return self.window(0, limit)
+
+    def window(self, start, stop):
+        """Redovi za mesta [start, stop) (0-bazno), O(log n + k)."""
+        with self._lock:
+            return [self._row(key) for key in self._ranking.islice(max(start, 0), max(stop, 0))]
+
+    def rank_of_player(self, player_id):
+        """0-bazno mesto igracevog pokusaja, O(log n); None ako nema bodovan pokusaj."""
+        with self._lock:
+            attempt_id = self._players.get(player_id)
+            if attempt_id is None:
+                return None
+            return self._ranking.index(self._attempts[attempt_id][0])
+
+    def around_player(self, player_id, around):
+        """(0-bazno mesto, redovi od mesta - around do mesta + around); (None, []) bez bodovanog pokusaja."""
+        index = self.rank_of_player(player_id)
+        if index is None:
+            return None, []
+        return index, self.window(index - around, index + around + 1)
+
+    def _row(self, key):
+        negative_score, finished_at, attempt_id = key
+        _, player_id, started_at = self._attempts[attempt_id]
+        return attempt_id, player_id, -negative_score, started_at, finished_at
+
+
+class SqlLeaderboard:
+    """Lista veca od max_rows: isti interfejs kao QuizLeaderboard, ali svaki poziv je upit.
+
+    Mesto je COUNT boljih rezultata, stranica po mestu ORDER BY ... LIMIT/OFFSET,
+    a okolina igraca se cita od njegovog reda na dole i na gore (bez OFFSET-a).
+    Sve ide preko ix_attempts_quiz_score (quiz_id, score DESC, finished_at, ...).
+    Bodovan pokusaj uvek ima finished_at, pa se NULL (datetime.max u _rank_key) ne obradjuje.
+    """
+
+    def __init__(self, quiz_id):
+        self.quiz_id = quiz_id
+
+    def _scored(self):
+        return (QuizAttempt.quiz_id == self.quiz_id, QuizAttempt.score.isnot(None))
+
+    def _count(self, *conditions):
+        return select(func.count()).select_from(QuizAttempt).where(*self._scored(), *conditions)
+
+    def _page(self, conditions, order, offset, limit):
+        statement = (
+            select(
+                QuizAttempt.id,
+                QuizAttempt.player_id,
+                QuizAttempt.score,
+                QuizAttempt.started_at,
+                QuizAttempt.finished_at,
+            )
+            .where(*self._scored(), *conditions)
+            .order_by(*order)
+            .offset(offset)
+            .limit(limit)
+        )
+        return [tuple(row) for row in db.session.execute(statement)]
+
+    def _attempt(self, player_id):
+        return db.session.execute(
+            select(QuizAttempt.id, QuizAttempt.score, QuizAttempt.finished_at)
+            .where(*self._scored(), QuizAttempt.player_id == player_id)
+        ).first()
+
+    def _seek(self, attempt, limit, forward):
+        """Do `limit` redova od pokusaja na dole (sa njim) ili iznad njega, najblizi prvi."""
+        attempt_id, score, finished_at = attempt
+        score_column, finished_column, id_column = QuizAttempt.score, QuizAttempt.finished_at, QuizAttempt.id
+        # tri opsega indeksa jedan za drugim, umesto jednog OR-a koji baza ne bi citala kao opseg
+        if forward:
+            ranges = [
+                ((score_column == score, finished_column == finished_at, id_column >= attempt_id), (id_column,)),
+                ((score_column == score, finished_column > finished_at), (finished_column, id_column)),
+                ((score_column < score,), (score_column.desc(), finished_column, id_column)),
+            ]
+        else:
+            ranges = [
+                ((score_column == score, finished_column == finished_at, id_column < attempt_id), (id_column.desc(),)),
+                ((score_column == score, finished_column < finished_at), (finished_column.desc(), id_column.desc())),
+                ((score_column > score,), (score_column, finished_column.desc(), id_column.desc())),
+            ]
+        rows = []
+        for conditions, order in ranges:
+            if len(rows) >= limit:
+                break
+            rows += self._page(conditions, order, 0, limit - len(rows))
+        return rows
+
+    def _rank(self, attempt):
+        attempt_id, score, finished_at = attempt
+        better = (
+            self._count(QuizAttempt.score > score).scalar_subquery()
+            + self._count(QuizAttempt.score == score, QuizAttempt.finished_at < finished_at).scalar_subquery()
+            + self._count(
+                QuizAttempt.score == score,
+                QuizAttempt.finished_at == finished_at,
+                QuizAttempt.id < attempt_id,
+            ).scalar_subquery()
+        )
+        return db.session.execute(select(better)).scalar()
+
+    def __len__(self):
+        return db.session.execute(self._count()).scalar()
+
+    def top(self, limit):
+        return self.window(0, limit)
+
+    def window(self, start, stop):
+        start = max(start, 0)
+        if stop <= start:
+            return []
+        order = (QuizAttempt.score.desc(), QuizAttempt.finished_at, QuizAttempt.id)
+        return self._page((), order, start, stop - start)
+
+    def rank_of_player(self, player_id):
+        attempt = self._attempt(player_id)
+        return None if attempt is None else self._rank(attempt)
+
+    def around_player(self, player_id, around):
+        attempt = self._attempt(player_id)
+        if attempt is None:
+            return None, []
+        above = self._seek(attempt, around, forward=False)
+        below = self._seek(attempt, around + 1, forward=True)
+        return self._rank(attempt), above[::-1] + below
+
+
+class LeaderboardStore:
+    """Rang liste po kvizu u memoriji procesa.
+
+    Rezultati se upisuju direktno (write-through) iz publish_result; hladna
+    lista se ucitava iz baze jednim upitom pri prvom citanju. Generacija
+    taga quiz:{id}:leaderboard iz kes backend-a pokazuje da je neki drugi
+    proces (ili ponovno bodovanje) promenio rezultate; tada se ucitaju samo
+    pokusaji sa scored_at od poslednjeg vidjenog (minus CATCHUP_MARGIN), ne
+    cela lista. Isto se radi i kad je lista starija od max_age, jer generacija
+    ne stize do procesa koji ne dele kes backend. Ukupan broj redova u svim
+    listama je ogranicen (LRU po redovima); kviz sa vise bodovanih pokusaja od
+    max_rows se ne ucitava, nego dobija SqlLeaderboard.
+    """
+
+    def __init__(self, max_boards=MAX_BOARDS, max_rows=MAX_ROWS, catchup_margin=CATCHUP_MARGIN, max_age=MAX_AGE):
+        self._lock = threading.Lock()
+        self._load_locks = defaultdict(threading.Lock)
+        self._large = set()  # kvizovi preveliki za memoriju
+        self.configure(max_boards, max_rows, catchup_margin, max_age)
+
+    def init_app(self, app):
+        self.configure(
+            app.config["LEADERBOARD_MAX_BOARDS"],
+            app.config["LEADERBOARD_MAX_ROWS"],
+            app.config["LEADERBOARD_CATCHUP_MARGIN"],
+            app.config["LEADERBOARD_MAX_AGE"],
+        )
+
+    def configure(self, max_boards, max_rows, catchup_margin, max_age=MAX_AGE):
+        with self._lock:
+            self.max_boards = max_boards
+            self.catchup_margin = timedelta(seconds=catchup_margin)
+            self.max_age = max_age
+            self._large = set()
+            # velicina liste je broj redova (prazna se racuna kao 1)
+            self._boards = LRUCache(maxsize=max_rows, getsizeof=lambda board: max(len(board), 1))
+
+    def _cached(self, quiz_id):
+        with self._lock:
+            return self._boards.get(quiz_id)
+
+    def _keep(self, board):
+        """(Ponovo) upise listu u LRU da joj se preracuna velicina; prevelika lista se ne cuva."""
+        with self._lock:
+            try:
+                self._boards[board.quiz_id] = board
+            except ValueError:
+                self._boards.pop(board.quiz_id, None)  # sama je veca od max_rows
+                self._large.add(board.quiz_id)
+                return
+            while len(self._boards) > self.max_boards:
+                self._boards.popitem()
+
+    def _fresh(self, board, generation):
+        return board.generation == generation and time.monotonic() - board.checked_at < self.max_age
+
+    def _is_large(self, quiz_id):
+        with self._lock:
+            return quiz_id in self._large
+
+    def get(self, quiz_id):
+        if self._is_large(quiz_id):
+            return SqlLeaderboard(quiz_id)
+
+        tag = leaderboard_tag(quiz_id)
+        board = self._cached(quiz_id)
+        if board is not None and self._fresh(board, current_generation(tag)):
+            return board
+
+        with self._lock:
+            load_lock = self._load_locks[quiz_id]
+        with load_lock:
+            # generacija pre citanja iz baze: upis tokom ucitavanja cini listu zastarelom
+            generation = current_generation(tag)
+            board = self._cached(quiz_id)
+            if board is None:
+                if self._too_large(quiz_id):
+                    with self._lock:
+                        self._large.add(quiz_id)
+                    return SqlLeaderboard(quiz_id)
+                board = self._hydrate(quiz_id, generation)
+            elif not self._fresh(board, generation):
+                self._catch_up(board, generation)
+            else:
+                return board
+            self._keep(board)
+        return board
+
+    def _select(self, quiz_id):
+        return (
+            select(
+                QuizAttempt.id,
+                QuizAttempt.player_id,
+                QuizAttempt.score,
+                QuizAttempt.started_at,
+                QuizAttempt.finished_at,
+                QuizAttempt.scored_at,
+            )
+            .where(QuizAttempt.quiz_id == quiz_id)
+            .where(QuizAttempt.score.isnot(None))
+        )
+
+    def _rows(self, statement):
+        # posebna konekcija: svez snapshot, ne onaj koji je tekuca sesija mozda vec otvorila
+        # pre nego sto je procitana generacija
+        with db.engines[QuizAttempt.__bind_key__].connect() as connection:
+            return [tuple(row) for row in connection.execute(statement)]
+
+    def _too_large(self, quiz_id):
+        # COUNT preko indeksa pre ucitavanja: lista koja ne bi stala se ni ne cita
+        statement = SqlLeaderboard(quiz_id)._count()
+        return self._rows(statement)[0][0] > self._boards.maxsize
+
+    def _hydrate(self, quiz_id, generation):
+        board = QuizLeaderboard(quiz_id, generation)
+        rows = self._rows(self._select(quiz_id))
+        board.load(row[:5] for row in rows)
+        board.high_water = max((row[5] for row in rows if row[5] is not None), default=None)
+        return board
+
+    def _catch_up(self, board, generation):
+        """Doda/zameni pokusaje bodovane od poslednjeg ucitavanja; ponovno citanje istog reda je bezopasno."""
+        statement = self._select(board.quiz_id)
+        if board.high_water is not None:
+            statement = statement.where(QuizAttempt.scored_at >= board.high_water - self.catchup_margin)
+
+        checked_at = time.monotonic()
+        rows = self._rows(statement)
+        for attempt_id, player_id, score, started_at, finished_at, scored_at in rows:
+            board.add(attempt_id, player_id, score, started_at, finished_at)
+            if scored_at is not None and (board.high_water is None or scored_at > board.high_water):
+                board.high_water = scored_at
+        board.generation = generation
+        board.checked_at = checked_at
+
+    def record(self, quiz_id, attempt_id, player_id, score, started_at, finished_at):
+        """Upis posle commit-a: azurira ucitanu listu i javlja ostalim procesima/kesu."""
+        tag = leaderboard_tag(quiz_id)
+        before = current_generation(tag)
+        invalidate_tags(tag)
+
+        board = self._cached(quiz_id)
+        if board is None:
+            return
+
+        board.add(attempt_id, player_id, score, started_at, finished_at)
+        if board.generation == before:
+            # ako je u medjuvremenu jos neko povecao generaciju, sledece citanje ucita razliku
+            board.generation = before + 1
+        self._keep(board)
+
+    def drop(self, quiz_id):
+        with self._lock:
+            self._boards.pop(quiz_id, None)
+            self._large.discard(quiz_id)
+
+    def stats(self):
+        with self._lock:
+            return {"boards": len(self._boards), "rows": self._boards.currsize, "maxRows": self._boards.maxsize}
+
+
+leaderboards = LeaderboardStore()
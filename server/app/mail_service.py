@@ -201,12 +201,12 @@ def build_quiz_report_pdf_bytes(
     return buffer.getvalue()
 
 
-def send_quiz_report_email_async(
+def send_quiz_report_email(
     to_email: str,
     quiz_id: int,
     quiz_title: str,
     attempt_rows: list[dict[str, Any]],
-) -> Thread:
+) -> None:
     pdf_bytes = build_quiz_report_pdf_bytes(quiz_id, quiz_title, attempt_rows)
 
     subject = f"Quiz report #{quiz_id} - {quiz_title}"
@@ -224,4 +224,13 @@ def send_quiz_report_email_async(
         }
     ]
 
-    return send_email_with_attachments_async(to_email, subject, body, attachments)
+    send_email_with_attachments(to_email, subject, body, attachments)
+
+
+def send_quiz_report_email_async(
+    to_email: str,
+    quiz_id: int,
+    quiz_title: str,
+    attempt_rows: list[dict[str, Any]],
+) -> Thread:
+    return run_async(send_quiz_report_email, to_email, quiz_id, quiz_title, attempt_rows)
@@ -11,14 +11,23 @@ from app.auth_routes import auth_bp
 from app.quiz_routes import quiz_bp
 from app.user_routes import user_bp
 from app.upload import upload_bp
+from app.metrics_routes import metrics_bp
 from app.socket_handlers import register_socket_handlers
+from app.cache_store import init_cache, start_cache_stats_logger
+from app.db_engine import init_driver_mode, init_pool_metrics
+from app.replicas import init_replicas, start_replica_health_check
+from app.worker_pool import scoring_pool
+from app.leaderboard import leaderboards
+from app.jobs import start_job_poller
+from app.attempt_expiry import start_expiry_sweeper
 
 import app.jwt_list  # registruje jwt callbacks
+import app.quiz_processing  # registruje job handlere
 
 
 app = Flask(__name__)
 app.config.from_object(Config)
-CORS(app, origins="*")
+CORS(app, origins="*", expose_headers=["X-Next-Cursor", "ETag"])
 
 # uploads folder VAN app/
 UPLOAD_FOLDER = os.path.join(app.root_path, "..", "uploads")
@@ -30,15 +39,26 @@ def serve_upload(filename):
 
 # init ekstenzija
 db.init_app(app)
+init_driver_mode(app, db)
+init_pool_metrics(app, db)
+init_replicas(app, db)
 jwt.init_app(app)
-socketio.init_app(app, cors_allowed_origins="*")
+socketio.init_app(app, cors_allowed_origins="*", message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"])
 register_socket_handlers(socketio)
+init_cache(app)
+start_cache_stats_logger(app)
+scoring_pool.init_app(app)
+leaderboards.init_app(app)
+start_job_poller(app)
+start_expiry_sweeper(app)
+start_replica_health_check(app)
 
 # blueprints
 app.register_blueprint(auth_bp)
 app.register_blueprint(quiz_bp)
 app.register_blueprint(user_bp)
 app.register_blueprint(upload_bp)
+app.register_blueprint(metrics_bp)
 
 if __name__ == "__main__":
     with app.app_context():
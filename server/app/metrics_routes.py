@@ -0,0 +1,57 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+
+from app.worker_pool import scoring_pool
+from app.quiz_processing import result_latency
+from app.cache_store import cache_stats
+from app.db_engine import pool_stats
+from app.replicas import replica_router
+from app.leaderboard import leaderboards
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/api/admin/metrics")
+
+
+def require_admin():
+    return (get_jwt() or {}).get("role") == "ADMIN"
+
+# ---------------- POOL ZA BODOVANJE ----------------
+@metrics_bp.route("/scoring", methods=["GET"])
+@jwt_required()
+def scoring_metrics():
+    if not require_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    stats = scoring_pool.stats()
+    stats["submitToResultSeconds"] = {
+        mode: window.summary() for mode, window in result_latency.items()
+    }
+    return jsonify(stats), 200
+
+# ---------------- KES ----------------
+@metrics_bp.route("/cache", methods=["GET"])
+@jwt_required()
+def cache_metrics_view():
+    if not require_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    stats = cache_stats()
+    stats["leaderboards"] = leaderboards.stats()
+    return jsonify(stats), 200
+
+# ---------------- POOL KONEKCIJA ----------------
+@metrics_bp.route("/db", methods=["GET"])
+@jwt_required()
+def db_metrics():
+    if not require_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    return jsonify(pool_stats()), 200
+
+# ---------------- REPLIKE ----------------
+@metrics_bp.route("/replicas", methods=["GET"])
+@jwt_required()
+def replica_metrics():
+    if not require_admin():
+        return jsonify({"message": "Forbidden"}), 403
+
+    return jsonify(replica_router.stats()), 200
@@ -0,0 +1,40 @@
+# Primena migracija seme po bind-u: python -m app.migrate [--explain]
+import sys
+
+from flask import Flask
+
+from app.config import Config
+from app.extensions import db
+from app.migrations import migrate_bind, explain_full_scans
+
+
+def create_app():
+    # bez app.main: migracije ne treba da pokrecu socket server, pool radnika i poller-e
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    return app
+
+
+def main(argv):
+    app = create_app()
+    with app.app_context():
+        engines = {bind: db.engines[bind] for bind in app.config["SQLALCHEMY_BINDS"]}
+
+        if "--explain" in argv:
+            failures = explain_full_scans(engines)
+            for bind, name, table in failures:
+                print(f"❌ {bind}: '{name}' radi pun prolaz kroz tabelu {table}")
+            if failures:
+                return 1
+            print("✅ Nijedan vruc upit ne radi pun prolaz kroz tabelu.")
+            return 0
+
+        for bind, engine in engines.items():
+            applied = migrate_bind(engine, bind)
+            print(f"✅ {bind}: primenjeno migracija: {applied}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,311 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import text
+
+# Verzionisane izmene seme, po bind-u (user_data, quiz_data). Svaki bind ima
+# svoju tabelu schema_migrations sa primenjenim verzijama. Izmene moraju biti
+# idempotentne: baza napravljena iz database/*.sql vec ima sve iz ovog fajla,
+# pa se takve migracije samo zabeleze kao primenjene.
+
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT = 60  # sekunde
+
+
+@dataclass
+class AddIndex:
+    """ALTER TABLE ... ADD INDEX bez zakljucavanja tabele (InnoDB online DDL)."""
+    table: str
+    name: str
+    columns: str
+    unique: bool = False
+
+    def exists(self, connection):
+        return connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.statistics"
+                " WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :name"
+                " LIMIT 1"
+            ),
+            {"table": self.table, "name": self.name},
+        ).first() is not None
+
+    def apply(self, connection):
+        if self.exists(connection):
+            return False
+        kind = "UNIQUE INDEX" if self.unique else "INDEX"
+        connection.execute(text(
+            f"ALTER TABLE {self.table} ADD {kind} {self.name} ({self.columns}),"
+            " ALGORITHM=INPLACE, LOCK=NONE"
+        ))
+        return True
+
+    def __str__(self):
+        kind = "unique index" if self.unique else "index"
+        return f"{kind} {self.table}.{self.name} ({self.columns})"
+
+
+@dataclass
+class AddColumn:
+    """ALTER TABLE ... ADD COLUMN kao INSTANT izmena (samo metapodaci, bez kopiranja tabele)."""
+    table: str
+    name: str
+    definition: str
+
+    def exists(self, connection):
+        return connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns"
+                " WHERE table_schema = DATABASE() AND table_name = :table AND column_name = :name"
+                " LIMIT 1"
+            ),
+            {"table": self.table, "name": self.name},
+        ).first() is not None
+
+    def apply(self, connection):
+        if self.exists(connection):
+            return False
+        connection.execute(text(
+            f"ALTER TABLE {self.table} ADD COLUMN {self.name} {self.definition}, ALGORITHM=INSTANT"
+        ))
+        return True
+
+    def __str__(self):
+        return f"column {self.table}.{self.name} {self.definition}"
+
+
+@dataclass
+class CreateTable:
+    """Nova tabela; definicija je ista kao u database/*.sql."""
+    name: str
+    definition: str
+
+    def exists(self, connection):
+        return connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.tables"
+                " WHERE table_schema = DATABASE() AND table_name = :name"
+                " LIMIT 1"
+            ),
+            {"name": self.name},
+        ).first() is not None
+
+    def apply(self, connection):
+        if self.exists(connection):
+            return False
+        connection.execute(text(f"CREATE TABLE {self.name} ({self.definition})"))
+        return True
+
+    def __str__(self):
+        return f"table {self.name}"
+
+
+@dataclass
+class UpdateRows:
+    """Izmena podataka (popuna nove kolone, ciscenje pre UNIQUE indeksa); ponovljena ne menja nista."""
+    description: str
+    sql: str
+
+    def apply(self, connection):
+        return connection.execute(text(self.sql)).rowcount > 0
+
+    def __str__(self):
+        return self.description
+
+
+@dataclass
+class Migration:
+    version: int
+    bind: str
+    description: str
+    operations: list = field(default_factory=list)
+
+
+MIGRATIONS = [
+    Migration(1, "quiz_data", "indexes for quiz lists", [
+        AddIndex("quizzes", "ix_quizzes_status_id", "status, id"),
+        AddIndex("quizzes", "ix_quizzes_author_id", "author_id, id"),
+    ]),
+    Migration(2, "quiz_data", "covering index for leaderboard hydration", [
+        # sekundarni indeks u InnoDB sadrzi i PK (id), pa upit rang liste ne cita tabelu
+        AddIndex(
+            "quiz_attempts",
+            "ix_attempts_quiz_score",
+            "quiz_id, score DESC, finished_at, started_at, player_id",
+        ),
+    ]),
+    Migration(3, "quiz_data", "foreign key lookups for questions and answers", [
+        AddIndex("questions", "ix_questions_quiz_id", "quiz_id"),
+        AddIndex("answer_options", "ix_answer_options_question_id", "question_id"),
+    ]),
+    Migration(4, "quiz_data", "tables for jobs, stored answers and quiz snapshots", [
+        CreateTable(
+            "jobs",
+            "id INT AUTO_INCREMENT PRIMARY KEY,"
+            " kind VARCHAR(50) NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status VARCHAR(20) NOT NULL,"
+            " attempts INT NOT NULL DEFAULT 0,"
+            " run_after DATETIME NOT NULL,"
+            " locked_by VARCHAR(100),"
+            " locked_until DATETIME,"
+            " last_error TEXT,"
+            " created_at DATETIME NOT NULL,"
+            " updated_at DATETIME NOT NULL,"
+            " INDEX ix_jobs_status_run_after (status, run_after)",
+        ),
+        # tabela je mogla nastati iz db.create_all() ili rucno, bez indeksa
+        AddIndex("jobs", "ix_jobs_status_run_after", "status, run_after"),
+        CreateTable(
+            "attempt_answers",
+            "attempt_id INT PRIMARY KEY,"
+            " quiz_id INT NOT NULL,"
+            " answers BLOB NOT NULL,"
+            " INDEX ix_attempt_answers_quiz_id (quiz_id)",
+        ),
+        AddIndex("attempt_answers", "ix_attempt_answers_quiz_id", "quiz_id"),
+        CreateTable(
+            "quiz_snapshots",
+            "quiz_id INT NOT NULL,"
+            " version INT NOT NULL,"
+            " answer_key MEDIUMTEXT NOT NULL,"
+            " created_at DATETIME NOT NULL,"
+            " PRIMARY KEY (quiz_id, version)",
+        ),
+    ]),
+    Migration(5, "quiz_data", "quiz versions", [
+        AddColumn("quizzes", "version", "INT NOT NULL DEFAULT 1"),
+        # NULL: pokusaj je poceo pre verzionisanja i boduje se po trenutnoj verziji
+        AddColumn("quiz_attempts", "quiz_version", "INT"),
+    ]),
+    Migration(6, "quiz_data", "index for the expiry sweep", [
+        AddIndex("quiz_attempts", "ix_attempts_finished_started", "finished_at, started_at"),
+    ]),
+    Migration(7, "quiz_data", "attempt state and one attempt per player", [
+        AddColumn("quiz_attempts", "state", "VARCHAR(16) NOT NULL DEFAULT 'STARTED'"),
+        # stari pokusaji: bez popune bi svi bili STARTED, pa bi /submit i /result/me
+        # preko bodovanih rezultata upisali 0
+        UpdateRows(
+            "state from finished_at/score",
+            "UPDATE quiz_attempts"
+            " SET state = CASE WHEN score IS NOT NULL THEN 'SCORED' ELSE 'SUBMITTED' END"
+            " WHERE state = 'STARTED' AND (score IS NOT NULL OR finished_at IS NOT NULL)",
+        ),
+        # duplikati iz trka pre jedinstvenog kljuca: ostaje bodovan pokusaj, pa najstariji
+        UpdateRows(
+            "drop duplicate attempts per (quiz_id, player_id)",
+            "DELETE a FROM quiz_attempts a JOIN quiz_attempts b"
+            " ON b.quiz_id = a.quiz_id AND b.player_id = a.player_id AND ("
+            "  (b.score IS NOT NULL AND a.score IS NULL)"
+            "  OR ((b.score IS NULL) = (a.score IS NULL) AND b.id < a.id))",
+        ),
+        # start_quiz_attempt se oslanja na ovaj kljuc (insert-or-fetch)
+        AddIndex("quiz_attempts", "uq_attempt_quiz_player", "quiz_id, player_id", unique=True),
+    ]),
+    Migration(8, "quiz_data", "score timestamps for incremental leaderboard loads", [
+        AddColumn("quiz_attempts", "scored_at", "DATETIME"),
+        UpdateRows(
+            "scored_at for scored attempts",
+            "UPDATE quiz_attempts SET scored_at = COALESCE(finished_at, started_at)"
+            " WHERE score IS NOT NULL AND scored_at IS NULL",
+        ),
+        AddIndex("quiz_attempts", "ix_attempts_quiz_scored_at", "quiz_id, scored_at"),
+    ]),
+]
+
+
+# ---------------- RUNNER ----------------
+def _ensure_table(connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INT PRIMARY KEY,"
+        " description VARCHAR(255) NOT NULL,"
+        " applied_at DATETIME NOT NULL)"
+    ))
+
+
+def applied_versions(connection):
+    _ensure_table(connection)
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def pending_migrations(bind, applied):
+    return sorted(
+        (m for m in MIGRATIONS if m.bind == bind and m.version not in applied),
+        key=lambda m: m.version,
+    )
+
+
+def migrate_bind(engine, bind, log=print):
+    """Primeni migracije jednog bind-a koje jos nisu zabelezene. Vraca broj primenjenih."""
+    with engine.connect() as connection:
+        # samo jedan runner po bazi u isto vreme
+        locked = connection.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT},
+        ).scalar()
+        if locked != 1:
+            raise RuntimeError(f"{bind}: could not acquire migration lock")
+
+        try:
+            migrations = pending_migrations(bind, applied_versions(connection))
+            for migration in migrations:
+                log(f"{bind}: {migration.version} {migration.description}")
+                for operation in migration.operations:
+                    changed = operation.apply(connection)
+                    log(f"    {operation}: {'applied' if changed else 'already present'}")
+
+                # DDL u MySQL-u radi implicitni commit, pa se verzija belezi tek posle svih izmena
+                connection.execute(
+                    text(
+                        "INSERT INTO schema_migrations (version, description, applied_at)"
+                        " VALUES (:version, :description, :applied_at)"
+                    ),
+                    {
+                        "version": migration.version,
+                        "description": migration.description,
+                        "applied_at": datetime.utcnow(),
+                    },
+                )
+                connection.commit()
+            return len(migrations)
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+# ---------------- EXPLAIN PROVERA ----------------
+# upiti sa vrucih putanja; nijedan ne sme da padne na pun prolaz kroz tabelu (type=ALL)
+HOT_QUERIES = [
+    ("quiz_data", "approved quizzes",
+     "SELECT id FROM quizzes WHERE status = 'APPROVED' ORDER BY id"),
+    ("quiz_data", "my quizzes",
+     "SELECT id FROM quizzes WHERE author_id = 1 ORDER BY id"),
+    ("quiz_data", "leaderboard hydration",
+     "SELECT id, player_id, score, started_at, finished_at FROM quiz_attempts"
+     " WHERE quiz_id = 1 AND score IS NOT NULL ORDER BY score DESC, finished_at"),
+    ("quiz_data", "leaderboard catch-up",
+     "SELECT id, player_id, score, started_at, finished_at, scored_at FROM quiz_attempts"
+     " WHERE quiz_id = 1 AND scored_at >= NOW() - INTERVAL 10 SECOND"),
+    ("quiz_data", "quiz questions",
+     "SELECT id FROM questions WHERE quiz_id = 1 ORDER BY id"),
+    ("quiz_data", "question answers",
+     "SELECT id FROM answer_options WHERE question_id IN (1, 2, 3)"),
+    ("quiz_data", "due jobs",
+     "SELECT id FROM jobs WHERE status = 'PENDING' AND run_after <= NOW() ORDER BY run_after"),
+    ("quiz_data", "unfinished attempts",
+     "SELECT id FROM quiz_attempts WHERE finished_at IS NULL ORDER BY started_at"),
+    ("user_data", "user by email",
+     "SELECT id FROM users WHERE email = 'player@example.com'"),
+]
+
+
+def explain_full_scans(engines):
+    """[(bind, ime, tabela)] za svaki vruc upit ciji plan sadrzi type=ALL."""
+    failures = []
+    for bind, name, sql in HOT_QUERIES:
+        with engines[bind].connect() as connection:
+            result = connection.execute(text(f"EXPLAIN {sql}"))
+            for row in result.mappings():
+                if row["type"] == "ALL":
+                    failures.append((bind, name, row["table"]))
+    return failures
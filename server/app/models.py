@@ -54,6 +54,9 @@ class Quiz(db.Model):
     author_id = db.Column(db.Integer, nullable=False)  # Removed ForeignKey jer User je u drugoj bazi
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # raste pri svakoj izmeni pitanja; pokusaji se boduju po verziji sa kojom su poceli
+    version = db.Column(db.Integer, nullable=False, default=1)
+
     questions = db.relationship(
         "Question",
         backref="quiz",
@@ -61,6 +64,12 @@ class Quiz(db.Model):
         lazy=True
     )
 
+    # indeksi se na postojecim bazama dodaju kroz app/migrations.py
+    __table_args__ = (
+        db.Index("ix_quizzes_status_id", "status", "id"),
+        db.Index("ix_quizzes_author_id", "author_id", "id"),
+    )
+
 
 class Question(db.Model):
     __tablename__ = "questions"
@@ -79,6 +88,10 @@ class Question(db.Model):
         lazy=True
     )
 
+    __table_args__ = (
+        db.Index("ix_questions_quiz_id", "quiz_id"),
+    )
+
 
 class AnswerOption(db.Model):
     __tablename__ = "answer_options"
@@ -90,6 +103,22 @@ class AnswerOption(db.Model):
     text = db.Column(db.Text, nullable=False)
     is_correct = db.Column(db.Boolean, nullable=False, default=False)
 
+    __table_args__ = (
+        db.Index("ix_answer_options_question_id", "question_id"),
+    )
+
+
+class QuizSnapshot(db.Model):
+    __tablename__ = "quiz_snapshots"
+    __bind_key__ = 'quiz_data'  # Vezuje model za QUIZZES_DATA bazu
+
+    quiz_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, primary_key=True)
+
+    # JSON [question_id, points, answer_id, is_correct] redovi, vidi app/answer_key.py
+    answer_key = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
 
 class QuizAttempt(db.Model):
     __tablename__ = "quiz_attempts"
@@ -99,22 +128,77 @@ class QuizAttempt(db.Model):
 
     quiz_id = db.Column(db.Integer, db.ForeignKey("quizzes.id"), nullable=False)
     player_id = db.Column(db.Integer, nullable=False)  # Removed ForeignKey jer User je u drugoj bazi
+    quiz_version = db.Column(db.Integer, nullable=True)  # NULL za pokusaje pre verzionisanja
 
     started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     finished_at = db.Column(db.DateTime, nullable=True)
 
     score = db.Column(db.Integer, nullable=True)
 
+    # STARTED -> SUBMITTED -> SCORED (istekli pokusaji idu direktno STARTED -> SCORED)
+    state = db.Column(db.String(16), nullable=False, default="STARTED")
+    # kada je score poslednji put upisan; rang liste po njemu ucitavaju samo nove rezultate
+    scored_at = db.Column(db.DateTime, nullable=True)
+
     # Note: UniqueConstraint mora ostati, ali bez ForeignKey na player_id
     __table_args__ = (
         db.UniqueConstraint("quiz_id", "player_id", name="uq_attempt_quiz_player"),
+        db.Index("ix_attempts_finished_started", "finished_at", "started_at"),
+        db.Index("ix_attempts_quiz_scored_at", "quiz_id", "scored_at"),
     )
 
 
+# pokriva ucitavanje rang liste: WHERE quiz_id = ? AND score IS NOT NULL ORDER BY score DESC, finished_at
+db.Index(
+    "ix_attempts_quiz_score",
+    QuizAttempt.quiz_id,
+    QuizAttempt.score.desc(),
+    QuizAttempt.finished_at,
+    QuizAttempt.started_at,
+    QuizAttempt.player_id,
+)
+
+
+class AttemptAnswers(db.Model):
+    __tablename__ = "attempt_answers"
+    __bind_key__ = 'quiz_data'  # Vezuje model za QUIZZES_DATA bazu
+
+    attempt_id = db.Column(db.Integer, db.ForeignKey("quiz_attempts.id"), primary_key=True)
+    quiz_id = db.Column(db.Integer, nullable=False, index=True)
+
+    # spakovani (question_id, mask) zapisi, vidi app/answer_store.py
+    answers = db.Column(db.LargeBinary, nullable=False)
+
+
 class TokenBlocklist(db.Model):
     __tablename__ = "token_blocklist"
     __bind_key__ = 'quiz_data'  # Vezuje model za QUIZZES_DATA bazu
 
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+    __bind_key__ = 'quiz_data'  # Vezuje model za QUIZZES_DATA bazu
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON argumenti za handler
+
+    # PENDING -> RUNNING -> DONE, ili FAILED posle max pokusaja
+    status = db.Column(db.String(20), nullable=False, default="PENDING")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
@@ -0,0 +1,90 @@
+import base64
+import json
+import re
+from dataclasses import dataclass
+
+from flask import current_app, request, jsonify
+
+from app.cache_store import cache_get_or_load
+from app.http_cache import encode_response, json_response
+
+# sledeca stranica ide u header da telo ostane niz kao i pre paginacije
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class CursorError(ValueError):
+    """Neispravan limit ili cursor; poruka ide direktno u 400 odgovor."""
+
+
+@dataclass(frozen=True)
+class Page:
+    limit: int
+    after_id: int = 0
+
+
+def encode_cursor(last_id):
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("cursor is invalid")
+    if not isinstance(after_id, int) or after_id < 0:
+        raise CursorError("cursor is invalid")
+    return after_id
+
+
+def page_params():
+    """?limit=&cursor= iz zahteva; bez limit-a vazi PAGE_SIZE_DEFAULT."""
+    raw_limit = request.args.get("limit")
+    if raw_limit is None:
+        limit = current_app.config["PAGE_SIZE_DEFAULT"]
+    else:
+        # type=int bi ?limit=abc tiho pretvorio u podrazumevani limit; isdigit() pusta i "²"
+        if not re.fullmatch(r"[0-9]+", raw_limit) or int(raw_limit) <= 0:
+            raise CursorError("limit must be a positive integer")
+        limit = min(int(raw_limit), current_app.config["PAGE_SIZE_MAX"])
+
+    cursor = request.args.get("cursor")
+    return Page(limit=limit, after_id=decode_cursor(cursor) if cursor else 0)
+
+
+def paginate(query, id_column, page):
+    """Keyset stranica: WHERE id > poslednji ORDER BY id LIMIT n+1. Vraca (redovi, next_cursor)."""
+    rows = (
+        query.filter(id_column > page.after_id)
+        .order_by(id_column.asc())
+        .limit(page.limit + 1)
+        .all()
+    )
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    return rows, encode_cursor(rows[-1].id)
+
+
+def page_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+
+def cached_page(key, build, tags=()):
+    """Kao cached_json, ali build vraca (items, next_cursor); cursor se cuva u meta unosa."""
+    def load():
+        items, next_cursor = build()
+        return encode_response(items, meta={"nextCursor": next_cursor})
+
+    return cache_get_or_load(key, load, tags)
+
+
+def cached_page_response(entry):
+    response = json_response(entry)
+    if entry.meta.get("nextCursor"):
+        response.headers[NEXT_CURSOR_HEADER] = entry.meta["nextCursor"]
+    return response
@@ -0,0 +1,23 @@
+from sqlalchemy.orm import raiseload, selectinload
+
+from app.models import Quiz, Question
+
+# Opcije ucitavanja za upite nad kvizovima. Relacije u modelima su lazy=True,
+# pa svaki upit bira koliko grafa mu treba umesto da ga vuce lenjo red po red.
+
+# kviz -> pitanja -> odgovori: ukupno 3 upita (kviz, sva pitanja, svi odgovori) bez obzira na broj pitanja
+FULL_QUIZ = (
+    selectinload(Quiz.questions).selectinload(Question.answers),
+)
+
+# liste kvizova: samo kolone kviza; pristup pitanjima baca gresku umesto tihog N+1
+QUIZ_LIST = (
+    raiseload(Quiz.questions),
+)
+
+
+def get_full_quiz(quiz_id):
+    """Kviz sa svim pitanjima i odgovorima, ili None."""
+    # filter_by().first() umesto get(): uvek izvrsi upit pa se opcije primene
+    # i na kviz koji je vec u identity map-u sesije
+    return Quiz.query.options(*FULL_QUIZ).filter_by(id=quiz_id).first()
@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Question, AnswerOption
+
+
+# izabrani odgovori se cuvaju kao bitmaska: uint64 u attempt_answers, int64 u batch_scoring
+MAX_ANSWERS = 63
+
+
+class PayloadError(ValueError):
+    """Neispravan JSON kviza; poruka ide direktno u 400 odgovor."""
+
+
+@dataclass
+class AnswerPayload:
+    text: str
+    is_correct: bool
+
+
+@dataclass
+class QuestionPayload:
+    text: str
+    points: int
+    answers: list[AnswerPayload] = field(default_factory=list)
+
+
+@dataclass
+class QuizPayload:
+    title: str
+    duration_seconds: int
+    questions: list[QuestionPayload] = field(default_factory=list)
+
+
+# ---------------- VALIDACIJA ----------------
+def _parse_answer(a):
+    if not isinstance(a, dict):
+        raise PayloadError("Each answer must be an object")
+
+    a_text = (a.get("text") or "").strip()
+    if not a_text:
+        raise PayloadError("Each answer must have text")
+
+    is_correct = a.get("isCorrect")
+    if not isinstance(is_correct, bool):
+        raise PayloadError("isCorrect must be boolean (true/false)")
+
+    return AnswerPayload(text=a_text, is_correct=is_correct)
+
+
+def _parse_question(q):
+    if not isinstance(q, dict):
+        raise PayloadError("Each question must be an object")
+
+    q_text = (q.get("text") or "").strip()
+    points = q.get("points", 1)
+    answers_data = q.get("answers") or []
+
+    if not q_text:
+        raise PayloadError("Each question must have text")
+    if not isinstance(points, int) or points <= 0:
+        raise PayloadError("Each question points must be a positive integer")
+    if not isinstance(answers_data, list) or len(answers_data) < 2:
+        raise PayloadError("Each question must have at least 2 answers")
+    if len(answers_data) > MAX_ANSWERS:
+        raise PayloadError(f"Each question can have at most {MAX_ANSWERS} answers")
+
+    answers = [_parse_answer(a) for a in answers_data]
+    if not any(a.is_correct for a in answers):
+        raise PayloadError("Each question must have at least 1 correct answer")
+
+    return QuestionPayload(text=q_text, points=points, answers=answers)
+
+
+def parse_quiz_payload(data):
+    """Proveri ceo JSON kviza pre bilo kakvog upisa u bazu. Baca PayloadError."""
+    title = (data.get("title") or "").strip()
+    duration = data.get("durationSeconds")
+    questions_data = data.get("questions") or []
+
+    if not title:
+        raise PayloadError("title is required")
+    if not isinstance(duration, int) or duration <= 0:
+        raise PayloadError("durationSeconds must be a positive integer")
+    if not isinstance(questions_data, list) or len(questions_data) == 0:
+        raise PayloadError("questions must be a non-empty list")
+
+    return QuizPayload(
+        title=title,
+        duration_seconds=duration,
+        questions=[_parse_question(q) for q in questions_data],
+    )
+
+
+# ---------------- UPIS ----------------
+def insert_questions(quiz_id, questions):
+    """Sva pitanja i odgovori kviza u tri naredbe, bez flush-a po pitanju.
+
+    MySQL nema INSERT ... RETURNING, pa se ID-evi pitanja citaju nazad
+    sortirani po id: kviz pre upisa nema pitanja, a auto-increment vrednosti
+    jednog visestrukog INSERT-a rastu redom kojim su redovi poslati.
+    """
+    db.session.execute(
+        Question.__table__.insert(),
+        [{"quiz_id": quiz_id, "text": q.text, "points": q.points} for q in questions],
+    )
+
+    question_ids = db.session.execute(
+        select(Question.id).where(Question.quiz_id == quiz_id).order_by(Question.id.asc())
+    ).scalars().all()
+
+    db.session.execute(
+        AnswerOption.__table__.insert(),
+        [
+            {"question_id": question_id, "text": a.text, "is_correct": a.is_correct}
+            for question_id, q in zip(question_ids, questions)
+            for a in q.answers
+        ],
+    )
+
+
+def delete_questions(quiz_id):
+    """Obrise sva pitanja kviza i njihove odgovore u dve naredbe."""
+    question_ids = select(Question.id).where(Question.quiz_id == quiz_id).scalar_subquery()
+    AnswerOption.query.filter(AnswerOption.question_id.in_(question_ids)).delete(
+        synchronize_session=False
+    )
+    Question.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
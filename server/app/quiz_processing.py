@@ -1,83 +1,153 @@
-from datetime import datetime
 import time
+from datetime import datetime
+
+from flask import current_app
 
 from app.extensions import db, socketio
 from app.models import Quiz, QuizAttempt, User
-from app.mail_service import send_email
+from app.mail_service import send_email_async, send_quiz_report_email
+from app.jobs import job_handler
+from app.answer_key import get_answer_key, invalidate_answer_key, save_snapshot
+from app.answer_store import load_answers
+from app.batch_scoring import rescore_quiz
+from app.cache_store import invalidate_tags, leaderboard_tag
+from app.leaderboard import leaderboards
+from app.user_directory import resolve_names
+from app.latency import LatencyWindow
 
+# vreme od predaje do upisanog rezultata, po nacinu bodovanja
+result_latency = {
+    "inline": LatencyWindow(),
+    "async": LatencyWindow(),
+}
 
-def _calculate_score(quiz, submitted):
-    score = 0
-    for q in quiz.questions:
-        chosen = submitted.get(q.id)
-        if not chosen:
-            continue
 
-        valid_ids = {a.id for a in q.answers}
-        if not chosen.issubset(valid_ids):
-            continue
+def publish_result(quiz, attempt, score):
+    leaderboards.record(
+        quiz.id, attempt.id, attempt.player_id, score, attempt.started_at, attempt.finished_at
+    )
 
-        correct_ids = {a.id for a in q.answers if a.is_correct}
-        if chosen == correct_ids:
-            score += (q.points or 0)
-    return score
+    duration_seconds = None
+    if attempt.started_at and attempt.finished_at:
+        duration_seconds = int(
+            (attempt.finished_at - attempt.started_at).total_seconds()
+        )
+    socketio.emit(
+        "quiz_result_ready",
+        {
+            "quizId": quiz.id,
+            "attemptId": attempt.id,
+            "score": score,
+            "durationSeconds": duration_seconds,
+            "finishedAt": attempt.finished_at.isoformat()
+            if attempt.finished_at
+            else None,
+        },
+        to=f"user:{attempt.player_id}",
+    )
 
+    player = User.query.get(attempt.player_id)
+    if player and player.email:
+        body = (
+            "Your quiz result is ready.\n\n"
+            f"Quiz: {quiz.title}\n"
+            f"Score: {score}\n"
+        )
+        send_email_async(player.email, "Quiz Result", body)
 
-def process_quiz_submission(quiz_id, attempt_id, submitted_answers, expired=False):
-    from app.main import app
 
-    with app.app_context():
-        attempt = QuizAttempt.query.get(attempt_id)
-        quiz = Quiz.query.get(quiz_id)
-        if not attempt or not quiz:
-            return
+@job_handler("score_attempt")
+def process_quiz_submission(quiz_id, attempt_id, submitted_answers=None, expired=False, submitted_at=None):
+    # poziva se iz scoring_pool radnika koji vec drzi app context
+    attempt = QuizAttempt.query.get(attempt_id)
+    quiz = Quiz.query.get(quiz_id)
+    if not attempt or not quiz:
+        return
 
-        if attempt.score is not None:
-            return
+    if attempt.state != "SUBMITTED":
+        return
+
+    delay = current_app.config["SCORING_SIMULATED_DELAY"]
+    if not expired and delay > 0:
+        time.sleep(delay)
+
+    if expired:
+        score = 0
+    else:
+        # kljuc verzije sa kojom je pokusaj poceo, ne trenutni redovi kviza
+        key = get_answer_key(quiz_id, attempt.quiz_version or quiz.version)
+        if submitted_answers is None:
+            masks = load_answers(attempt_id) or {}
+        else:
+            # poslovi upisani pre attempt_answers nose odgovore u payload-u
+            masks = key.masks_for(submitted_answers)
+        score = key.score(masks)
+
+    # SUBMITTED -> SCORED: ponovljen posao (istekao lease, restart) ne boduje dvaput
+    updated = (
+        QuizAttempt.query
+        .filter(QuizAttempt.id == attempt_id, QuizAttempt.state == "SUBMITTED")
+        .update(
+            {"score": score, "state": "SCORED", "scored_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+    )
+    db.session.commit()
+    if not updated:
+        return
 
-        if not expired:
-            time.sleep(2)
+    if submitted_at is not None:
+        result_latency["async"].add(time.time() - submitted_at)
+    publish_result(quiz, attempt, score)
 
-        submitted = {}
-        for item in submitted_answers or []:
-            qid = item.get("questionId")
-            answer_ids = item.get("answerIds") or []
-            if isinstance(qid, int):
-                submitted[qid] = set(
-                    x for x in answer_ids if isinstance(x, int)
-                )
 
-        score = 0 if expired else _calculate_score(quiz, submitted)
-        attempt.score = score
-        db.session.commit()
+@job_handler("quiz_report")
+def generate_quiz_report(quiz_id, to_email):
+    quiz = Quiz.query.get(quiz_id)
+    if not quiz:
+        return
+
+    attempts = (
+        QuizAttempt.query
+        .filter_by(quiz_id=quiz_id)
+        .order_by(QuizAttempt.finished_at.desc())
+        .all()
+    )
+
+    names = resolve_names(attempt.player_id for attempt in attempts)
+
+    attempt_rows = []
+    for attempt in attempts:
+        full_name = names.get(attempt.player_id) or f"Player {attempt.player_id}"
 
-        player = User.query.get(attempt.player_id)
         duration_seconds = None
         if attempt.started_at and attempt.finished_at:
-            duration_seconds = int(
-                (attempt.finished_at - attempt.started_at).total_seconds()
-            )
-        socketio.emit(
-            "quiz_result_ready",
-            {
-                "quizId": quiz.id,
-                "attemptId": attempt.id,
-                "score": score,
-                "durationSeconds": duration_seconds,
-                "finishedAt": attempt.finished_at.isoformat()
-                if attempt.finished_at
-                else None,
-            },
-            to=f"user:{attempt.player_id}",
-        )
+            duration_seconds = int((attempt.finished_at - attempt.started_at).total_seconds())
+
+        attempt_rows.append({
+            "player_id": attempt.player_id,
+            "name": full_name,
+            "score": attempt.score,
+            "finished_at": attempt.finished_at,
+            "duration_seconds": duration_seconds,
+        })
+
+    send_quiz_report_email(
+        to_email=to_email,
+        quiz_id=quiz.id,
+        quiz_title=quiz.title,
+        attempt_rows=attempt_rows,
+    )
+
+
+@job_handler("rescore_quiz")
+def rescore_quiz_job(quiz_id):
+    quiz = Quiz.query.get(quiz_id)
+    if not quiz:
+        return
 
-        if player and player.email:
-            body = (
-                "Your quiz result is ready.\n\n"
-                f"Quiz: {quiz.title}\n"
-                f"Score: {score}\n"
-            )
-            try:
-                send_email(player.email, "Quiz Result", body)
-            except Exception:
-                pass
+    # ispravke u bazi (npr. is_correct) postaju novi snapshot tekuce verzije
+    key = save_snapshot(quiz.id, quiz.version, replace=True)
+    rescore_quiz(quiz.id, key)
+    invalidate_answer_key(quiz.id)
+    invalidate_tags(leaderboard_tag(quiz_id))
@@ -1,23 +1,80 @@
-from flask import Blueprint, request, jsonify
-from multiprocessing import Process
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import func, or_, text
+from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db, socketio
-from app.models import Quiz, Question, AnswerOption, QuizAttempt, User
+from app.models import Quiz, QuizAttempt, AttemptAnswers, QuizSnapshot, User
 from app.dto import QuizDTO, QuizAttemptDTO
-from app.quiz_processing import process_quiz_submission
-from app.mail_service import send_quiz_report_email_async
-from app.cache_store import cache, cache_key, invalidate_prefix
-
-from datetime import datetime, timedelta
+from app.jobs import enqueue_job, dispatch_job
+from app.answer_key import get_answer_key, invalidate_answer_key, save_snapshot
+from app.answer_store import store_answers
+from app.attempt_expiry import expire_attempts, notify_expired
+from app.quiz_processing import publish_result, result_latency
+from app.cache_store import (
+    cache_key, cache_get_or_load, invalidate_tags,
+    PENDING_TAG, APPROVED_TAG, quiz_tag, leaderboard_tag,
+)
+from app.leaderboard import leaderboards
+from app.query_options import QUIZ_LIST, get_full_quiz
+from app.quiz_payload import PayloadError, parse_quiz_payload, insert_questions, delete_questions
+from app.user_directory import resolve_name, resolve_names
+from app.http_cache import CachedResponse, cached_json, encode_response, json_response
+from app.pagination import CursorError, page_params, paginate, page_response, cached_page, cached_page_response
+from app.replicas import read_only
+from app.worker_pool import scoring_pool
+
+import time
+from datetime import datetime
 
 quiz_bp = Blueprint("quizzes", __name__, url_prefix="/api/quizzes")
 
+# najvise redova u jednom prozoru/stranici rang liste
+MAX_RANK_WINDOW = 50
+
 
 def require_role(*allowed_roles):
     role = (get_jwt() or {}).get("role")
     return role in allowed_roles
 
+
+def scoring_busy_response():
+    return (
+        jsonify({"message": "Scoring queue is full, try again later"}),
+        503,
+        {"Retry-After": str(scoring_pool.retry_after)},
+    )
+
+
+def enqueue_scoring(attempt, quiz_id):
+    """Upise posao bodovanja u istu transakciju kao i zavrsetak pokusaja; odgovori su u attempt_answers."""
+    return enqueue_job(
+        "score_attempt",
+        {
+            "quiz_id": quiz_id,
+            "attempt_id": attempt.id,
+            "submitted_at": time.time(),
+        },
+        delay_seconds=current_app.config["JOB_DISPATCH_GRACE"],
+    )
+
+
+def use_inline_scoring(answer_key):
+    mode = current_app.config["SCORING_MODE"]
+    if mode == "inline":
+        return True
+    if mode == "async":
+        return False
+    return len(answer_key.questions) <= current_app.config["SCORING_INLINE_MAX_QUESTIONS"]
+
+
+def finish_expired_attempt(attempt, now):
+    """Istekli pokusaj se odmah zavrsava sa 0 bodova, istim putem kao pozadinski sweeper."""
+    expired = expire_attempts([attempt.id], now)
+    db.session.commit()
+    if expired:
+        notify_expired([attempt], now)
+
 # ---------------- NAPRAVI KVIZ ----------------
 @quiz_bp.route("", methods=["POST"])
 @jwt_required()
@@ -25,83 +82,26 @@ def create_quiz():
     if not require_role("MODERATOR", "ADMIN"):
         return jsonify({"message": "Forbidden"}), 403
 
-    data = request.get_json() or {}
-    title = (data.get("title") or "").strip()
-    duration = data.get("durationSeconds")
-
-    questions_data = data.get("questions") or []
-
-    if not title:
-        return jsonify({"message": "title is required"}), 400
-    if not isinstance(duration, int) or duration <= 0:
-        return jsonify({"message": "durationSeconds must be a positive integer"}), 400
-    if not isinstance(questions_data, list) or len(questions_data) == 0:
-        return jsonify({"message": "questions must be a non-empty list"}), 400
+    try:
+        payload = parse_quiz_payload(request.get_json() or {})
+    except PayloadError as exc:
+        return jsonify({"message": str(exc)}), 400
 
     author_id = int(get_jwt_identity())
 
-    quiz = Quiz(title=title, duration_seconds=duration, author_id=author_id, status="PENDING")
+    quiz = Quiz(
+        title=payload.title,
+        duration_seconds=payload.duration_seconds,
+        author_id=author_id,
+        status="PENDING",
+    )
     db.session.add(quiz)
-    db.session.flush()  
-
-    for q in questions_data:
-        if not isinstance(q, dict):
-            db.session.rollback()
-            return jsonify({"message": "Each question must be an object"}), 400
-        
-        q_text = (q.get("text") or "").strip()
-        points = q.get("points", 1)
-        answers_data = q.get("answers") or []
-
-        if not q_text:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have text"}), 400
-        if not isinstance(points, int) or points <= 0:
-            db.session.rollback()
-            return jsonify({"message": "Each question points must be a positive integer"}), 400
-        if not isinstance(answers_data, list) or len(answers_data) < 2:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have at least 2 answers"}), 400
-
-        correct_count = 0
-        question = Question(quiz_id=quiz.id, text=q_text, points=points)
-        db.session.add(question)
-        db.session.flush()
-
-        for a in answers_data:
-            if not isinstance(a, dict):
-                db.session.rollback()
-                return jsonify({"message": "Each answer must be an object"}), 400
-
-            a_text = (a.get("text") or "").strip()
-            if not a_text:
-                db.session.rollback()
-                return jsonify({"message": "Each answer must have text"}), 400
-
-            is_correct = a.get("isCorrect")
-            if not isinstance(is_correct, bool):
-                db.session.rollback()
-                return jsonify({"message": "isCorrect must be boolean (true/false)"}), 400
-            if is_correct:
-                correct_count += 1
-
-            db.session.add(AnswerOption(
-                question_id=question.id,
-                text=a_text,
-                is_correct=is_correct
-            ))
-
-        if correct_count < 1:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have at least 1 correct answer"}), 400
+    db.session.flush()
+    insert_questions(quiz.id, payload.questions)
 
     db.session.commit()
-    invalidate_prefix("quizzes:pending")
-    invalidate_prefix("quizzes:approved")
-    author = User.query.get(quiz.author_id)
-    author_name = None
-    if author:
-        author_name = f"{author.first_name} {author.last_name}".strip()
+    invalidate_tags(PENDING_TAG, APPROVED_TAG)
+    author_name = resolve_name(quiz.author_id)
     socketio.emit("quiz_created", {
         "id": quiz.id,
         "title": quiz.title,
@@ -113,6 +113,78 @@ def create_quiz():
     }, to="admins")
     return jsonify({"message": "Quiz created", "id": quiz.id, "status": quiz.status}), 201
 
+# ---------------- UCITAVANJE ZA KES ----------------
+# loaderi za cache_get_or_load: bez request context-a, jer se mogu pozvati i iz pozadinskog osvezavanja
+
+def quizzes_with_authors(quizzes):
+    authors = resolve_names(q.author_id for q in quizzes)
+    return [
+        QuizDTO.from_model(q, author_name=authors.get(q.author_id)).to_dict()
+        for q in quizzes
+    ]
+
+
+def load_pending_quizzes(page):
+    quizzes, next_cursor = paginate(
+        Quiz.query.options(*QUIZ_LIST).filter_by(status="PENDING"), Quiz.id, page
+    )
+    return quizzes_with_authors(quizzes), next_cursor
+
+
+def load_approved_quizzes(page):
+    quizzes, next_cursor = paginate(
+        Quiz.query.options(*QUIZ_LIST).filter_by(status="APPROVED"), Quiz.id, page
+    )
+    return [QuizDTO.from_model(q).to_dict() for q in quizzes], next_cursor
+
+
+def load_quiz_details(quiz_id, role):
+    """Telo detalja zajedno sa statusom i vidljivoscu za ulogu, da pogodak u kesu ne ide u bazu."""
+    quiz = get_full_quiz(quiz_id)
+    if not quiz:
+        return None
+
+    meta = {
+        "status": quiz.status,
+        "visible": role != "PLAYER" or quiz.status == "APPROVED",
+    }
+    if not meta["visible"]:
+        # igrac ne vidi neodobren kviz: pamti se samo odluka, pitanja se ne ucitavaju
+        return CachedResponse(body=b"", etag="", meta=meta)
+
+    dto = QuizDTO.from_model(
+        quiz,
+        include_questions=True,
+        include_correct_count=role == "PLAYER",
+    )
+    return encode_response(dto.to_dict(), meta=meta)
+
+
+def leaderboard_rows(rows, first_rank=None):
+    """Redovi rang liste -> DTO recnici; uz first_rank svaki red dobija i svoje mesto."""
+    names = resolve_names(row[1] for row in rows)
+    result = []
+    for index, (attempt_id, player_id, score, started_at, finished_at) in enumerate(rows):
+        duration = None
+        if started_at and finished_at:
+            duration = int((finished_at - started_at).total_seconds())
+
+        dto = QuizAttemptDTO(
+            player_id=player_id,
+            name=names.get(player_id),
+            score=score,
+            duration_seconds=duration,
+            finished_at=finished_at.isoformat() if finished_at else None,
+            rank=first_rank + index if first_rank is not None else None,
+        )
+        result.append(dto.to_dict())
+    return result
+
+
+def load_leaderboard(quiz_id):
+    # top 50 iz rang liste u memoriji, bez ORDER BY nad quiz_attempts
+    return leaderboard_rows(leaderboards.get(quiz_id).top(50))
+
 # ---------------- KVIZ ZA ODOBRAVANJE LISTA ----------------
 @quiz_bp.route("/pending", methods=["GET"])
 @jwt_required()
@@ -120,24 +192,15 @@ def list_pending_quizzes():
     if not require_role("ADMIN"):
         return jsonify({"message": "Forbidden"}), 403
 
-    key = cache_key("quizzes", "pending")
-    cached = cache.get(key)
-    if cached is not None:
-        print("CACHE HIT:", key)
-        return jsonify(cached), 200
-
-    quizzes = Quiz.query.filter_by(status="PENDING").order_by(Quiz.id.asc()).all()
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
 
-    result = []
-    for q in quizzes:
-        author = User.query.get(q.author_id)
-        author_name = None
-        if author:
-            author_name = f"{author.first_name} {author.last_name}".strip()
-        result.append(QuizDTO.from_model(q, author_name=author_name).to_dict())
-
-    cache[key] = result
-    return jsonify(result), 200
+    # kes po stranici; promena bilo kog kviza invalidira sve stranice preko taga
+    key = cache_key("quizzes", "pending", page.after_id, page.limit)
+    entry = cached_page(key, lambda: load_pending_quizzes(page), tags=(PENDING_TAG,))
+    return cached_page_response(entry)
 
 # ---------------- SVI KVIZOVI (ADMIN) ----------------
 @quiz_bp.route("/admin/all", methods=["GET"])
@@ -146,15 +209,13 @@ def list_all_quizzes_admin():
     if not require_role("ADMIN"):
         return jsonify({"message": "Forbidden"}), 403
 
-    quizzes = Quiz.query.order_by(Quiz.id.asc()).all()
-    result = []
-    for q in quizzes:
-        author = User.query.get(q.author_id)
-        author_name = None
-        if author:
-            author_name = f"{author.first_name} {author.last_name}".strip()
-        result.append(QuizDTO.from_model(q, author_name=author_name).to_dict())
-    return jsonify(result), 200
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    quizzes, next_cursor = paginate(Quiz.query.options(*QUIZ_LIST), Quiz.id, page)
+    return page_response(quizzes_with_authors(quizzes), next_cursor), 200
 
 # ---------------- ODOBRI KVIZ ----------------
 @quiz_bp.route("/<int:quiz_id>/approve", methods=["PATCH"])
@@ -172,10 +233,10 @@ def approve_quiz(quiz_id):
 
     quiz.status = "APPROVED"
     quiz.rejection_reason = None
+    # zamrzni kljuc odgovora za ovu verziju pre nego sto igraci mogu da pocnu
+    save_snapshot(quiz.id, quiz.version)
     db.session.commit()
-    invalidate_prefix("quizzes:pending")
-    invalidate_prefix("quizzes:approved")
-    invalidate_prefix(f"quiz:{quiz_id}:details")
+    invalidate_tags(PENDING_TAG, APPROVED_TAG, quiz_tag(quiz_id))
     socketio.emit("quiz_reviewed", {
         "id": quiz.id,
         "status": quiz.status,
@@ -206,9 +267,7 @@ def reject_quiz(quiz_id):
     quiz.status = "REJECTED"
     quiz.rejection_reason = reason
     db.session.commit()
-    invalidate_prefix("quizzes:pending")
-    invalidate_prefix(f"quiz:{quiz_id}:details")
-    invalidate_prefix("quizzes:approved")
+    invalidate_tags(PENDING_TAG, APPROVED_TAG, quiz_tag(quiz_id))
     socketio.emit("quiz_reviewed", {
         "id": quiz.id,
         "status": quiz.status,
@@ -225,45 +284,36 @@ def reject_quiz(quiz_id):
 # ---------------- LISTA ODOBRENIH KVIZOVA ----------------
 @quiz_bp.route("", methods=["GET"])
 @jwt_required()
+@read_only
 def list_approved_quizzes():
-    key = cache_key("quizzes", "approved")
-    cached = cache.get(key)
-    if cached is not None:
-        print("CACHE HIT:", key)
-        return jsonify(cached), 200
-
-    quizzes = Quiz.query.filter_by(status="APPROVED").order_by(Quiz.id.asc()).all()
-    result = [QuizDTO.from_model(q).to_dict() for q in quizzes]
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
 
-    cache[key] = result
-    return jsonify(result), 200
+    key = cache_key("quizzes", "approved", page.after_id, page.limit)
+    entry = cached_page(key, lambda: load_approved_quizzes(page), tags=(APPROVED_TAG,))
+    return cached_page_response(entry)
 
 # ---------------- DETALJI KVIZA ----------------
 @quiz_bp.route("/<int:quiz_id>", methods=["GET"])
 @jwt_required()
+@read_only
 def get_quiz_details(quiz_id):
-    quiz = Quiz.query.get(quiz_id)
-    if not quiz:
-        return jsonify({"message": "Quiz not found"}), 404
-
     role = (get_jwt() or {}).get("role")
-    if role == "PLAYER" and quiz.status != "APPROVED":
-        return jsonify({"message": "Forbidden"}), 403
 
+    # status i vidljivost su u unosu; approve/reject/update/delete invalidiraju quiz:{id}
     key = cache_key("quiz", quiz_id, "details", role)
-    cached = cache.get(key)
-    if cached is not None:
-        print("CACHE HIT:", key)
-        return jsonify(cached), 200
-
-    dto = QuizDTO.from_model(
-        quiz,
-        include_questions=True,
-        include_correct_count=role == "PLAYER",
+    entry = cache_get_or_load(
+        key,
+        lambda: load_quiz_details(quiz_id, role),
+        tags=(quiz_tag(quiz_id),),
     )
-    result = dto.to_dict()
-    cache[key] = result
-    return jsonify(result), 200
+    if entry is None:
+        return jsonify({"message": "Quiz not found"}), 404
+    if not entry.meta["visible"]:
+        return jsonify({"message": "Forbidden"}), 403
+    return json_response(entry)
 
 # ---------------- POKRENI KVIZ ----------------
 @quiz_bp.route("/<int:quiz_id>/start", methods=["POST"])
@@ -280,9 +330,21 @@ def start_quiz_attempt(quiz_id):
 
     player_id = int(get_jwt_identity())
 
-    attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, player_id=player_id).first()
-    if attempt:
-        if attempt.finished_at is not None:
+    # insert-or-fetch: jedinstveni (quiz_id, player_id) resava dupli klik bez citanja unapred
+    attempt = QuizAttempt(
+        quiz_id=quiz_id,
+        player_id=player_id,
+        quiz_version=quiz.version,
+        started_at=datetime.utcnow(),
+        state="STARTED"
+    )
+    db.session.add(attempt)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, player_id=player_id).first()
+        if attempt.state != "STARTED":
             return jsonify({"message": "Already finished", "attemptId": attempt.id}), 409
 
         return jsonify({
@@ -292,25 +354,21 @@ def start_quiz_attempt(quiz_id):
             "finishedAt": None
         }), 200
 
-    attempt = QuizAttempt(
-        quiz_id=quiz_id,
-        player_id=player_id,
-        started_at=datetime.utcnow()
-    )
-    db.session.add(attempt)
-    db.session.commit()
-
-    return jsonify({
+    result = {
         "attemptId": attempt.id,
         "quizId": attempt.quiz_id,
         "startedAt": attempt.started_at.isoformat(),
         "finishedAt": None
-    }), 201
+    }
+    db.session.commit()
+
+    return jsonify(result), 201
 
 # ---------------- POSALJI POKUSAJ KVIZA ----------------
 @quiz_bp.route("/<int:quiz_id>/submit", methods=["POST"])
 @jwt_required()
 def submit_quiz_attempt(quiz_id):
+    request_started = time.time()
     if not require_role("PLAYER"):
         return jsonify({"message": "Forbidden"}), 403
 
@@ -322,31 +380,6 @@ def submit_quiz_attempt(quiz_id):
 
     player_id = int(get_jwt_identity())
 
-    attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, player_id=player_id).first()
-    if not attempt:
-        return jsonify({"message": "You must start the quiz first"}), 409
-
-    if attempt.finished_at is not None:
-        if attempt.score is None:
-            return jsonify({"message": "Processing"}), 202
-        return jsonify({"message": "Already submitted", "score": attempt.score}), 409
-
-    now = datetime.utcnow()
-    elapsed_seconds = (now - attempt.started_at).total_seconds()
-    if quiz.duration_seconds is not None and elapsed_seconds > quiz.duration_seconds:
-        attempt.finished_at = now
-        attempt.score = None
-        db.session.commit()
-        invalidate_prefix(f"quiz:{quiz.id}:leaderboard")
-
-        proc = Process(
-            target=process_quiz_submission,
-            args=(quiz.id, attempt.id, [], True),
-            daemon=True
-        )
-        proc.start()
-        return jsonify({"message": "Time expired, processing result"}), 202
-
     data = request.get_json() or {}
     answers = data.get("answers") or []
     remaining_seconds = data.get("remainingSeconds")
@@ -354,9 +387,10 @@ def submit_quiz_attempt(quiz_id):
     if not isinstance(answers, list):
         return jsonify({"message": "answers must be a list"}), 400
 
-    quiz_question_ids = {q.id for q in quiz.questions}
+    answer_key = get_answer_key(quiz.id, quiz.version)
+    inline = use_inline_scoring(answer_key)
 
-    submitted = {}  
+    masks = {}
     for item in answers:
         if not isinstance(item, dict):
             return jsonify({"message": "answers items must be objects"}), 400
@@ -366,7 +400,7 @@ def submit_quiz_attempt(quiz_id):
 
         if not isinstance(qid, int):
             return jsonify({"message": "questionId must be an integer"}), 400
-        if qid not in quiz_question_ids:
+        if not answer_key.has_question(qid):
             return jsonify({"message": f"Question {qid} does not belong to this quiz"}), 400
 
         if not isinstance(answer_ids, list) or len(answer_ids) == 0:
@@ -374,37 +408,83 @@ def submit_quiz_attempt(quiz_id):
         if not all(isinstance(x, int) for x in answer_ids):
             return jsonify({"message": f"answerIds must contain integers for question {qid}"}), 400
 
-        submitted[qid] = set(answer_ids)
+        mask = answer_key.mask_for(qid, answer_ids)
+        if mask is None:
+            return jsonify({"message": f"Invalid answerIds for question {qid}"}), 400
+        masks[qid] = mask
 
-    for q in quiz.questions:
-        chosen = submitted.get(q.id)
-        if not chosen:
-            continue
-
-        valid_ids = {a.id for a in q.answers}
-        if not chosen.issubset(valid_ids):
-            return jsonify({"message": f"Invalid answerIds for question {q.id}"}), 400
+    if not inline and scoring_pool.is_full():
+        return scoring_busy_response()
 
+    now = datetime.utcnow()
     if (
         isinstance(remaining_seconds, int)
-        and quiz.duration_seconds is not None
         and remaining_seconds >= 0
         and remaining_seconds <= quiz.duration_seconds
     ):
-        elapsed = quiz.duration_seconds - remaining_seconds
-        attempt.finished_at = attempt.started_at + timedelta(seconds=elapsed)
+        finished_at = func.timestampadd(
+            text("SECOND"), quiz.duration_seconds - remaining_seconds, QuizAttempt.started_at
+        )
     else:
-        attempt.finished_at = now
-    attempt.score = None
-    db.session.commit()
-    invalidate_prefix(f"quiz:{quiz.id}:leaderboard")
+        finished_at = now
+
+    score = answer_key.score(masks) if inline else None
+    deadline = func.timestampadd(text("SECOND"), quiz.duration_seconds, QuizAttempt.started_at)
 
-    proc = Process(
-        target=process_quiz_submission,
-        args=(quiz.id, attempt.id, answers, False),
-        daemon=True
+    # STARTED -> SUBMITTED (ili SCORED inline) u jednom uslovnom UPDATE-u;
+    # ponovljena predaja ili istekao rok ne menjaju nista
+    updated = (
+        QuizAttempt.query
+        .filter(
+            QuizAttempt.quiz_id == quiz_id,
+            QuizAttempt.player_id == player_id,
+            QuizAttempt.state == "STARTED",
+            or_(QuizAttempt.quiz_version == quiz.version, QuizAttempt.quiz_version.is_(None)),
+            deadline >= now,
+        )
+        .update(
+            {
+                "state": "SCORED" if inline else "SUBMITTED",
+                "finished_at": finished_at,
+                "score": score,
+                "scored_at": now if inline else None,
+            },
+            synchronize_session=False,
+        )
     )
-    proc.start()
+
+    attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, player_id=player_id).first()
+    if not updated:
+        if not attempt:
+            return jsonify({"message": "You must start the quiz first"}), 409
+        if attempt.state == "STARTED" and attempt.quiz_version not in (None, quiz.version):
+            return jsonify({"message": "Quiz changed since the attempt started"}), 409
+        if attempt.state == "STARTED":
+            finish_expired_attempt(attempt, now)
+            return jsonify({"message": "Time expired"}), 202
+        if attempt.state == "SUBMITTED":
+            return jsonify({"message": "Processing"}), 202
+        return jsonify({"message": "Already submitted", "score": attempt.score}), 409
+
+    store_answers(attempt.id, quiz.id, masks)
+
+    if inline:
+        db.session.commit()
+        result_latency["inline"].add(time.time() - request_started)
+        publish_result(quiz, attempt, score)
+
+        return jsonify({
+            "attemptId": attempt.id,
+            "quizId": quiz.id,
+            "status": "SCORED",
+            "score": score,
+            "durationSeconds": int((attempt.finished_at - attempt.started_at).total_seconds()),
+            "finishedAt": attempt.finished_at.isoformat(),
+        }), 200
+
+    job_id = enqueue_scoring(attempt, quiz.id)
+    db.session.commit()
+    dispatch_job(job_id)
 
     return jsonify({
         "attemptId": attempt.id,
@@ -415,44 +495,75 @@ def submit_quiz_attempt(quiz_id):
 # ---------------- LISTA POBEDNIKA ----------------
 @quiz_bp.route("/<int:quiz_id>/leaderboard", methods=["GET"])
 @jwt_required()
+@read_only
 def leaderboard(quiz_id):
     quiz = Quiz.query.get(quiz_id)
     if not quiz or quiz.status != "APPROVED":
         return jsonify({"message": "Quiz not found"}), 404
 
     key = cache_key("quiz", quiz_id, "leaderboard")
-    cached = cache.get(key)
-    if cached is not None:
-        print("CACHE HIT:", key)
-        return jsonify(cached), 200
-
-    attempts = (
-        QuizAttempt.query
-        .filter_by(quiz_id=quiz_id)
-        .filter(QuizAttempt.score.isnot(None))
-        .order_by(QuizAttempt.score.desc(), QuizAttempt.finished_at.asc())
-        .limit(50)
-        .all()
+    entry = cached_json(
+        key,
+        lambda: load_leaderboard(quiz_id),
+        tags=(quiz_tag(quiz_id), leaderboard_tag(quiz_id)),
     )
+    return json_response(entry)
 
-    result = []
-    for a in attempts:
-        duration = None
-        if a.started_at and a.finished_at:
-            duration = int((a.finished_at - a.started_at).total_seconds())
+# ---------------- MOJE MESTO NA LISTI ----------------
+@quiz_bp.route("/<int:quiz_id>/leaderboard/me", methods=["GET"])
+@jwt_required()
+@read_only
+def my_leaderboard_rank(quiz_id):
+    if not require_role("PLAYER"):
+        return jsonify({"message": "Forbidden"}), 403
 
-        u = User.query.get(a.player_id)
+    user_id = int(get_jwt_identity())
 
-        dto = QuizAttemptDTO(
-            player_id=a.player_id,
-            name=f"{u.first_name} {u.last_name}".strip() if u else None,
-            score=a.score,
-            duration_seconds=duration,
-            finished_at=a.finished_at.isoformat() if a.finished_at else None,
-        )
-        result.append(dto.to_dict())
-    cache[key] = result
-    return jsonify(result), 200
+    quiz = Quiz.query.get(quiz_id)
+    if not quiz or quiz.status != "APPROVED":
+        return jsonify({"message": "Quiz not found"}), 404
+
+    # ?around=N -> N mesta iznad i N ispod igraca
+    around = request.args.get("around", default=5, type=int)
+    around = min(max(around, 0), MAX_RANK_WINDOW)
+
+    board = leaderboards.get(quiz_id)
+    index, rows = board.around_player(user_id, around)
+    if index is None:
+        return jsonify({"message": "No scored attempt"}), 404
+
+    first = max(index - around, 0)
+
+    return jsonify({
+        "quizId": quiz_id,
+        "rank": index + 1,
+        "total": len(board),
+        "around": leaderboard_rows(rows, first_rank=first + 1),
+    }), 200
+
+# ---------------- STRANICA LISTE PO MESTU ----------------
+@quiz_bp.route("/<int:quiz_id>/leaderboard/ranks", methods=["GET"])
+@jwt_required()
+@read_only
+def leaderboard_ranks(quiz_id):
+    quiz = Quiz.query.get(quiz_id)
+    if not quiz or quiz.status != "APPROVED":
+        return jsonify({"message": "Quiz not found"}), 404
+
+    # ?from=<mesto, od 1>&limit=<broj>
+    start = max(request.args.get("from", default=1, type=int), 1)
+    limit = request.args.get("limit", default=MAX_RANK_WINDOW, type=int)
+    limit = min(max(limit, 1), MAX_RANK_WINDOW)
+
+    board = leaderboards.get(quiz_id)
+    rows = board.window(start - 1, start - 1 + limit)
+
+    return jsonify({
+        "quizId": quiz_id,
+        "total": len(board),
+        "from": start,
+        "items": leaderboard_rows(rows, first_rank=start),
+    }), 200
 
 # ---------------- OBRISI KVIZ ----------------
 @quiz_bp.route("/<int:quiz_id>", methods=["DELETE"])
@@ -470,13 +581,15 @@ def delete_quiz(quiz_id):
     if not require_role("ADMIN") and quiz.author_id != user_id:
         return jsonify({"message": "Forbidden"}), 403
 
+    AttemptAnswers.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+    QuizSnapshot.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
     QuizAttempt.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+    delete_questions(quiz_id)
     db.session.delete(quiz)
     db.session.commit()
-    invalidate_prefix("quizzes:pending")
-    invalidate_prefix("quizzes:approved")
-    invalidate_prefix(f"quiz:{quiz_id}:details")
-    invalidate_prefix(f"quiz:{quiz_id}:leaderboard")
+    invalidate_tags(PENDING_TAG, APPROVED_TAG, quiz_tag(quiz_id), leaderboard_tag(quiz_id))
+    leaderboards.drop(quiz_id)
+    invalidate_answer_key(quiz_id)
 
     return jsonify({"message": "Quiz deleted", "id": quiz_id}), 200
 
@@ -499,22 +612,10 @@ def my_result(quiz_id):
 
     now = datetime.utcnow()
 
-    if attempt.finished_at is None:
-        if quiz.duration_seconds is not None and attempt.started_at is not None:
-            elapsed = (now - attempt.started_at).total_seconds()
-            if elapsed > quiz.duration_seconds:
-                attempt.finished_at = now
-                attempt.score = None
-                db.session.commit()
-                invalidate_prefix(f"quiz:{quiz.id}:leaderboard")
-                proc = Process(
-                    target=process_quiz_submission,
-                    args=(quiz.id, attempt.id, [], True),
-                    daemon=True
-                )
-                proc.start()
-            else:
-                return jsonify({"message": "Not submitted yet"}), 409
+    if attempt.state == "STARTED":
+        elapsed = (now - attempt.started_at).total_seconds()
+        if elapsed > quiz.duration_seconds:
+            finish_expired_attempt(attempt, now)
         else:
             return jsonify({"message": "Not submitted yet"}), 409
 
@@ -522,7 +623,7 @@ def my_result(quiz_id):
     if attempt.started_at and attempt.finished_at:
         duration = int((attempt.finished_at - attempt.started_at).total_seconds())
 
-    if attempt.score is None:
+    if attempt.state != "SCORED":
         return jsonify({"message": "Processing"}), 202
 
     return jsonify({
@@ -542,14 +643,15 @@ def my_quizzes():
 
     user_id = int(get_jwt_identity())
 
-    quizzes = (
-        Quiz.query
-        .filter_by(author_id=user_id)
-        .order_by(Quiz.id.asc())
-        .all()
-    )
+    try:
+        page = page_params()
+    except CursorError as exc:
+        return jsonify({"message": str(exc)}), 400
 
-    return jsonify([QuizDTO.from_model(q).to_dict() for q in quizzes]), 200
+    quizzes, next_cursor = paginate(
+        Quiz.query.options(*QUIZ_LIST).filter_by(author_id=user_id), Quiz.id, page
+    )
+    return page_response([QuizDTO.from_model(q).to_dict() for q in quizzes], next_cursor), 200
 
 # ---------------- ODBIJENI KVIZ ----------------
 @quiz_bp.route("/<int:quiz_id>", methods=["PUT"])
@@ -570,86 +672,47 @@ def update_rejected_quiz(quiz_id):
     if quiz.status != "REJECTED":
         return jsonify({"message": "Only REJECTED quizzes can be edited"}), 400
 
-    data = request.get_json() or {}
-    title = (data.get("title") or "").strip()
-    duration = data.get("durationSeconds")
-    questions_data = data.get("questions") or []
-
-    if not title:
-        return jsonify({"message": "title is required"}), 400
-    if not isinstance(duration, int) or duration <= 0:
-        return jsonify({"message": "durationSeconds must be a positive integer"}), 400
-    if not isinstance(questions_data, list) or len(questions_data) == 0:
-        return jsonify({"message": "questions must be a non-empty list"}), 400
-
-    quiz.title = title
-    quiz.duration_seconds = duration
-
-    quiz.questions.clear()
-    db.session.flush()
-
-    for q in questions_data:
-        if not isinstance(q, dict):
-            db.session.rollback()
-            return jsonify({"message": "Each question must be an object"}), 400
-
-        q_text = (q.get("text") or "").strip()
-        points = q.get("points", 1)
-        answers_data = q.get("answers") or []
-
-        if not q_text:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have text"}), 400
-        if not isinstance(points, int) or points <= 0:
-            db.session.rollback()
-            return jsonify({"message": "Each question points must be a positive integer"}), 400
-        if not isinstance(answers_data, list) or len(answers_data) < 2:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have at least 2 answers"}), 400
-
-        question = Question(quiz_id=quiz.id, text=q_text, points=points)
-        db.session.add(question)
-        db.session.flush()
+    try:
+        payload = parse_quiz_payload(request.get_json() or {})
+    except PayloadError as exc:
+        return jsonify({"message": str(exc)}), 400
 
-        correct_count = 0
-        for a in answers_data:
-            if not isinstance(a, dict):
-                db.session.rollback()
-                return jsonify({"message": "Each answer must be an object"}), 400
+    quiz.title = payload.title
+    quiz.duration_seconds = payload.duration_seconds
 
-            a_text = (a.get("text") or "").strip()
-            if not a_text:
-                db.session.rollback()
-                return jsonify({"message": "Each answer must have text"}), 400
+    delete_questions(quiz.id)
+    insert_questions(quiz.id, payload.questions)
 
-            is_correct = a.get("isCorrect")
+    quiz.status = "PENDING"
+    quiz.rejection_reason = None
+    quiz.version = quiz.version + 1
 
-            if not isinstance(is_correct, bool):
-                db.session.rollback()
-                return jsonify({"message": "isCorrect must be boolean (true/false)"}), 400
+    db.session.commit()
+    invalidate_tags(PENDING_TAG, APPROVED_TAG, quiz_tag(quiz_id))
 
-            if is_correct:
-                correct_count += 1
+    return jsonify({"message": "Quiz updated and resubmitted", "id": quiz.id, "status": quiz.status}), 200
 
-            db.session.add(AnswerOption(
-                question_id=question.id,
-                text=a_text,
-                is_correct=is_correct
-            ))
 
-        if correct_count < 1:
-            db.session.rollback()
-            return jsonify({"message": "Each question must have at least 1 correct answer"}), 400
+# ---------------- PONOVNO BODOVANJE (ADMIN) ----------------
+@quiz_bp.route("/<int:quiz_id>/rescore", methods=["POST"])
+@jwt_required()
+def rescore_quiz_attempts(quiz_id):
+    if not require_role("ADMIN"):
+        return jsonify({"message": "Forbidden"}), 403
 
-    quiz.status = "PENDING"
-    quiz.rejection_reason = None
+    quiz = Quiz.query.get(quiz_id)
+    if not quiz:
+        return jsonify({"message": "Quiz not found"}), 404
 
+    job_id = enqueue_job(
+        "rescore_quiz",
+        {"quiz_id": quiz.id},
+        delay_seconds=current_app.config["JOB_DISPATCH_GRACE"],
+    )
     db.session.commit()
-    invalidate_prefix("quizzes:pending")
-    invalidate_prefix("quizzes:approved")
-    invalidate_prefix(f"quiz:{quiz_id}:details")
+    dispatch_job(job_id)
 
-    return jsonify({"message": "Quiz updated and resubmitted", "id": quiz.id, "status": quiz.status}), 200
+    return jsonify({"message": "Rescoring started", "id": quiz.id}), 202
 
 
 #---------------- POSALJI IZVESTAJ KVIZA EMAILOM ----------------
@@ -672,38 +735,12 @@ def email_quiz_report(quiz_id):
     if not target_email:
         return jsonify({"message": "Target email is required"}), 400
 
-    attempts = (
-        QuizAttempt.query
-        .filter_by(quiz_id=quiz_id)
-        .order_by(QuizAttempt.finished_at.desc())
-        .all()
-    )
-
-    attempt_rows = []
-    for attempt in attempts:
-        player = User.query.get(attempt.player_id)
-        full_name = (
-            f"{player.first_name} {player.last_name}".strip()
-            if player else f"Player {attempt.player_id}"
-        )
-
-        duration_seconds = None
-        if attempt.started_at and attempt.finished_at:
-            duration_seconds = int((attempt.finished_at - attempt.started_at).total_seconds())
-
-        attempt_rows.append({
-            "player_id": attempt.player_id,
-            "name": full_name,
-            "score": attempt.score,
-            "finished_at": attempt.finished_at,
-            "duration_seconds": duration_seconds,
-        })
-
-    send_quiz_report_email_async(
-        to_email=target_email,
-        quiz_id=quiz.id,
-        quiz_title=quiz.title,
-        attempt_rows=attempt_rows,
+    job_id = enqueue_job(
+        "quiz_report",
+        {"quiz_id": quiz.id, "to_email": target_email},
+        delay_seconds=current_app.config["JOB_DISPATCH_GRACE"],
     )
+    db.session.commit()
+    dispatch_job(job_id)
 
     return jsonify({"message": "Report generation started. Email will be sent shortly."}), 202
@@ -0,0 +1,234 @@
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+
+logger = logging.getLogger(__name__)
+
+# Citanja sa replike. GET handler oznacen sa @read_only salje upite sesije na
+# repliku svog bind-a (USER_DB_REPLICA_URL / QUIZ_DB_REPLICA_URL). Na primarnu
+# bazu idu: sve van @read_only handlera, upisi, punjenje kesa (use_primary) i
+# korisnik koji je upisivao u poslednjih REPLICA_STICKY_SECONDS sekundi. Vreme
+# upisa se pamti u kes backend-u, pa ga sa CACHE_BACKEND=sqlite vide svi procesi.
+# app.extensions uvozi RoutingSession, pa se moduli aplikacije ovde uvoze u funkcijama.
+
+REPLICA_BINDS = {
+    "user_data": ("USER_DB_REPLICA_URL", "USER_DB"),
+    "quiz_data": ("QUIZ_DB_REPLICA_URL", "QUIZ_DB"),
+}
+
+
+class Replica:
+    def __init__(self, bind, engine):
+        self.bind = bind
+        self.engine = engine
+        self.healthy = False  # do prve provere sve ide na primarnu
+        self.lag = None
+        self.error = None
+
+    def stats(self):
+        return {"healthy": self.healthy, "lagSeconds": self.lag, "error": self.error}
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.max_lag = 0
+        self._replicas = {}  # primarni engine -> Replica
+        self.sticky_seconds = 10
+
+    def init_app(self, app, db):
+        from app.db_engine import engine_options, prepare_engine, watch_engine
+
+        self.max_lag = app.config["REPLICA_MAX_LAG"]
+        self.sticky_seconds = app.config["REPLICA_STICKY_SECONDS"]
+        self._replicas = {}  # engine-i prethodne aplikacije (npr. u testovima) vise ne vaze
+
+        with app.app_context():
+            for bind, (url_setting, prefix) in REPLICA_BINDS.items():
+                url = app.config.get(url_setting)
+                if not url:
+                    continue
+                engine = create_engine(url, **engine_options(prefix, url))
+                prepare_engine(engine)
+                watch_engine(f"{bind}_replica", engine)
+                event.listen(engine, "handle_error", self._on_error(bind))
+                self._replicas[db.engines[bind]] = Replica(bind, engine)
+
+    def route(self, engine, session):
+        """Engine za upit: replika ako je zahtev read-only i replika je zdrava, inace primarni."""
+        replica = self._replicas.get(engine)
+        if replica is None or not replica.healthy:
+            return engine
+        if not has_request_context() or not g.get("db_read_only"):
+            return engine
+        if g.get("db_primary") or g.get("db_sticky"):
+            return engine
+        # objekti koji cekaju flush znace upis u ovom zahtevu
+        if session.new or session.dirty or session.deleted:
+            return engine
+        return replica.engine
+
+    # ---------------- STICKY PRIMARNA ----------------
+    @staticmethod
+    def _sticky_key(identity):
+        from app.cache_store import cache_key
+
+        return cache_key("user", identity, "sticky")
+
+    def mark_write(self, identity):
+        from app.cache_store import mark_time
+
+        mark_time(self._sticky_key(identity))
+
+    def is_sticky(self, identity):
+        from app.cache_store import marked_at
+
+        written_at = marked_at(self._sticky_key(identity))
+        return written_at is not None and time.time() - written_at < self.sticky_seconds
+
+    # ---------------- PROVERA ZDRAVLJA ----------------
+    def _on_error(self, bind):
+        def handle_error(context):
+            # prekinuta veza sa replikom: odmah nazad na primarnu, do sledece provere
+            if context.is_disconnect:
+                self._mark_down(bind, str(context.original_exception))
+        return handle_error
+
+    def _mark_down(self, bind, error):
+        for replica in self._replicas.values():
+            if replica.bind == bind and replica.healthy:
+                replica.healthy = False
+                replica.error = error
+                logger.warning("replica %s unavailable: %s", bind, error)
+
+    def _replication_lag(self, connection):
+        if connection.dialect.name != "mysql":
+            connection.execute(text("SELECT 1"))
+            return 0
+        row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        if row is None:
+            return 0  # nije podesena replikacija (npr. lokalni kontejner za testove)
+        # None: replikacija je stala
+        return row["Seconds_Behind_Source"]
+
+    def check(self):
+        for replica in self._replicas.values():
+            try:
+                with replica.engine.connect() as connection:
+                    lag = self._replication_lag(connection)
+            except Exception as exc:
+                replica.lag, replica.error = None, str(exc)
+            else:
+                replica.lag = lag
+                replica.error = None if lag is not None else "replication stopped"
+
+            healthy = replica.lag is not None and replica.lag <= self.max_lag
+            if healthy != replica.healthy:
+                logger.info(
+                    "replica %s %s (lag=%s, error=%s)",
+                    replica.bind, "healthy" if healthy else "unhealthy", replica.lag, replica.error,
+                )
+            replica.healthy = healthy
+
+    def stats(self):
+        return {replica.bind: replica.stats() for replica in self._replicas.values()}
+
+    def has_replicas(self):
+        return bool(self._replicas)
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy sesija koja za @read_only zahteve bira engine replike."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        # zadat bind ili UPDATE/DELETE/INSERT naredba ostaju na primarnoj
+        if bind is not None or (clause is not None and clause.is_dml):
+            return engine
+        return replica_router.route(engine, self)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _remember_bulk_write(orm_execute_state):
+    # Query.update()/delete() i session.execute(update(...)) ne idu kroz flush,
+    # npr. istekao pokusaj na /submit koji zavrsava expire_attempts
+    if has_request_context() and (
+        orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert
+    ):
+        g.db_wrote = True
+
+
+def _identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None  # zahtev bez JWT-a
+
+
+def read_only(view):
+    """Oznaci GET handler cija citanja smeju da idu na repliku (ide ispod @jwt_required)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        identity = _identity()
+        g.db_read_only = True
+        g.db_sticky = identity is not None and replica_router.is_sticky(identity)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def use_primary():
+    """Upiti unutar bloka idu na primarnu bazu i u @read_only zahtevu."""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get("db_primary", False)
+    g.db_primary = True
+    try:
+        yield
+    finally:
+        g.db_primary = previous
+
+
+def _health_loop(socketio, interval):
+    while True:
+        try:
+            replica_router.check()
+        except Exception:
+            logger.exception("replica health check failed")
+        socketio.sleep(interval)
+
+
+def init_replicas(app, db):
+    replica_router.init_app(app, db)
+
+    @app.after_request
+    def mark_sticky(response):
+        # korisnik koji je upravo upisivao cita sa primarne dok replika ne stigne
+        if g.get("db_wrote"):
+            identity = _identity()
+            if identity is not None:
+                replica_router.mark_write(identity)
+        return response
+
+
+def start_replica_health_check(app):
+    # posle socketio.init_app: pozadinski zadatak trazi inicijalizovan server
+    if replica_router.has_replicas():
+        from app.extensions import socketio
+
+        socketio.start_background_task(_health_loop, socketio, app.config["REPLICA_HEALTH_INTERVAL"])
@@ -0,0 +1,55 @@
+import threading
+
+from cachetools import TTLCache
+
+from app.extensions import db
+from app.models import User
+from app.replicas import use_primary
+
+# User je u USER_DATA bazi, pa nema JOIN-a sa kvizovima; imena se razresavaju
+# jednim IN upitom po seriji i pamte u ogranicenom LRU.
+# TTL ogranicava koliko dugo drugi procesi (radnik) mogu da vide staro ime.
+_names = TTLCache(maxsize=10000, ttl=300)
+_lock = threading.Lock()
+
+# najvise ID-eva u jednom IN (...) upitu
+BATCH_SIZE = 1000
+
+
+def display_name(first_name, last_name):
+    return f"{first_name} {last_name}".strip()
+
+
+def resolve_names(user_ids):
+    """{user_id: ime} za sve postojece korisnike; nepostojeci ID-evi se izostavljaju."""
+    wanted = set(user_ids)
+    names = {}
+    with _lock:
+        for user_id in wanted:
+            name = _names.get(user_id)
+            if name is not None:
+                names[user_id] = name
+
+    missing = sorted(wanted - names.keys())
+    for start in range(0, len(missing), BATCH_SIZE):
+        # imena se kesiraju, pa se citaju sa primarne (v. cache_store._load)
+        with use_primary():
+            rows = (
+                db.session.query(User.id, User.first_name, User.last_name)
+                .filter(User.id.in_(missing[start:start + BATCH_SIZE]))
+                .all()
+            )
+        loaded = {row.id: display_name(row.first_name, row.last_name) for row in rows}
+        with _lock:
+            _names.update(loaded)
+        names.update(loaded)
+    return names
+
+
+def resolve_name(user_id):
+    return resolve_names((user_id,)).get(user_id)
+
+
+def invalidate_user(user_id):
+    with _lock:
+        _names.pop(user_id, None)
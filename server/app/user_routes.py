@@ -5,6 +5,8 @@ from datetime import datetime
 from app.extensions import db
 from app.models import User
 from app.dto import UserDTO
+from app.user_directory import invalidate_user
+from app.replicas import read_only
 
 user_bp = Blueprint("user", __name__, url_prefix="/api/users")
 
@@ -12,6 +14,7 @@ user_bp = Blueprint("user", __name__, url_prefix="/api/users")
 # ---------------- GET MY USER DATA ----------------
 @user_bp.route("/<int:user_id>", methods=["GET"])
 @jwt_required()
+@read_only
 def get_my_user(user_id):
     current_user_id = int(get_jwt_identity())
 
@@ -78,6 +81,7 @@ def update_my_user(user_id):
         user.profile_image = data["profileImage"]
 
     db.session.commit()
+    invalidate_user(user.id)
 
     return jsonify({
         "message": "User updated successfully",
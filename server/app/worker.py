@@ -0,0 +1,40 @@
+# Samostalni radnik za red poslova: isti pool i poller kao u web procesu, bez HTTP servera.
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# .env kao u app.config, ali pre provera ispod: one citaju env pre uvoza aplikacije
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+
+# Kes, generacije tagova (kljuc za bodovanje, rang liste) i invalidacije su uz
+# CACHE_BACKEND=local samo u memoriji procesa: posle rescore-a ovde web proces bi
+# i dalje bodovao starim kljucem. Radnik zato trazi kes deljen sa web procesom.
+if os.getenv("CACHE_BACKEND", "local").lower() != "sqlite":
+    print("❌ app.worker trazi CACHE_BACKEND=sqlite (deljen sa web procesom): uz local kes invalidacije iz radnika ne stizu do web procesa.")
+    sys.exit(1)
+
+# Sweeper isteklih pokusaja salje socket dogadjaje klijentima povezanim na web proces;
+# iz radnika oni stizu samo preko zajednickog message queue-a, pa ga bez njega ne pokrecemo.
+if not os.getenv("SOCKETIO_MESSAGE_QUEUE"):
+    os.environ["EXPIRY_SWEEP_ENABLED"] = "false"
+
+from app.main import app  # monkey_patch, init ekstenzija, scoring_pool i poller
+from app.extensions import socketio
+
+
+def main():
+    if not app.config["JOB_POLLER_ENABLED"]:
+        print("❌ JOB_POLLER_ENABLED je iskljucen, radnik nema sta da radi.")
+        return
+
+    if not app.config["SOCKETIO_MESSAGE_QUEUE"]:
+        print("⚠️ SOCKETIO_MESSAGE_QUEUE nije podesen: rezultati bodovani ovde ne stizu kao socket dogadjaji.")
+    print("✅ Job worker pokrenut, preuzimam poslove iz tabele jobs...")
+    while True:
+        socketio.sleep(60)
+
+
+if __name__ == "__main__":
+    main()
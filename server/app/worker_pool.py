@@ -0,0 +1,119 @@
+import logging
+import queue
+import threading
+import time
+
+from app.extensions import db
+from app.latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """Fiksan broj dugozivecih radnika koji uzimaju poslove iz ogranicenog reda.
+
+    Svaki radnik drzi jedan app context za ceo zivot i posle svakog posla
+    vraca konekciju u pool (db.session.remove()), pa se ne pravi novi proces
+    ni nove konekcije po predaji kviza.
+    """
+
+    def __init__(self, name="scoring"):
+        self.name = name
+        self.app = None
+        self.size = 0
+        self.retry_after = 0
+        self._queue = None
+        self._workers = []
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_times = LatencyWindow()
+        self._run_times = LatencyWindow()
+
+    def init_app(self, app):
+        self.app = app
+        self.size = app.config["SCORING_WORKERS"]
+        self.retry_after = app.config["SCORING_RETRY_AFTER"]
+        self._queue = queue.Queue(maxsize=app.config["SCORING_QUEUE_SIZE"])
+
+        for i in range(self.size):
+            worker = threading.Thread(
+                target=self._run,
+                name=f"{self.name}-worker-{i}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def is_full(self):
+        return self._queue.full()
+
+    def free_slots(self):
+        return self._queue.maxsize - self._queue.qsize()
+
+    def submit(self, function, *args):
+        """Stavi posao u red. Vraca False ako je red pun (backpressure)."""
+        try:
+            self._queue.put_nowait((function, args, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            return False
+
+        with self._lock:
+            self._submitted += 1
+        return True
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                function, args, enqueued_at = self._queue.get()
+                started_at = time.monotonic()
+                with self._lock:
+                    self._busy += 1
+
+                failed = False
+                try:
+                    function(*args)
+                except Exception:
+                    failed = True
+                    logger.exception("%s job %s failed", self.name, function.__name__)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                    finished_at = time.monotonic()
+                    with self._lock:
+                        self._busy -= 1
+                        if failed:
+                            self._failed += 1
+                        else:
+                            self._completed += 1
+                    self._wait_times.add(started_at - enqueued_at)
+                    self._run_times.add(finished_at - started_at)
+                    self._queue.task_done()
+
+    def stats(self):
+        wait_times = self._wait_times.summary()
+        run_times = self._run_times.summary()
+        with self._lock:
+            return {
+                "workers": self.size,
+                "busy": self._busy,
+                "queueDepth": self._queue.qsize() if self._queue else 0,
+                "queueCapacity": self._queue.maxsize if self._queue else 0,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "waitSecondsP50": wait_times["p50"],
+                "waitSecondsP95": wait_times["p95"],
+                "runSecondsP50": run_times["p50"],
+                "runSecondsP95": run_times["p95"],
+                "runSecondsMax": run_times["max"],
+            }
+
+
+scoring_pool = WorkerPool("scoring")
@@ -0,0 +1,93 @@
+"""Ponovno bodovanje celog kviza: petlja po pokusaju naspram batch_scoring matrice.
+
+    cd server && python -m bench.batch_scoring [--attempts 100000] [--questions 20]
+
+Radi nad SQLite datotekama u privremenom direktorijumu (tests/support.py).
+Bodovanje se meri nad vec procitanim redovima; citanje i upis su posebni redovi,
+jer su na SQLite-u skuplji od samog bodovanja.
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from app.answer_key import build_answer_key
+from app.answer_store import pack_masks, unpack_masks, load_quiz_answer_rows
+from app.batch_scoring import mask_matrix, rescore_quiz, score_masks
+from app.extensions import db
+from app.models import AnswerOption, AttemptAnswers, Question, Quiz, QuizAttempt
+from tests.support import sqlite_app
+
+OPTIONS = 4
+
+
+def seed(attempts, questions):
+    quiz = Quiz(title="Bench", duration_seconds=600, status="APPROVED", author_id=1, version=1)
+    for number in range(questions):
+        question = Question(quiz=quiz, text=f"Q{number}", points=1 + number % 3)
+        for option in range(OPTIONS):
+            question.answers.append(AnswerOption(text=f"A{option}", is_correct=option == 0))
+    db.session.add(quiz)
+    db.session.commit()
+
+    key = build_answer_key(quiz.id)
+    question_ids = list(key.questions)
+    rng = random.Random(1)
+
+    db.session.execute(QuizAttempt.__table__.insert(), [
+        {"quiz_id": quiz.id, "player_id": player, "quiz_version": 1, "score": 0,
+         "state": "SCORED", "started_at": quiz.created_at, "finished_at": quiz.created_at}
+        for player in range(1, attempts + 1)
+    ])
+    attempt_ids = [row.id for row in db.session.query(QuizAttempt.id).filter_by(quiz_id=quiz.id)]
+    db.session.execute(AttemptAnswers.__table__.insert(), [
+        {"attempt_id": attempt_id, "quiz_id": quiz.id, "answers": pack_masks({
+            qid: 1 << rng.randrange(OPTIONS) for qid in question_ids if rng.random() < 0.9
+        })}
+        for attempt_id in attempt_ids
+    ])
+    db.session.commit()
+    return quiz.id
+
+
+def per_attempt(key, rows):
+    return {attempt_id: key.score(unpack_masks(answers)) for attempt_id, answers in rows}
+
+
+def vectorized(key, rows):
+    question_ids = [qid for qid, question in key.questions.items() if question.bits]
+    attempt_ids, masks = mask_matrix(rows, question_ids)
+    scores = score_masks(key, question_ids, masks)
+    return dict(zip(attempt_ids.tolist(), scores.tolist()))
+
+
+def timed(label, attempts, function, *args):
+    started_at = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started_at
+    print(f"{label:<28} {elapsed:8.3f} s  {attempts / elapsed:12,.0f} attempts/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=100_000)
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = sqlite_app(directory)
+        with app.app_context():
+            quiz_id = seed(args.attempts, args.questions)
+            print(f"{args.attempts} attempts x {args.questions} questions x {OPTIONS} options")
+
+            key = build_answer_key(quiz_id)
+            rows = timed("load attempt_answers", args.attempts, load_quiz_answer_rows, quiz_id)
+            expected = timed("per-attempt loop (score)", args.attempts, per_attempt, key, rows)
+            scores = timed("matrix (score)", args.attempts, vectorized, key, rows)
+            assert scores == expected
+            timed("rescore_quiz (score+write)", args.attempts, rescore_quiz, quiz_id)
+
+
+if __name__ == "__main__":
+    main()
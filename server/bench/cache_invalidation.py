@@ -0,0 +1,101 @@
+"""Invalidacija kesa sa 10k kljuceva: stari prefix scan naspram generacija tagova.
+
+    cd server && python -m bench.cache_invalidation [--keys 10000] [--rounds 200]
+
+baseline je invalidate_prefix iz vremena pre tagova (kopija i prolaz kroz sve
+kljuceve); ostalo ide kroz app.cache_store sa local i sqlite backend-om.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from cachetools import TTLCache
+from flask import Flask
+
+from app import cache_store
+from app.cache_store import cache_get, cache_key, cache_set, invalidate_tags, quiz_tag
+from app.config import Config
+
+KEYS_PER_QUIZ = 10
+
+
+def keys(count):
+    for number in range(count):
+        quiz_id = number // KEYS_PER_QUIZ
+        yield quiz_id, cache_key("quiz", quiz_id, "details", number % KEYS_PER_QUIZ)
+
+
+# ---------------- BASELINE ----------------
+class PrefixCache:
+    def __init__(self, maxsize):
+        self.cache = TTLCache(maxsize=maxsize, ttl=600)
+        self._lock = threading.Lock()
+
+    def set(self, key, value):
+        with self._lock:
+            self.cache[key] = value
+
+    def get(self, key):
+        with self._lock:
+            return self.cache.get(key)
+
+    def invalidate_prefix(self, prefix):
+        keys = [k for k in list(self.cache.keys()) if str(k).startswith(prefix)]
+        for k in keys:
+            self.cache.pop(k, None)
+
+
+def timed(label, rounds, function):
+    started_at = time.perf_counter()
+    for number in range(rounds):
+        function(number)
+    per_call = (time.perf_counter() - started_at) / rounds
+    print(f"{label:<36} {per_call * 1e6:12.2f} us/call")
+
+
+def run_baseline(count, rounds):
+    cache = PrefixCache(count * 2)
+    for quiz_id, key in keys(count):
+        cache.set(key, {"id": quiz_id})
+    # ":" na kraju, inace quiz:1 brise i quiz:10..19
+    timed("baseline invalidate_prefix", rounds, lambda n: cache.invalidate_prefix(f"quiz:{n}:"))
+    timed("baseline get", rounds, lambda n: cache.get(cache_key("quiz", rounds + n, "details", 0)))
+
+
+def run_tags(backend, count, rounds, directory):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        CACHE_BACKEND=backend,
+        CACHE_SQLITE_PATH=os.path.join(directory, "cache.sqlite3"),
+        CACHE_MAXSIZE=count * 2,
+        CACHE_TTL=600,
+    )
+    cache_store.init_cache(app)
+    for quiz_id, key in keys(count):
+        cache_set(key, {"id": quiz_id}, tags=(quiz_tag(quiz_id),))
+
+    timed(f"{backend} invalidate_tags", rounds, lambda n: invalidate_tags(quiz_tag(n)))
+    timed(f"{backend} get (valid entry)", rounds, lambda n: cache_get(cache_key("quiz", rounds + n, "details", 0)))
+    timed(f"{backend} get (invalidated entry)", rounds, lambda n: cache_get(cache_key("quiz", n, "details", 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    if args.rounds * 2 * KEYS_PER_QUIZ > args.keys:
+        parser.error("--keys must cover 2 * rounds quizzes")
+
+    print(f"{args.keys} keys, {KEYS_PER_QUIZ} per quiz")
+    run_baseline(args.keys, args.rounds)
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in ("local", "sqlite"):
+            run_tags(backend, args.keys, args.rounds, directory)
+
+
+if __name__ == "__main__":
+    main()
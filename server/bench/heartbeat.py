@@ -0,0 +1,115 @@
+"""Heartbeat preko socket-a dok traje spor upit, po DB_DRIVER_MODE (pure/tpool/native).
+
+    docker compose up -d db
+    cd server && python -m bench.heartbeat [--mode pure] [--sleep 5] [--interval 0.1]
+
+Trazi MySQL iz app.config. Bez --mode pokrece svaki nacin u posebnom procesu
+(DB_DRIVER_MODE se cita pri uvozu app.db_engine) i ispisuje rezultate redom.
+
+U procesu je, kao u app.main, eventlet.monkey_patch(); green echo server na
+localhost-u glumi Socket.IO, a klijent mu salje ping na svakih --interval
+sekundi i meri povratno vreme. Za to vreme drugi green thread radi
+SELECT SLEEP(--sleep) kroz pool. Ako drajver blokira hub (native), pingovi
+stoje dok upit ne zavrsi: najveci razmak je oko --sleep sekundi. Sa pure i
+tpool razmak ostaje blizu --interval.
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+MODES = ("pure", "tpool", "native")
+
+
+def run(mode, sleep_seconds, interval):
+    # DB_DRIVER_MODE se cita pri uvozu app.db_engine, pa se app uvozi tek ovde
+    os.environ["DB_DRIVER_MODE"] = mode
+
+    from flask import Flask
+    from sqlalchemy import text
+
+    from app.config import Config
+    from app.db_engine import init_driver_mode
+    from app.extensions import db
+    from app.latency import percentile
+
+    app = Flask("heartbeat")
+    app.config.from_object(Config)
+    db.init_app(app)
+    init_driver_mode(app, db)
+
+    def echo(connection):
+        with connection:
+            while data := connection.recv(64):
+                connection.sendall(data)
+
+    def accept(server):
+        while True:
+            connection, _ = server.accept()
+            eventlet.spawn_n(echo, connection)
+
+    server = eventlet.listen(("127.0.0.1", 0))
+    eventlet.spawn_n(accept, server)
+
+    def slow_query():
+        with app.app_context():
+            try:
+                db.session.execute(text("SELECT SLEEP(:seconds)"), {"seconds": sleep_seconds})
+            finally:
+                db.session.remove()
+
+    # konekcija se otvara pre merenja, da connect ne ulazi u razmake
+    with app.app_context():
+        db.session.execute(text("SELECT 1"))
+        db.session.remove()
+
+    client = eventlet.connect(server.getsockname())
+    round_trips, gaps = [], []
+    query = eventlet.spawn(slow_query)
+    started_at = last_at = time.monotonic()
+    while not query.dead or time.monotonic() - started_at < sleep_seconds:
+        sent_at = time.monotonic()
+        client.sendall(b"ping")
+        client.recv(64)
+        now = time.monotonic()
+        round_trips.append(now - sent_at)
+        gaps.append(now - last_at)
+        last_at = now
+        eventlet.sleep(interval)
+    query.wait()
+    client.close()
+
+    print(
+        f"{mode:6} pings {len(round_trips):4}  "
+        f"rtt p50 {percentile(round_trips, 50) * 1000:7.1f} ms  max {max(round_trips) * 1000:7.1f} ms  "
+        f"gap max {max(gaps) * 1000:7.1f} ms  (interval {interval * 1000:.0f} ms, query {sleep_seconds:.0f} s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=MODES)
+    parser.add_argument("--sleep", type=float, default=5)
+    parser.add_argument("--interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.sleep, args.interval)
+        return 0
+
+    failed = 0
+    for mode in MODES:
+        command = [
+            sys.executable, "-m", "bench.heartbeat",
+            "--mode", mode, "--sleep", str(args.sleep), "--interval", str(args.interval),
+        ]
+        failed |= subprocess.run(command).returncode
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
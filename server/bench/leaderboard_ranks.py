@@ -0,0 +1,101 @@
+"""Mesto igraca i stranica rang liste kviza sa 1M pokusaja, sa podrazumevanom konfiguracijom.
+
+    cd server && python -m bench.leaderboard_ranks [--attempts 1000000] [--lookups 1000]
+
+Radi nad SQLite datotekama u privremenom direktorijumu (tests/support.py).
+LeaderboardStore dobija LEADERBOARD_* iz app.config kao u app.main: lista veca
+od LEADERBOARD_MAX_ROWS (500000) se ne ucitava, nego mesto daje COUNT, okolinu
+igraca citanje indeksa od njegovog reda, a stranicu LIMIT/OFFSET preko
+ix_attempts_quiz_score. Poredjenja radi se meri i
+ista lista u memoriji (max_rows = --attempts), koja sluzi i za proveru rezultata.
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.leaderboard import LeaderboardStore
+from app.models import Quiz, QuizAttempt
+from tests.support import sqlite_app
+
+BATCH = 50_000
+
+
+def seed(attempts):
+    quiz = Quiz(title="Bench", duration_seconds=600, status="APPROVED", author_id=1, version=1)
+    db.session.add(quiz)
+    db.session.commit()
+
+    rng = random.Random(1)
+    started_at = datetime(2024, 1, 1)
+    table = QuizAttempt.__table__
+    for first in range(1, attempts + 1, BATCH):
+        rows = []
+        for player_id in range(first, min(first + BATCH, attempts + 1)):
+            finished_at = started_at + timedelta(seconds=rng.randrange(600))
+            rows.append({
+                "quiz_id": quiz.id, "player_id": player_id, "quiz_version": 1, "state": "SCORED",
+                "score": rng.randrange(101), "started_at": started_at,
+                "finished_at": finished_at, "scored_at": finished_at,
+            })
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+    return quiz.id
+
+
+def timed(label, function, players):
+    started_at = time.perf_counter()
+    ranks = [function(player_id) for player_id in players]
+    per_call = (time.perf_counter() - started_at) / len(players)
+    print(f"{label:<34} {per_call * 1e6:12.1f} us/lookup")
+    return ranks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attempts", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--sql-lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = sqlite_app(directory)
+        with app.app_context():
+            started_at = time.perf_counter()
+            quiz_id = seed(args.attempts)
+            print(f"{args.attempts} scored attempts, seeded in {time.perf_counter() - started_at:.1f} s")
+
+            store = LeaderboardStore()
+            store.init_app(app)
+            rng = random.Random(2)
+            players = [rng.randrange(1, args.attempts + 1) for _ in range(args.lookups)]
+            sample = players[:args.sql_lookups]
+
+            started_at = time.perf_counter()
+            board = store.get(quiz_id)
+            print(f"{'first store.get (' + type(board).__name__ + ')':<34} {time.perf_counter() - started_at:12.2f} s")
+
+            def window(board, player_id):
+                return board.around_player(player_id, 5)
+
+            print(f"default config, LEADERBOARD_MAX_ROWS={app.config['LEADERBOARD_MAX_ROWS']}:")
+            ranks = timed("  store.get + rank_of_player", lambda p: store.get(quiz_id).rank_of_player(p), sample)
+            windows = timed("  store.get + around_player (+-5)", lambda p: window(store.get(quiz_id), p), sample)
+            timed("  store.get + page at rank 900000", lambda p: store.get(quiz_id).window(899_999, 900_049),
+                  sample[:10])
+
+            memory_store = LeaderboardStore(max_rows=args.attempts)
+            started_at = time.perf_counter()
+            memory = memory_store.get(quiz_id)
+            print(f"in memory, max_rows={args.attempts}:")
+            print(f"{'  hydrate (one query + sort)':<34} {time.perf_counter() - started_at:12.2f} s")
+            memory_ranks = timed("  SortedList rank_of_player", memory.rank_of_player, players)
+            memory_windows = timed("  SortedList around_player (+-5)", lambda p: window(memory, p), players)
+
+            assert ranks == memory_ranks[:len(sample)]
+            assert windows == memory_windows[:len(sample)]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""500 green thread-ova istovremeno nad pool-om konekcija: nijedan "QueuePool limit" timeout.
+
+    docker compose up -d db
+    cd server && python -m bench.pool_load [--threads 500] [--requests 20] [--query-seconds 0.02]
+
+Trazi MySQL iz app.config (DB_HOST/DB_PORT/..., pool po bind-u iz USER_DB_* /
+QUIZ_DB_* / DB_*); SQLite ne pusta green thread-ove dok ceka, pa ovde nije
+merodavan. Kao u app.main: eventlet.monkey_patch() i DB_DRIVER_MODE.
+
+Svaki thread radi --requests "zahteva": app context, SELECT SLEEP(n) na oba
+bind-a naizmenicno (konekcija je zauzeta dok upit traje), pa db.session.remove()
+kao na kraju Flask zahteva. Izlazni kod je 1 ako je bilo koji checkout istekao.
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import sys
+import time
+
+from flask import Flask
+from sqlalchemy import exc, text
+
+from app.config import Config
+from app.db_engine import DRIVER_MODE, init_driver_mode, init_pool_metrics, pool_stats
+from app.extensions import db
+from app.latency import percentile
+
+
+def make_app():
+    app = Flask("pool_load")
+    app.config.from_object(Config)
+    db.init_app(app)
+    init_driver_mode(app, db)
+    init_pool_metrics(app, db)
+    return app
+
+
+def client(app, number, requests, query_seconds, latencies, errors):
+    for request_number in range(requests):
+        bind = "user_data" if (number + request_number) % 2 else "quiz_data"
+        started_at = time.monotonic()
+        with app.app_context():
+            try:
+                db.session.execute(
+                    text("SELECT SLEEP(:seconds)"),
+                    {"seconds": query_seconds},
+                    bind_arguments={"bind": db.engines[bind]},
+                )
+            except exc.TimeoutError:
+                errors.append("timeout")
+            except Exception as error:
+                errors.append(type(error).__name__)
+            finally:
+                db.session.remove()
+        latencies.append(time.monotonic() - started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--query-seconds", type=float, default=0.02)
+    args = parser.parse_args()
+
+    app = make_app()
+    latencies, errors = [], []
+
+    pool = eventlet.GreenPool(args.threads)
+    started_at = time.monotonic()
+    for number in range(args.threads):
+        pool.spawn_n(client, app, number, args.requests, args.query_seconds, latencies, errors)
+    pool.waitall()
+    elapsed = time.monotonic() - started_at
+
+    print(f"driver mode: {DRIVER_MODE}")
+    print(f"{args.threads} green threads x {args.requests} requests in {elapsed:.1f} s")
+    print(f"request p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+          f"p95 {percentile(latencies, 95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    for name, stats in pool_stats().items():
+        print(
+            f"{name:10} size {stats['size']} overflow {stats['overflow']} "
+            f"checkouts {stats['checkouts']} timeouts {stats['timeouts']} "
+            f"wait p95 {(stats['waitSecondsP95'] or 0) * 1000:.0f} ms, max {(stats['waitSecondsMax'] or 0) * 1000:.0f} ms"
+        )
+
+    timeouts = errors.count("timeout")
+    other = sorted({name for name in errors if name != "timeout"})
+    print(f"QueuePool timeouts: {timeouts}, other errors: {len(errors) - timeouts} {other or ''}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Uvoz kviza sa 500 pitanja: stari upis sa flush-om po pitanju naspram insert_questions.
+
+    cd server && python -m bench.quiz_import [--questions 500] [--answers 4] [--rounds 5]
+
+baseline - petlja iz create_quiz pre quiz_payload-a: Question + flush po pitanju,
+           pa AnswerOption objekti, jedan commit
+current  - POST /api/quizzes (parse_quiz_payload + insert_questions)
+
+Na SQLite-u naredbe ne idu preko mreze; na MySQL-u svaka naredba je jedan
+round trip, pa je broj naredbi bitniji od vremena ovde.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from app.extensions import db
+from app.models import AnswerOption, Question, Quiz
+from tests.support import api_app, auth_header, count_queries
+
+
+def payload(questions, answers):
+    return {
+        "title": "Bench",
+        "durationSeconds": 600,
+        "questions": [
+            {
+                "text": f"Question {number}",
+                "points": 1 + number % 3,
+                "answers": [{"text": f"Answer {option}", "isCorrect": option == 0} for option in range(answers)],
+            }
+            for number in range(questions)
+        ],
+    }
+
+
+def baseline_import(data, author_id):
+    quiz = Quiz(title=data["title"], duration_seconds=data["durationSeconds"], author_id=author_id, status="PENDING")
+    db.session.add(quiz)
+    db.session.flush()
+
+    for q in data["questions"]:
+        question = Question(quiz_id=quiz.id, text=q["text"].strip(), points=q["points"])
+        db.session.add(question)
+        db.session.flush()
+        for a in q["answers"]:
+            db.session.add(AnswerOption(question_id=question.id, text=a["text"].strip(), is_correct=a["isCorrect"]))
+    db.session.commit()
+    return quiz.id
+
+
+def current_import(client, data, headers):
+    response = client.post("/api/quizzes", json=data, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()["id"]
+
+
+def measure(label, rounds, function):
+    times, statements = [], 0
+    for _ in range(rounds):
+        with count_queries(db.engines["quiz_data"]) as executed:
+            started_at = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - started_at)
+        statements = len(executed)
+        db.session.remove()
+    print(f"{label:<10} p50 {statistics.median(times) * 1000:8.1f} ms   {statements:5d} statements on quiz_data")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=500)
+    parser.add_argument("--answers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    data = payload(args.questions, args.answers)
+    with tempfile.TemporaryDirectory() as directory:
+        app = api_app(directory)
+        client = app.test_client()
+        with app.app_context():
+            headers = auth_header(1, role="MODERATOR")
+            print(f"{args.questions} questions x {args.answers} answers, SQLite")
+            measure("baseline", args.rounds, lambda: baseline_import(data, 1))
+            measure("current", args.rounds, lambda: current_import(client, data, headers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Vreme od predaje kviza do upisanog rezultata (p50/p95): stara putanja naspram nove.
+
+    cd server && python -m bench.submit_latency [--submissions 50] [--baseline-delay 2]
+
+baseline - putanja pre SCORING_MODE-a: validacija kroz lazy relacije, commit, pa
+           fork procesa koji spava --baseline-delay sekundi, boduje kroz lazy
+           relacije i upisuje rezultat
+inline   - POST /submit sa SCORING_MODE=inline; rezultat je u odgovoru
+async    - POST /submit sa SCORING_MODE=async; posao iz reda u scoring_pool-u
+
+Rezultat je "stigao" kad je upisan: za baseline kad dete proces commit-uje,
+za novu putanju kad se pozove publish_result. Predaje idu jedna po jedna.
+"""
+import argparse
+import multiprocessing
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from app import quiz_processing, quiz_routes
+from app.extensions import db
+from app.latency import percentile
+from app.models import AnswerOption, Question, Quiz, QuizAttempt
+from app.worker_pool import scoring_pool
+from tests.support import api_app, auth_header
+
+QUESTIONS = 20
+OPTIONS = 4
+
+
+def seed():
+    quiz = Quiz(title="Bench", duration_seconds=3600, status="APPROVED", author_id=1, version=1)
+    for number in range(QUESTIONS):
+        question = Question(quiz=quiz, text=f"Q{number}", points=1)
+        for option in range(OPTIONS):
+            question.answers.append(AnswerOption(text=f"A{option}", is_correct=option == 0))
+    db.session.add(quiz)
+    db.session.commit()
+    answers = [{"questionId": q.id, "answerIds": [q.answers[0].id]} for q in quiz.questions]
+    return quiz.id, answers
+
+
+# ---------------- BASELINE ----------------
+def _baseline_score(app, quiz_id, attempt_id, submitted_answers, delay, results):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)  # konekcije roditelja ne koristimo posle fork-a
+        time.sleep(delay)
+
+        quiz = db.session.get(Quiz, quiz_id)
+        attempt = db.session.get(QuizAttempt, attempt_id)
+        submitted = {item["questionId"]: set(item["answerIds"]) for item in submitted_answers}
+        score = 0
+        for question in quiz.questions:
+            chosen = submitted.get(question.id)
+            if chosen and chosen == {a.id for a in question.answers if a.is_correct}:
+                score += question.points or 0
+        attempt.score = score
+        db.session.commit()
+        results.put((attempt_id, time.time()))
+
+
+def baseline_submit(app, quiz_id, player_id, answers, delay, results):
+    started_at = time.time()
+    quiz = db.session.get(Quiz, quiz_id)
+    attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, player_id=player_id).first()
+
+    submitted = {item["questionId"]: set(item["answerIds"]) for item in answers}
+    for question in quiz.questions:
+        chosen = submitted.get(question.id)
+        if chosen and not chosen.issubset({a.id for a in question.answers}):
+            raise ValueError("invalid answers")
+
+    attempt.finished_at = datetime.utcnow()
+    attempt.score = None
+    db.session.commit()
+
+    process = multiprocessing.get_context("fork").Process(
+        target=_baseline_score,
+        args=(app, quiz_id, attempt.id, answers, delay, results),
+        daemon=True,
+    )
+    process.start()
+    attempt_id, scored_at = results.get()
+    process.join()
+    return scored_at - started_at
+
+
+def run_baseline(app, client, quiz_id, answers, submissions, delay, first_player):
+    results = multiprocessing.get_context("fork").Queue()
+    latencies = []
+    for player_id in range(first_player, first_player + submissions):
+        client.post(f"/api/quizzes/{quiz_id}/start", headers=auth_header(player_id))
+        latencies.append(baseline_submit(app, quiz_id, player_id, answers, delay, results))
+        db.session.remove()
+    return latencies
+
+
+# ---------------- NOVA PUTANJA ----------------
+def run_current(app, client, quiz_id, answers, submissions, mode, first_player):
+    app.config["SCORING_MODE"] = mode
+    latencies = []
+    for player_id in range(first_player, first_player + submissions):
+        headers = auth_header(player_id)
+        client.post(f"/api/quizzes/{quiz_id}/start", headers=headers)
+
+        published.clear()
+        started_at = time.time()
+        response = client.post(f"/api/quizzes/{quiz_id}/submit", json={"answers": answers}, headers=headers)
+        assert response.status_code in (200, 202), response.get_json()
+        if not published.wait(10):
+            raise RuntimeError(f"no result for player {player_id}")
+        latencies.append(published.at - started_at)
+    return latencies
+
+
+class _Published(threading.Event):
+    at = None
+
+
+published = _Published()
+
+
+def _publish_result(publish):
+    def wrapper(quiz, attempt, score):
+        published.at = time.time()
+        publish(quiz, attempt, score)
+        published.set()
+    return wrapper
+
+
+def report(label, latencies):
+    p50 = percentile(latencies, 50) * 1000
+    p95 = percentile(latencies, 95) * 1000
+    print(f"{label:<28} n={len(latencies):<4} p50 {p50:9.1f} ms   p95 {p95:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=50)
+    parser.add_argument("--baseline-submissions", type=int, default=10)
+    parser.add_argument("--baseline-delay", type=float, default=2.0)  # time.sleep(2) iz stare putanje
+    args = parser.parse_args()
+
+    wrapped = _publish_result(quiz_processing.publish_result)
+    quiz_processing.publish_result = quiz_routes.publish_result = wrapped
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = api_app(directory, SCORING_SIMULATED_DELAY=0, SCORING_WORKERS=2)
+        scoring_pool.init_app(app)
+        client = app.test_client()
+        with app.app_context():
+            quiz_id, answers = seed()
+            print(f"{QUESTIONS} questions x {OPTIONS} options, SQLite, one submission at a time")
+
+            player = 1
+            for label, delay in ((f"baseline (sleep {args.baseline_delay:g}s)", args.baseline_delay),
+                                 ("baseline (sleep 0)", 0)):
+                report(label, run_baseline(app, client, quiz_id, answers, args.baseline_submissions, delay, player))
+                player += args.baseline_submissions
+
+            for mode in ("inline", "async"):
+                report(mode, run_current(app, client, quiz_id, answers, args.submissions, mode, player))
+                player += args.submissions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import pytest
+
+from app import answer_key, user_directory
+from app.extensions import db
+from tests.support import api_app, sqlite_app
+
+
+@pytest.fixture(autouse=True)
+def _clear_module_caches():
+    # kljucevi i imena se pamte po ID-u u modulu, a svaki test ima svoje baze
+    answer_key._keys.clear()
+    user_directory._names.clear()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = sqlite_app(tmp_path)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def api(tmp_path):
+    app = api_app(tmp_path)
+    with app.app_context():
+        yield app
+        db.session.remove()
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+
+from flask import Flask
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import Function
+
+from app.cache_store import init_cache
+from app.config import Config
+from app.extensions import db, jwt, socketio
+from app.leaderboard import leaderboards
+
+# Zajednicko za testove i bench/ skripte: aplikacija nad SQLite datotekama
+# umesto MySQL-a, sa istim modelima, bind-ovima i sesijom.
+
+
+@compiles(Function, "sqlite")
+def _sqlite_function(element, compiler, **kw):
+    # TIMESTAMPADD(SECOND, n, col) iz ruta kviza; SQLite ga nema
+    if element.name.lower() != "timestampadd":
+        return compiler.visit_function(element, **kw)
+    _, seconds, column = element.clauses
+    return "datetime(%s, '+' || (%s) || ' seconds')" % (
+        compiler.process(column, **kw), compiler.process(seconds, **kw)
+    )
+
+
+def sqlite_app(directory, **config):
+    """Flask app sa user_data i quiz_data u dve SQLite datoteke u `directory`; seme su napravljene."""
+    app = Flask("tests")
+    app.config.from_object(Config)
+
+    user_url = f"sqlite:///{directory}/user_data.sqlite3"
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=user_url,
+        SQLALCHEMY_BINDS={
+            "user_data": user_url,
+            "quiz_data": f"sqlite:///{directory}/quiz_data.sqlite3",
+        },
+        SQLALCHEMY_ENGINE_OPTIONS={},
+    )
+    app.config.update(config)
+
+    db.init_app(app)
+    init_cache(app)  # svaki test dobija prazan lokalni kes
+    leaderboards.init_app(app)  # i prazne rang liste
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def api_app(directory, **config):
+    """sqlite_app sa JWT-om, Socket.IO-om i blueprint-om kvizova, kao u app.main (bez pozadinskih niti)."""
+    from app import jwt_list, quiz_processing  # noqa: F401 - jwt callbacks i job handleri
+    from app.quiz_routes import quiz_bp
+    from app.replicas import init_replicas
+
+    app = sqlite_app(directory, JWT_SECRET_KEY="tests-jwt-secret-0123456789abcdef", SECRET_KEY="tests", **config)
+    init_replicas(app, db)
+    jwt.init_app(app)
+    socketio.init_app(app)
+    app.register_blueprint(quiz_bp)
+    return app
+
+
+def auth_header(user_id, role="PLAYER"):
+    token = create_access_token(identity=str(user_id), additional_claims={"role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def count_queries(engine):
+    """SQL naredbe izvrsene na engine-u unutar bloka, redom."""
+    statements = []
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,161 @@
+import multiprocessing
+import threading
+import time
+
+from app import cache_store
+from app.cache_metrics import cache_metrics
+from app.cache_store import (
+    SqliteCacheBackend, cache_get, cache_get_or_load, cache_set, invalidate_tags, leaderboard_tag, quiz_tag,
+)
+from app.extensions import socketio
+from tests.support import api_app
+
+BUMPS = 200
+
+
+def _bump_tags(path, tags, rounds):
+    backend = SqliteCacheBackend(path)
+    for _ in range(rounds):
+        backend.bump(tags)
+
+
+def _fill(path, key, value):
+    SqliteCacheBackend(path).set(key, value)
+
+
+def _run(target, *args, processes=1):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=target, args=args) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+
+def test_sqlite_backend_shares_entries_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SqliteCacheBackend(path)
+
+    _run(_fill, path, "quiz:1:details", ("value", (("quiz:1", 0),), 0.0))
+    assert backend.get("quiz:1:details") == ("value", (("quiz:1", 0),), 0.0)
+
+    backend.delete("quiz:1:details")
+    assert SqliteCacheBackend(path).get("quiz:1:details") is None
+
+
+def test_sqlite_backend_counts_concurrent_bumps_from_all_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SqliteCacheBackend(path)
+    backend.bump(["quiz:1"])
+
+    # generacija se uvecava u bazi, pa se istovremeni upisi iz vise procesa ne gube
+    _run(_bump_tags, path, ["quiz:1", "quiz:2"], BUMPS, processes=4)
+    assert backend.generations(["quiz:1", "quiz:2", "quiz:3"]) == {
+        "quiz:1": 1 + 4 * BUMPS,
+        "quiz:2": 4 * BUMPS,
+        "quiz:3": 0,
+    }
+
+
+def test_invalidations_are_counted_on_key_families(app):
+    def counters(family):
+        return cache_metrics.snapshot().get(family) or {"invalidations": 0, "misses": 0}
+
+    before = counters("quiz:*:details:PLAYER")
+    cache_set("quiz:7:details:PLAYER", {"id": 7}, tags=(quiz_tag(7),))
+    cache_set("quiz:7:leaderboard", [], tags=(quiz_tag(7), leaderboard_tag(7)))
+
+    invalidate_tags(quiz_tag(7))
+    assert cache_get("quiz:7:details:PLAYER") is None
+
+    after = counters("quiz:*:details:PLAYER")
+    assert after["invalidations"] - before["invalidations"] == 1
+    assert after["misses"] - before["misses"] == 1
+    assert "quiz:*" not in cache_metrics.snapshot()  # tag nije familija kljuceva
+
+
+# ---------------- SINGLE-FLIGHT ----------------
+WAITERS = 10
+
+
+def _concurrent(call, count=WAITERS):
+    """Pokrene `call` u `count` niti; vraca (rezultati, greske)."""
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(call())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _gated_loader(outcome):
+    """Loader koji ceka `release` pre nego sto vrati (ili baci) `outcome`."""
+    calls, release = [], threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(10)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return loader, calls, release
+
+
+def test_concurrent_misses_run_loader_once(app):
+    loader, calls, release = _gated_loader({"id": 1})
+    threads, results, errors = _concurrent(lambda: cache_get_or_load("quiz:1:details", loader))
+
+    time.sleep(0.2)  # svi pozivaoci su stigli do kesa i cekaju vodju
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
+    assert calls == [1]
+    assert results == [{"id": 1}] * WAITERS
+
+
+def test_leader_error_reaches_all_waiters(app):
+    failure = RuntimeError("database is down")
+    loader, calls, release = _gated_loader(failure)
+    threads, results, errors = _concurrent(lambda: cache_get_or_load("quiz:1:details", loader))
+
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert calls == [1]
+    assert results == []
+    assert errors == [failure] * WAITERS
+    assert cache_store._flights == {}  # sledeci promasaj ponovo ucitava
+
+
+def test_stale_hits_start_one_background_refresh(tmp_path):
+    # CACHE_TTL=0: unos je odmah zastareo, ali se sluzi jos CACHE_STALE_TTL sekundi
+    app = api_app(tmp_path, CACHE_TTL=0, CACHE_STALE_TTL=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    with app.app_context():
+        cache_set("quiz:1:details", 0, tags=(quiz_tag(1),))
+
+        # pozadinski zadatak (eventlet) ne krece dok ova nit ne pusti hub
+        assert [cache_get_or_load("quiz:1:details", loader) for _ in range(5)] == [0] * 5
+        assert calls == []
+
+        for _ in range(3):
+            socketio.sleep(0)
+        assert calls == [1]
+        assert cache_get_or_load("quiz:1:details", loader) == 1
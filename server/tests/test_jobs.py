@@ -0,0 +1,48 @@
+import time
+from datetime import datetime, timedelta
+
+from app import jobs
+from app.extensions import db
+from app.models import Job
+
+
+def test_superseded_claim_cannot_finish_job(app):
+    job_id = jobs.enqueue_job("test.noop", {})
+    db.session.commit()
+    [first] = jobs.claim_jobs(job_id=job_id)
+
+    # lease prvog preuzimanja istekao; isti proces preuzima posao ponovo
+    Job.query.filter_by(id=job_id).update({"locked_until": datetime.utcnow() - timedelta(minutes=1)})
+    db.session.commit()
+    [second] = jobs.claim_jobs(job_id=job_id)
+    assert first.token != second.token
+
+    jobs._finish_job(first, "DONE")
+    db.session.expire_all()
+    assert db.session.get(Job, job_id).status == "RUNNING"
+
+    jobs._finish_job(second, "DONE")
+    db.session.expire_all()
+    assert db.session.get(Job, job_id).status == "DONE"
+
+
+def test_long_job_keeps_its_lease(app, monkeypatch):
+    app.config["JOB_LEASE_SECONDS"] = 1
+    reclaimed = []
+
+    def slow_job():
+        time.sleep(1.6)
+        # lease bi bez produzavanja vec istekao
+        reclaimed.extend(jobs.claim_jobs(limit=5))
+        db.session.rollback()
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "test.slow", slow_job)
+    job_id = jobs.enqueue_job("test.slow", {})
+    db.session.commit()
+
+    jobs.process_job(job_id)
+
+    assert reclaimed == []
+    db.session.expire_all()
+    job = db.session.get(Job, job_id)
+    assert (job.status, job.attempts) == ("DONE", 1)
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cache_store import invalidate_tags, leaderboard_tag
+from app.extensions import db
+from app.leaderboard import LeaderboardStore, SqlLeaderboard, leaderboards
+from app.models import Quiz, QuizAttempt
+from tests.support import api_app, auth_header
+
+
+def _quiz_with_scores(*scores):
+    quiz = Quiz(title="Quiz", duration_seconds=60, status="APPROVED", author_id=1)
+    db.session.add(quiz)
+    db.session.flush()
+    started_at = datetime.utcnow() - timedelta(minutes=5)
+    for player_id, score in enumerate(scores, start=1):
+        db.session.add(_scored(quiz.id, player_id, score, started_at))
+    db.session.commit()
+    return quiz.id
+
+
+def _scored(quiz_id, player_id, score, started_at, scored_at=None):
+    return QuizAttempt(
+        quiz_id=quiz_id, player_id=player_id, state="SCORED", score=score,
+        started_at=started_at, finished_at=started_at + timedelta(seconds=30),
+        scored_at=scored_at or started_at + timedelta(seconds=30),
+    )
+
+
+def _scores(board):
+    return [row[2] for row in board.top(50)]
+
+
+def test_changes_from_other_processes_are_caught_up_without_full_reload(app, monkeypatch):
+    store = LeaderboardStore()
+    quiz_id = _quiz_with_scores(5, 3, 1)
+    assert _scores(store.get(quiz_id)) == [5, 3, 1]
+
+    # drugi proces boduje novi pokusaj i javi to kroz generaciju taga
+    db.session.add(_scored(quiz_id, 9, 4, datetime.utcnow(), scored_at=datetime.utcnow()))
+    db.session.commit()
+    invalidate_tags(leaderboard_tag(quiz_id))
+
+    monkeypatch.setattr(store, "_hydrate", pytest.fail)
+    board = store.get(quiz_id)
+    assert _scores(board) == [5, 4, 3, 1]
+    assert board.rank_of_player(9) == 1
+
+
+def test_boards_are_capped_by_total_rows(app):
+    store = LeaderboardStore(max_boards=10, max_rows=5)
+    first, second, large = _quiz_with_scores(1, 2, 3), _quiz_with_scores(4, 5, 6), _quiz_with_scores(*range(6))
+
+    store.get(first)
+    store.get(second)
+    assert store.stats()["rows"] == 3  # prva lista je izbacena da bi stala druga
+
+    # lista veca od celog ogranicenja se ne ucitava, nego se cita upitima
+    assert len(store.get(large)) == 6
+    assert store.stats() == {"boards": 1, "rows": 3, "maxRows": 5}
+
+
+def test_old_board_catches_up_without_generation_change(app):
+    # sa lokalnim kes backend-om upis drugog procesa ne menja generaciju koju ovaj proces vidi
+    store = LeaderboardStore(max_age=60)
+    quiz_id = _quiz_with_scores(5, 3, 1)
+    board = store.get(quiz_id)
+
+    db.session.add(_scored(quiz_id, 9, 4, datetime.utcnow(), scored_at=datetime.utcnow()))
+    db.session.commit()
+    assert _scores(store.get(quiz_id)) == [5, 3, 1]
+
+    board.checked_at -= 60
+    assert _scores(store.get(quiz_id)) == [5, 4, 3, 1]
+    assert store.get(quiz_id) is board
+
+
+def test_large_board_answers_from_sql_like_memory(app, monkeypatch):
+    # isti bodovi i isto vreme zavrsetka: redosled razresava attempt_id
+    started_at = datetime.utcnow() - timedelta(minutes=5)
+    quiz_id = _quiz_with_scores(3, 7, 3, 5, 7, 3, 0)
+    db.session.add(_scored(quiz_id, 8, 5, started_at - timedelta(seconds=10)))
+    db.session.add(_scored(quiz_id, 9, 3, started_at))
+    db.session.commit()
+    memory = LeaderboardStore().get(quiz_id)
+
+    store = LeaderboardStore(max_rows=5)
+    monkeypatch.setattr(store, "_hydrate", pytest.fail)
+    board = store.get(quiz_id)
+    assert isinstance(board, SqlLeaderboard)
+    assert isinstance(store.get(quiz_id), SqlLeaderboard)
+
+    assert len(board) == len(memory) == 9
+    assert board.top(50) == memory.top(50)
+    assert board.window(2, 6) == memory.window(2, 6)
+    assert board.window(-3, 2) == memory.window(-3, 2)
+    assert board.window(8, 20) == memory.window(8, 20)
+    assert board.window(5, 5) == []
+    for player_id in range(1, 11):
+        assert board.rank_of_player(player_id) == memory.rank_of_player(player_id)
+        assert board.around_player(player_id, 2) == memory.around_player(player_id, 2)
+
+
+def test_rank_routes_use_sql_for_large_boards(tmp_path):
+    app = api_app(tmp_path, LEADERBOARD_MAX_ROWS=2)
+    with app.app_context():
+        quiz_id = _quiz_with_scores(5, 9, 7, 1)
+        headers = auth_header(3)
+        client = app.test_client()
+
+        me = client.get(f"/api/quizzes/{quiz_id}/leaderboard/me?around=1", headers=headers).get_json()
+        assert (me["rank"], me["total"]) == (2, 4)
+        assert [(row["rank"], row["score"]) for row in me["around"]] == [(1, 9), (2, 7), (3, 5)]
+
+        page = client.get(f"/api/quizzes/{quiz_id}/leaderboard/ranks?from=3&limit=5", headers=headers).get_json()
+        assert [(row["rank"], row["score"]) for row in page["items"]] == [(3, 5), (4, 1)]
+        assert leaderboards.stats()["boards"] == 0
+        db.session.remove()
@@ -0,0 +1,68 @@
+import os
+import re
+
+from sqlalchemy import create_engine, text
+
+from app.migrations import MIGRATIONS, AddColumn, AddIndex, CreateTable, UpdateRows
+
+SCHEMA_SQL = os.path.join(os.path.dirname(__file__), "..", "..", "database", "02-quizzes-data.sql")
+
+
+def _normalize(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def _schema_tables():
+    with open(SCHEMA_SQL) as file:
+        sql = file.read()
+    return {
+        name: _normalize(body)
+        for name, body in re.findall(r"CREATE TABLE IF NOT EXISTS \w+\.(\w+) \((.*?)\n\);", sql, re.S)
+    }
+
+
+def _operations(kind):
+    return [op for m in MIGRATIONS if m.bind == "quiz_data" for op in m.operations if isinstance(op, kind)]
+
+
+def test_versions_are_unique():
+    versions = [m.version for m in MIGRATIONS]
+    assert len(versions) == len(set(versions))
+
+
+def test_every_schema_index_has_a_migration():
+    # baza napravljena pre izmene database/*.sql dobija indekse samo kroz migracije
+    migrated = {op.name for op in _operations(AddIndex)}
+    for table in _operations(CreateTable):
+        migrated.update(re.findall(r"INDEX (\w+)", table.definition))
+
+    declared = set()
+    for body in _schema_tables().values():
+        declared.update(re.findall(r"(?:INDEX|UNIQUE KEY) (\w+)", body))
+    assert declared - migrated == set()
+
+
+def test_migrated_tables_and_columns_match_schema_sql():
+    tables = _schema_tables()
+    for table in _operations(CreateTable):
+        assert _normalize(table.definition) == tables[table.name]
+    for column in _operations(AddColumn):
+        assert f"{column.name} {column.definition}" in tables[column.table]
+
+
+def test_state_backfill_keeps_legacy_results():
+    [backfill] = [op for op in _operations(UpdateRows) if op.description.startswith("state")]
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE quiz_attempts (id INTEGER PRIMARY KEY, finished_at DATETIME, score INT,"
+            " state VARCHAR(16) NOT NULL DEFAULT 'STARTED')"
+        ))
+        connection.execute(text(
+            "INSERT INTO quiz_attempts (id, finished_at, score) VALUES"
+            " (1, NULL, NULL), (2, '2024-01-01 10:00:00', NULL), (3, '2024-01-01 10:00:00', 7)"
+        ))
+        assert backfill.apply(connection)
+        states = dict(connection.execute(text("SELECT id, state FROM quiz_attempts")).all())
+        assert states == {1: "STARTED", 2: "SUBMITTED", 3: "SCORED"}
+        assert not backfill.apply(connection)  # ponovljena migracija ne menja nista
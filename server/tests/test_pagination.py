@@ -0,0 +1,35 @@
+import pytest
+
+from app.extensions import db
+from app.models import Quiz
+from tests.support import auth_header
+
+
+def _quizzes(count):
+    for number in range(count):
+        db.session.add(Quiz(title=f"Quiz {number}", duration_seconds=60, status="APPROVED", author_id=1))
+    db.session.commit()
+
+
+@pytest.mark.parametrize("limit", ["abc", "0", "-1", "1.5", "", "²", "١٢"])
+def test_bad_limit_is_rejected(api, limit):
+    response = api.test_client().get(f"/api/quizzes?limit={limit}", headers=auth_header(1))
+
+    assert response.status_code == 400
+    assert response.get_json() == {"message": "limit must be a positive integer"}
+
+
+def test_cursor_walks_all_pages(api):
+    _quizzes(5)
+    client = api.test_client()
+
+    titles, cursor = [], None
+    for _ in range(3):
+        query = f"?limit=2&cursor={cursor}" if cursor else "?limit=2"
+        response = client.get(f"/api/quizzes{query}", headers=auth_header(1))
+        assert response.status_code == 200
+        titles += [quiz["title"] for quiz in response.get_json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert titles == [f"Quiz {number}" for number in range(5)]
+    assert cursor is None
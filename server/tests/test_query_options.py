@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.extensions import db
+from app.models import AnswerOption, Question, Quiz
+from app.query_options import QUIZ_LIST, get_full_quiz
+from tests.support import auth_header, count_queries
+
+QUESTIONS = 50
+ANSWERS = 4
+
+
+def _quiz(status="APPROVED"):
+    quiz = Quiz(title="Quiz", duration_seconds=60, status=status, author_id=1)
+    for number in range(QUESTIONS):
+        question = Question(quiz=quiz, text=f"Q{number}", points=1)
+        for option in range(ANSWERS):
+            question.answers.append(AnswerOption(text=f"A{option}", is_correct=option == 0))
+    db.session.add(quiz)
+    db.session.commit()
+    quiz_id = quiz.id
+    db.session.expunge_all()  # identity map ne sme da sakrije upite
+    return quiz_id
+
+
+def _walk(quiz):
+    return sum(len(question.answers) for question in quiz.questions)
+
+
+def test_full_quiz_loads_in_three_queries(app):
+    quiz_id = _quiz()
+
+    # lenjo ucitavanje: kviz + pitanja + po jedan upit za odgovore svakog pitanja
+    with count_queries(db.engines["quiz_data"]) as statements:
+        assert _walk(db.session.get(Quiz, quiz_id)) == QUESTIONS * ANSWERS
+    assert len(statements) == 2 + QUESTIONS
+    db.session.expunge_all()
+
+    with count_queries(db.engines["quiz_data"]) as statements:
+        assert _walk(get_full_quiz(quiz_id)) == QUESTIONS * ANSWERS
+    assert len(statements) == 3
+
+
+def test_quiz_list_rows_raise_on_questions(app):
+    _quiz()
+    [quiz] = Quiz.query.options(*QUIZ_LIST).all()
+    with pytest.raises(InvalidRequestError):
+        quiz.questions
+
+
+def test_approved_list_is_one_query(api):
+    for _ in range(3):
+        _quiz()
+
+    with count_queries(db.engines["quiz_data"]) as statements:
+        response = api.test_client().get("/api/quizzes", headers=auth_header(1))
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+    # uz proveru JWT blocklist-e: jedan upit nad quizzes, nijedan nad pitanjima
+    assert len([sql for sql in statements if "FROM quizzes" in sql]) == 1
+    assert not [sql for sql in statements if "FROM questions" in sql or "FROM answer_options" in sql]
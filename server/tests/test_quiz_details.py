@@ -0,0 +1,87 @@
+from app.extensions import db
+from tests.support import auth_header, count_queries
+
+AUTHOR, ADMIN, PLAYER = 2, 3, 4
+
+
+def _payload(title):
+    return {
+        "title": title,
+        "durationSeconds": 60,
+        "questions": [{
+            "text": "Q",
+            "points": 1,
+            "answers": [{"text": "A", "isCorrect": True}, {"text": "B", "isCorrect": False}],
+        }],
+    }
+
+
+def _create(client, title="Quiz"):
+    response = client.post("/api/quizzes", json=_payload(title), headers=auth_header(AUTHOR, "MODERATOR"))
+    assert response.status_code == 201
+    return response.get_json()["id"]
+
+
+def _details(client, quiz_id, user_id, role):
+    return client.get(f"/api/quizzes/{quiz_id}", headers=auth_header(user_id, role))
+
+
+def _quiz_statements(statements):
+    # JWT blocklist se proverava na svakom zahtevu; ostalo bi bio upit za detalje
+    return [statement for statement in statements if "token_blocklist" not in statement]
+
+
+def test_details_hit_makes_no_quiz_queries(api):
+    client = api.test_client()
+    quiz_id = _create(client)
+    client.patch(f"/api/quizzes/{quiz_id}/approve", headers=auth_header(ADMIN, "ADMIN"))
+
+    first = _details(client, quiz_id, PLAYER, "PLAYER")
+    assert first.status_code == 200
+    db.session.expunge_all()  # identity map ne sme da sakrije upite
+
+    with count_queries(db.engines["quiz_data"]) as statements:
+        second = _details(client, quiz_id, PLAYER, "PLAYER")
+
+    assert second.status_code == 200
+    assert second.get_data() == first.get_data()
+    assert _quiz_statements(statements) == []
+
+
+def test_hidden_quiz_hit_makes_no_quiz_queries(api):
+    client = api.test_client()
+    quiz_id = _create(client)
+    assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 403
+
+    with count_queries(db.engines["quiz_data"]) as statements:
+        assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 403
+    assert _quiz_statements(statements) == []
+
+
+def test_approve_makes_cached_quiz_visible(api):
+    client = api.test_client()
+    quiz_id = _create(client)
+    assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 403
+    assert _details(client, quiz_id, AUTHOR, "MODERATOR").get_json()["status"] == "PENDING"
+
+    client.patch(f"/api/quizzes/{quiz_id}/approve", headers=auth_header(ADMIN, "ADMIN"))
+
+    assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 200
+    assert _details(client, quiz_id, AUTHOR, "MODERATOR").get_json()["status"] == "APPROVED"
+
+
+def test_reject_and_update_change_cached_details(api):
+    client = api.test_client()
+    quiz_id = _create(client, "Draft")
+    assert _details(client, quiz_id, AUTHOR, "MODERATOR").get_json()["status"] == "PENDING"
+
+    client.patch(f"/api/quizzes/{quiz_id}/reject", json={"reason": "typo"}, headers=auth_header(ADMIN, "ADMIN"))
+    assert _details(client, quiz_id, AUTHOR, "MODERATOR").get_json()["status"] == "REJECTED"
+    assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 403
+
+    response = client.put(f"/api/quizzes/{quiz_id}", json=_payload("Fixed"), headers=auth_header(AUTHOR, "MODERATOR"))
+    assert response.status_code == 200
+
+    details = _details(client, quiz_id, AUTHOR, "MODERATOR").get_json()
+    assert (details["title"], details["status"]) == ("Fixed", "PENDING")
+    assert _details(client, quiz_id, PLAYER, "PLAYER").status_code == 403
@@ -0,0 +1,31 @@
+import pytest
+
+from app.quiz_payload import MAX_ANSWERS, PayloadError, parse_quiz_payload
+from tests.support import auth_header
+
+
+def _payload(answers):
+    return {
+        "title": "Quiz",
+        "durationSeconds": 60,
+        "questions": [{
+            "text": "Q",
+            "points": 1,
+            "answers": [{"text": f"A{number}", "isCorrect": number == 0} for number in range(answers)],
+        }],
+    }
+
+
+def test_answers_fit_in_mask():
+    payload = parse_quiz_payload(_payload(MAX_ANSWERS))
+    assert len(payload.questions[0].answers) == MAX_ANSWERS
+
+    with pytest.raises(PayloadError, match="at most 63 answers"):
+        parse_quiz_payload(_payload(MAX_ANSWERS + 1))
+
+
+def test_create_quiz_with_too_many_answers_is_rejected(api):
+    response = api.test_client().post("/api/quizzes", json=_payload(65), headers=auth_header(1, "MODERATOR"))
+
+    assert response.status_code == 400
+    assert response.get_json() == {"message": "Each question can have at most 63 answers"}
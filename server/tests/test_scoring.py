@@ -0,0 +1,88 @@
+import json
+
+from app import cache_store, quiz_processing
+from app.answer_key import get_answer_key
+from app.answer_store import store_answers
+from app.batch_scoring import write_scores
+from app.cache_store import answer_key_tag
+from app.extensions import db
+from app.models import AnswerOption, Question, Quiz, QuizAttempt, QuizSnapshot
+from tests.support import count_queries
+
+
+def _quiz():
+    quiz = Quiz(title="Quiz", duration_seconds=60, status="APPROVED", author_id=1, version=1)
+    question = Question(quiz=quiz, text="Q", points=5)
+    first = AnswerOption(question=question, text="A", is_correct=True)
+    second = AnswerOption(question=question, text="B", is_correct=False)
+    db.session.add(quiz)
+    db.session.commit()
+    return quiz, question, first, second
+
+
+def _mark_correct(correct, wrong):
+    correct.is_correct, wrong.is_correct = True, False
+    db.session.commit()
+
+
+def test_answer_key_follows_invalidation_from_other_process(app):
+    quiz, question, first, second = _quiz()
+    assert get_answer_key(quiz.id, 1).questions[question.id].correct_mask == 0b01
+
+    # drugi proces zameni snapshot i poveca deljenu generaciju; lokalni LRU ovde ostaje
+    snapshot = db.session.get(QuizSnapshot, (quiz.id, 1))
+    rows = json.loads(snapshot.answer_key)
+    snapshot.answer_key = json.dumps([[qid, points, aid, not correct] for qid, points, aid, correct in rows])
+    db.session.commit()
+    assert get_answer_key(quiz.id, 1).questions[question.id].correct_mask == 0b01
+
+    cache_store._backend.bump((answer_key_tag(quiz.id),))
+    assert get_answer_key(quiz.id, 1).questions[question.id].correct_mask == 0b10
+
+
+def test_rescore_leaves_submitted_attempts_to_their_job(app, monkeypatch):
+    app.config["SCORING_SIMULATED_DELAY"] = 0
+    published = []
+    monkeypatch.setattr(quiz_processing, "publish_result", lambda quiz, attempt, score: published.append((attempt.id, score)))
+
+    quiz, question, first, second = _quiz()
+    scored = QuizAttempt(quiz_id=quiz.id, player_id=1, quiz_version=1, score=0, state="SCORED")
+    submitted = QuizAttempt(quiz_id=quiz.id, player_id=2, quiz_version=1, state="SUBMITTED")
+    db.session.add_all([scored, submitted])
+    db.session.flush()
+    for attempt in (scored, submitted):
+        store_answers(attempt.id, quiz.id, {question.id: 0b10})  # oba su izabrala B
+    db.session.commit()
+
+    _mark_correct(second, first)
+    quiz_processing.rescore_quiz_job(quiz.id)
+
+    db.session.expire_all()
+    assert (scored.state, scored.score) == ("SCORED", 5)
+    assert (submitted.state, submitted.score) == ("SUBMITTED", None)
+
+    # posao predaje i dalje boduje (novim kljucem) i objavljuje rezultat
+    quiz_processing.process_quiz_submission(quiz.id, submitted.id)
+    db.session.expire_all()
+    assert (submitted.state, submitted.score) == ("SCORED", 5)
+    assert published == [(submitted.id, 5)]
+
+
+def test_write_scores_is_one_update_per_score(app):
+    quiz, question, first, second = _quiz()
+    attempts = [QuizAttempt(quiz_id=quiz.id, player_id=player, quiz_version=1, score=0, state="SCORED") for player in range(1, 8)]
+    attempts.append(QuizAttempt(quiz_id=quiz.id, player_id=8, quiz_version=1, state="SUBMITTED"))
+    db.session.add_all(attempts)
+    db.session.commit()
+
+    scores = {attempt.id: (5 if attempt.player_id % 2 else 0) for attempt in attempts}
+    with count_queries(db.engines["quiz_data"]) as statements:
+        write_scores(scores)
+        db.session.commit()
+
+    # dva razlicita skora -> dva UPDATE-a, bez obzira na broj pokusaja
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 2
+    db.session.expire_all()
+    assert [(attempt.player_id, attempt.score) for attempt in attempts] == [
+        (1, 5), (2, 0), (3, 5), (4, 0), (5, 5), (6, 0), (7, 5), (8, None),
+    ]
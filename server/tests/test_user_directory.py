@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from app import quiz_processing
+from app.extensions import db
+from app.models import Quiz, QuizAttempt, User
+from tests.support import auth_header, count_queries
+
+PLAYERS = 50
+
+
+def _users_queries(statements):
+    return [sql for sql in statements if "FROM users" in sql]
+
+
+def _quiz_with_players(count):
+    users = [
+        User(first_name=f"Player{n}", last_name="Test", email=f"p{n}@example.com", password_hash="x")
+        for n in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+
+    quiz = Quiz(title="Quiz", duration_seconds=60, status="APPROVED", author_id=users[0].id)
+    db.session.add(quiz)
+    db.session.flush()
+    started_at = datetime.utcnow() - timedelta(minutes=5)
+    for n, user in enumerate(users):
+        db.session.add(QuizAttempt(
+            quiz_id=quiz.id, player_id=user.id, state="SCORED", score=n,
+            started_at=started_at, finished_at=started_at + timedelta(seconds=n), scored_at=started_at,
+        ))
+    db.session.commit()
+    return quiz.id
+
+
+def test_leaderboard_of_50_resolves_names_with_one_users_query(api):
+    quiz_id = _quiz_with_players(PLAYERS)
+
+    with count_queries(db.engines["user_data"]) as statements:
+        response = api.test_client().get(f"/api/quizzes/{quiz_id}/leaderboard", headers=auth_header(1))
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == PLAYERS
+    assert all(row["name"].startswith("Player") for row in response.get_json())
+    assert len(_users_queries(statements)) == 1
+
+
+def test_quiz_report_resolves_names_with_one_users_query(app, monkeypatch):
+    quiz_id = _quiz_with_players(PLAYERS)
+    sent = []
+    monkeypatch.setattr(quiz_processing, "send_quiz_report_email", lambda **kwargs: sent.append(kwargs))
+
+    with count_queries(db.engines["user_data"]) as statements:
+        quiz_processing.generate_quiz_report(quiz_id, "author@example.com")
+
+    [report] = sent
+    assert len(report["attempt_rows"]) == PLAYERS
+    assert all(row["name"].startswith("Player") for row in report["attempt_rows"])
+    assert len(_users_queries(statements)) == 1
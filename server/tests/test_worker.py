@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+
+def test_worker_refuses_process_local_cache():
+    # izlazi pre uvoza app.main, pa ne trazi bazu ni message queue
+    env = {**os.environ, "CACHE_BACKEND": "local"}
+    result = subprocess.run(
+        [sys.executable, "-m", "app.worker"], env=env, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 1
+    assert "CACHE_BACKEND=sqlite" in result.stdout